@@ -0,0 +1,109 @@
+"""Cross-thread batching of network evaluations.
+
+複数スレッドから届く評価リクエストを1回の順伝播にまとめる仕組み。
+
+Web アプリでは複数の対局の MCTS 探索がスレッドプール上で同時に走り、
+それぞれが数局面ずつネットワークを呼ぶ。ニューラルネットの推論は
+バッチが大きいほど1局面あたりのコストが下がるので、同時に届いた入力を
+連結して1回で評価し、結果を呼び出し元ごとに切り分けて返す。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+import torch
+
+
+class _Request:
+    """1回の呼び出し分の入力と結果。"""
+
+    __slots__ = ("batch", "done", "error", "result")
+
+    def __init__(self, batch: torch.Tensor) -> None:
+        self.batch = batch
+        self.done = False
+        self.result: tuple[torch.Tensor, torch.Tensor] | None = None
+        self.error: BaseException | None = None
+
+
+class BatchedEvaluator:
+    """Merge concurrent forward calls into one batched forward pass.
+
+    同時に呼ばれた順伝播を1つのバッチにまとめて実行する。
+
+    待ち時間を設けない「リーダー方式」で動く:
+    - 実行中の順伝播がなければ、呼び出したスレッドがリーダーになり、
+      その時点で溜まっているリクエストをまとめて評価する。
+    - 順伝播の実行中に届いたリクエストは待機し、次のリーダーがまとめて評価する。
+    単独で使う場合は待ち時間が増えず、同時アクセスが多いほどバッチが大きくなる。
+
+    Args:
+        network: (batch, C, H, W) → (policy_logits, value) の推論用ネットワーク
+        max_batch_size: 1回の順伝播で評価する最大局面数の目安
+    """
+
+    def __init__(
+        self,
+        network: Callable[[torch.Tensor], tuple[torch.Tensor, torch.Tensor]],
+        max_batch_size: int = 32,
+    ) -> None:
+        self.network = network
+        self.max_batch_size = max_batch_size
+        self._cond = threading.Condition()
+        self._pending: list[_Request] = []
+        self._running = False  # リーダーが順伝播中なら True
+
+    def __call__(self, batch: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """batch を評価して (policy_logits, value) を返す（他スレッドの入力と相乗りする）。"""
+        request = _Request(batch)
+        with self._cond:
+            self._pending.append(request)
+        while True:
+            with self._cond:
+                # 他のリーダーが自分の分を評価し終えるか、自分がリーダーになれるまで待つ
+                while not request.done and self._running:
+                    self._cond.wait()
+                if request.done:
+                    break
+                self._running = True
+                taken = self._take_pending()
+            # 先に溜まっていた分で満杯なら自分の分は次の周回で評価する
+            self._run(taken)
+
+        if request.error is not None:
+            raise request.error
+        assert request.result is not None
+        return request.result
+
+    def _take_pending(self) -> list[_Request]:
+        """待機中のリクエストを最大バッチサイズまで取り出す（ロック保持中に呼ぶ）。"""
+        taken: list[_Request] = []
+        rows = 0
+        while self._pending and (not taken or rows < self.max_batch_size):
+            request = self._pending.pop(0)
+            taken.append(request)
+            rows += request.batch.shape[0]
+        return taken
+
+    def _run(self, taken: list[_Request]) -> None:
+        """取り出したリクエストを1回の順伝播で評価し、結果を切り分けて渡す。"""
+        try:
+            merged = torch.cat([r.batch for r in taken]) if len(taken) > 1 else taken[0].batch
+            with torch.inference_mode():
+                policy_logits, value = self.network(merged)
+            start = 0
+            for r in taken:
+                end = start + r.batch.shape[0]
+                r.result = (policy_logits[start:end], value[start:end])
+                start = end
+        except BaseException as e:
+            for r in taken:
+                r.error = e
+        finally:
+            with self._cond:
+                for r in taken:
+                    r.done = True
+                self._running = False
+                self._cond.notify_all()
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import math
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 import torch
 
+from shogi_ai.engine.batch_eval import BatchedEvaluator
 from shogi_ai.game.protocol import GameState
 from shogi_ai.model.network import DualHeadNetwork
 
@@ -49,6 +52,8 @@ class MCTSConfig:
     temperature: float = 1.0  # 行動選択の温度（高いほど探索的）
     dirichlet_alpha: float = 0.3  # ディリクレノイズの集中度パラメータ
     dirichlet_epsilon: float = 0.25  # ノイズの混合率（25%をノイズに）
+    cache_size: int = 4096  # 評価キャッシュの最大局面数（0 で無効）
+    batch_size: int = 1  # まとめて評価する葉の数（1 なら従来どおり1局面ずつ）
 
 
 class MCTS:
@@ -64,11 +69,33 @@ class MCTS:
     4. 行動選択 (Action):  訪問回数に基づいて確率を計算
     """
 
-    def __init__(self, network: DualHeadNetwork, config: MCTSConfig) -> None:
+    def __init__(
+        self,
+        network: DualHeadNetwork,
+        config: MCTSConfig,
+        evaluator: BatchedEvaluator | None = None,
+    ) -> None:
         self.network = network
         self.config = config
+        # evaluator を渡すと、他スレッドの探索と順伝播を相乗りする（Web アプリ用）
+        self._forward = evaluator if evaluator is not None else network
         # ニューラルネットの計算デバイス（CPU or MPS/GPU）
         self.device = next(network.parameters()).device
+        # 評価キャッシュ（LRU）: 局面テンソル → (合法手の事前確率, 価値)
+        # 同じ MCTS で複数局を探索すると、序盤の定跡局面は1回しか評価しない。
+        # ネットワークの重みが変わらないことが前提（変えたら clear_cache() を呼ぶ）
+        self._cache: OrderedDict[bytes, tuple[dict[int, float], float]] = OrderedDict()
+        # Web アプリでは1つの MCTS を複数スレッドの探索で共有するため、キャッシュ操作を排他する
+        # （探索木は search() ごとに作るので、共有される可変状態はキャッシュだけ）
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self) -> None:
+        """Drop all cached network evaluations.
+
+        評価キャッシュを空にする。ネットワークの重みを更新した後に呼ぶ。
+        """
+        with self._cache_lock:
+            self._cache.clear()
 
     def search(self, state: GameState) -> list[float]:
         """Run MCTS and return action probabilities.
@@ -84,6 +111,9 @@ class MCTS:
         if not legal:
             return [0.0] * state.action_space_size
 
+        # 探索中は推論のみなので、BN を推論モードにするのは探索開始時の1回だけでよい
+        self.network.eval()
+
         # ルートノードをニューラルネットで評価・展開
         policy, _ = self._evaluate(state)
         for move in legal:
@@ -94,8 +124,16 @@ class MCTS:
         self._add_dirichlet_noise(root, legal)
 
         # num_simulations 回のシミュレーションを実行
-        for _ in range(self.config.num_simulations):
-            self._simulate(root, state)
+        if self.config.batch_size <= 1:
+            for _ in range(self.config.num_simulations):
+                self._simulate(root, state)
+        else:
+            # 葉を batch_size 個ずつ集めて、1回の順伝播でまとめて評価する
+            remaining = self.config.num_simulations
+            while remaining > 0:
+                n = min(self.config.batch_size, remaining)
+                self._simulate_batch(root, state, n)
+                remaining -= n
 
         # 訪問回数から行動確率を計算
         action_probs = [0.0] * state.action_space_size
@@ -155,6 +193,72 @@ class MCTS:
 
         return value
 
+    def _simulate_batch(self, root: MCTSNode, state: GameState, count: int) -> None:
+        """Run up to `count` simulations whose leaves share one network call.
+
+        葉ノードを最大 count 個集めてまとめて評価する（仮想損失つきバッチ MCTS）。
+
+        降下中に通った子ノードには「仮想損失」（訪問+1・価値-1）を一時的に加え、
+        同じバッチ内の次の降下が別の経路を選ぶようにする。評価後に仮想損失を
+        取り消して本当の価値でバックアップする。既に同じバッチで選ばれた葉に
+        再び到達した場合は、その降下を取り消す（シミュレーション数には数えない）。
+        """
+        pending: list[tuple[list[MCTSNode], MCTSNode, GameState]] = []
+        pending_ids: set[int] = set()
+
+        for _ in range(count):
+            path: list[MCTSNode] = []
+            node, current = root, state
+            while True:
+                if current.is_terminal:
+                    # 終局: 実際の結果をすぐにバックアップする
+                    if current.winner is None:
+                        value = 0.0
+                    elif current.winner == current.current_player:
+                        value = 1.0
+                    else:
+                        value = -1.0
+                    self._backup(path, value)
+                    break
+                if not node.children:
+                    if id(node) in pending_ids:
+                        # 衝突: 同じ葉を二重に評価しないよう、この降下を取り消す
+                        for visited in path:
+                            visited.visit_count -= 1
+                            visited.total_value += 1.0
+                    else:
+                        pending_ids.add(id(node))
+                        pending.append((path, node, current))
+                    break
+                move = self._select_child(node)
+                child = node.children[move]
+                # 仮想損失: 評価待ちの間はこの手を「負け」とみなす
+                child.visit_count += 1
+                child.total_value -= 1.0
+                path.append(child)
+                node, current = child, current.apply_move(move)
+
+        if not pending:
+            return
+
+        # 集めた葉を1回の順伝播でまとめて評価し、展開とバックアップを行う
+        results = self._evaluate_batch([leaf_state for _, _, leaf_state in pending])
+        for (path, leaf, leaf_state), (policy, value) in zip(pending, results, strict=True):
+            for move in leaf_state.legal_moves():
+                leaf.children[move] = MCTSNode(prior=policy[move])
+            self._backup(path, value)
+
+    def _backup(self, path: list[MCTSNode], value: float) -> None:
+        """Undo virtual losses on `path` and back up the leaf value.
+
+        経路上の仮想損失を取り消して、葉の価値を根に向かって伝播する。
+        value は葉の手番プレイヤー視点なので、葉の直前の子から符号を反転しながら加算する。
+        """
+        for child in reversed(path):
+            value = -value  # 子ノードの統計は親の手番プレイヤー視点
+            child.total_value += 1.0  # 仮想損失の取り消し（訪問回数は本物の訪問として残す）
+            child.total_value += value
+
     def _select_child(self, node: MCTSNode) -> int:
         """Select child with highest PUCT score.
 
@@ -185,36 +289,65 @@ class MCTS:
 
         return best_move
 
-    def _evaluate(self, state: GameState) -> tuple[list[float], float]:
+    def _evaluate(self, state: GameState) -> tuple[dict[int, float], float]:
         """Evaluate a state with the neural network.
 
         ニューラルネットで局面を評価する。
 
-        Returns (policy_probs, value) where policy_probs is masked to legal moves.
+        Returns (policy_probs, value) where policy_probs maps each legal move
+        to its prior probability.
 
-        policy_probs: 各行動の選択確率（合法手のみ、ソフトマックス適用済み）
+        policy_probs: 合法手 → 選択確率（合法手だけでソフトマックス適用済み）
         value:        局面の価値（+1=現プレイヤー勝利, -1=敗北）
         """
-        # 局面をテンソルに変換してニューラルネットに入力
-        tensor = state.to_tensor_planes().unsqueeze(0).to(self.device)
+        return self._evaluate_batch([state])[0]
 
-        self.network.eval()
-        with torch.no_grad():  # 勾配計算不要（推論のみ）
-            policy_logits, value_tensor = self.network(tensor)
-
-        legal = state.legal_moves()
-        policy = policy_logits[0].cpu()
-
-        # 違法手のロジットを -inf にして確率をゼロにマスク
-        mask = torch.full_like(policy, float("-inf"))
-        for m in legal:
-            mask[m] = policy[m]
-
-        # ソフトマックスで確率分布に変換
-        probs = torch.softmax(mask, dim=0).tolist()
-        value = value_tensor.item()
+    def _evaluate_batch(self, states: list[GameState]) -> list[tuple[dict[int, float], float]]:
+        """Evaluate several states with a single network forward pass.
 
-        return probs, value
+        複数の局面を1回の順伝播で評価する。評価キャッシュにある局面は再計算しない。
+        """
+        results: dict[int, tuple[dict[int, float], float]] = {}
+        misses: list[tuple[int, GameState, torch.Tensor, bytes]] = []
+        for i, state in enumerate(states):
+            planes = state.to_tensor_planes()
+            # 同じ局面を評価済みならネットワークを呼ばずに結果を使う
+            key = _cache_key(planes)
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.append((i, state, planes, key))
+
+        if misses:
+            # 局面をテンソルに変換してまとめてニューラルネットに入力
+            batch = torch.stack([planes for _, _, planes, _ in misses]).to(self.device)
+
+            # 推論のみ: inference_mode は no_grad より軽い（バージョンカウンタ等も省く）
+            with torch.inference_mode():
+                policy_logits, value_tensor = self._forward(batch)
+
+            policy_logits = policy_logits.cpu()
+            values = value_tensor.view(-1).tolist()
+
+            for row, (i, state, _, key) in enumerate(misses):
+                legal = state.legal_moves()
+                # 合法手のロジットだけでソフトマックスを取る
+                # （違法手を -inf でマスクしてから全体のソフトマックスを取るのと同じ結果）
+                legal_logits = policy_logits[row, torch.tensor(legal, dtype=torch.long)]
+                probs = dict(zip(legal, torch.softmax(legal_logits, dim=0).tolist(), strict=True))
+                results[i] = (probs, values[row])
+
+                if self.config.cache_size > 0:
+                    with self._cache_lock:
+                        self._cache[key] = results[i]
+                        if len(self._cache) > self.config.cache_size:
+                            self._cache.popitem(last=False)  # 最も古い局面を捨てる
+
+        return [results[i] for i in range(len(states))]
 
     def _add_dirichlet_noise(
         self,
@@ -241,3 +374,12 @@ class MCTS:
         for i, move in enumerate(legal_moves):
             child = root.children[move]
             child.prior = (1 - eps) * child.prior + eps * noise[i]
+
+
+def _cache_key(planes: torch.Tensor) -> bytes:
+    """Build an evaluation-cache key from input planes.
+
+    入力プレーンは 0/1 か小さな持ち駒数なので uint8 に変換しても情報は失われない。
+    手番チャンネルを含むため、同じキーなら合法手も同じになる。
+    """
+    return bytes(planes.to(torch.uint8).flatten().tolist())
@@ -15,6 +15,37 @@ _PIECE_VALUES = {
 }
 
 
+def _signed_code_values(player: int) -> tuple[float, ...]:
+    """Board.codes の駒コード（0=空き, 1 + 駒種 * 2 + 所有者）→ player から見た駒の価値。
+
+    自分の駒は +価値、相手の駒は -価値、空きマスは 0。
+    1バイトの全値（256通り）を埋めておくので、どちらのゲームの盤面でも引ける。
+    """
+    values = [0.0] * 256
+    for code in range(1, 256):
+        piece_type, owner = divmod(code - 1, 2)
+        value = _PIECE_VALUES.get(piece_type, 0.0)
+        values[code] = value if owner == player else -value
+    return tuple(values)
+
+
+# 手番プレイヤーごとの符号付き価値表（evaluate の盤上の駒の集計に使う）
+_SIGNED_CODE_VALUES = (_signed_code_values(0), _signed_code_values(1))
+
+# 駒種 → 価値の表（持ち駒の集計に使う。PieceType は IntEnum なのでそのまま引ける）
+_HAND_VALUES = tuple(_PIECE_VALUES.get(pt, 0.0) for pt in range(256))
+
+# 置換表（transposition table）: Zobrist ハッシュ → (depth, score, flag, best_move)
+# 手順が違っても同じ局面に合流した場合（転置）、探索済みの結果を再利用する。
+# 表は1回の探索（minimax_move の呼び出し）ごとに作り、探索どうしでは共有しない。
+# Web アプリでは複数の対局の探索がスレッドプールで同時に走り、ゲーム種別ごとに
+# Zobrist 表も異なるので、共有すると他の探索の途中で表が書き換わってしまう。
+TranspositionTable = dict[int, tuple[int, float, int, int]]
+_TT_EXACT = 0  # score は正確な値
+_TT_LOWER = 1  # score は下界（βカットで打ち切った）
+_TT_UPPER = 2  # score は上界（どの手も α を超えなかった）
+
+
 def evaluate(state: GameState) -> float:
     """Evaluate a position from the current player's perspective.
 
@@ -35,36 +66,55 @@ def evaluate(state: GameState) -> float:
 
     # 盤上の駒を数えて材料差を計算
     # 現在のプレイヤーの駒は +値、相手の駒は -値
-    score = 0.0
     board = state.board  # type: ignore[attr-defined]
 
-    # 盤上の駒を評価
-    for piece in board.squares:
-        if piece is None:
-            continue
-        value = _PIECE_VALUES.get(piece.piece_type.value, 0.0)
-        if piece.owner.value == state.current_player:
-            score += value  # 自分の駒
-        else:
-            score -= value  # 相手の駒
+    # 盤上の駒を評価: 駒コード列を符号付き価値表で引いて合計する
+    # （map と sum は C で回るので、マスごとの Python の分岐・属性参照がなくなる）
+    table = _SIGNED_CODE_VALUES[state.current_player]
+    score = sum(map(table.__getitem__, board.codes))
 
     # 持ち駒も評価（持ち駒は潜在的な打ち駒として価値がある）
-    for i, hand in enumerate(board.hands):
-        for pt in hand:
-            value = _PIECE_VALUES.get(pt.value, 0.0)
-            if i == state.current_player:
-                score += value
-            else:
-                score -= value
+    # 盤上と同じく表引きの合計にして、駒ごとの分岐をなくす
+    me = state.current_player
+    hands = board.hands
+    score += sum(map(_HAND_VALUES.__getitem__, hands[me]))
+    score -= sum(map(_HAND_VALUES.__getitem__, hands[1 - me]))
 
     return score
 
 
+def _order_moves(state: GameState, moves: list[int], tt_move: int) -> list[int]:
+    """Order moves so that αβ pruning cuts earlier.
+
+    良さそうな手から先に探索するよう並べ替える（αβ枝刈りは手の順序で効率が大きく変わる）。
+
+    1. 置換表の最善手（前回の浅い探索で最善だった手）
+    2. 駒を取る手: 取られる駒が高いほど、取る駒が安いほど先（MVV-LVA）
+    3. その他の手: 元の生成順のまま（sort は安定）
+    """
+    squares = state.board.squares  # type: ignore[attr-defined]
+
+    def key(move: int) -> tuple[bool, float, float]:
+        from_idx, to_idx = state.move_squares(move)  # type: ignore[attr-defined]
+        victim = squares[to_idx]
+        if victim is None:
+            return move == tt_move, 0.0, 0.0
+        attacker = squares[from_idx] if from_idx is not None else None
+        return (
+            move == tt_move,
+            _PIECE_VALUES.get(victim.piece_type.value, 0.0),
+            -_PIECE_VALUES.get(attacker.piece_type.value, 0.0) if attacker else 0.0,
+        )
+
+    return sorted(moves, key=key, reverse=True)
+
+
 def negamax(
     state: GameState,
     depth: int,
     alpha: float,
     beta: float,
+    tt: TranspositionTable | None = None,
 ) -> tuple[int, float]:
     """Negamax search with alpha-beta pruning.
 
@@ -79,6 +129,10 @@ def negamax(
     alpha: 現在のプレイヤーが保証できる最低スコア
     beta:  相手のプレイヤーが保証できる最低スコア（現在プレイヤーにとっての上限）
 
+    探索結果は Zobrist ハッシュをキーとする置換表 tt に保存し、
+    転置した局面（手順違いで同じ局面）の再探索を省く。
+    tt を省略するとこの呼び出しだけの新しい表を使う。
+
     Returns (best_move, score) from the current player's perspective.
     best_move is -1 when depth=0 or at terminal states.
     """
@@ -95,14 +149,34 @@ def negamax(
     if depth == 0:
         return -1, evaluate(state)
 
-    moves = state.legal_moves()
+    # 置換表の参照。勝ち負けのスコアは残り depth を含むため、
+    # 同じ depth で探索した結果だけを再利用する（深い結果を流用すると最短勝ちの判定がずれる）
+    if tt is None:
+        tt = {}
+    key = state.zobrist  # type: ignore[attr-defined]
+    entry = tt.get(key)
+    tt_move = -1
+    if entry is not None:
+        tt_move = entry[3]  # 浅い探索の最善手でも手の並べ替えには使える
+    if entry is not None and entry[0] == depth:
+        _, tt_score, flag, tt_move = entry
+        # 正確な値、または窓 [alpha, beta] の外にあると証明できる境界値ならカットする
+        if (
+            flag == _TT_EXACT
+            or (flag == _TT_LOWER and tt_score >= beta)
+            or (flag == _TT_UPPER and tt_score <= alpha)
+        ):
+            return tt_move, tt_score
+    alpha_orig = alpha
+
+    moves = _order_moves(state, state.legal_moves(), tt_move)
     best_move = moves[0]
     best_score = float("-inf")
 
     for move in moves:
         next_state = state.apply_move(move)
         # 相手番の評価値を符号反転して自分の視点に変換（ネガマックスの核心）
-        _, score = negamax(next_state, depth - 1, -beta, -alpha)
+        _, score = negamax(next_state, depth - 1, -beta, -alpha, tt)
         score = -score
 
         if score > best_score:
@@ -114,6 +188,14 @@ def negamax(
         if alpha >= beta:
             break  # βカットオフ: 相手はこの枝を選ばないので探索打ち切り
 
+    if best_score <= alpha_orig:
+        flag = _TT_UPPER
+    elif best_score >= beta:
+        flag = _TT_LOWER
+    else:
+        flag = _TT_EXACT
+    tt[key] = (depth, best_score, flag, best_move)
+
     return best_move, best_score
 
 
@@ -123,6 +205,14 @@ def minimax_move(state: GameState, depth: int = 4) -> int:
     ミニマックス探索で最善手を返す。
     depth=4 はどうぶつしょうぎ向けのデフォルト値。
     本将棋では組み合わせ爆発を避けるため depth=2 程度に抑える。
+
+    反復深化: depth=1, 2, ... と順に深くしながら探索する。
+    浅い探索の最善手が置換表に残り、次の深さではそれを最初に読むため枝刈りがよく効く。
+    浅い探索のコストは最終深さに比べて小さい（ノード数は深さに対して指数的に増える）。
+    置換表はこの呼び出しの中だけで共有するので、同時に走る他の探索とは干渉しない。
     """
-    move, _ = negamax(state, depth, float("-inf"), float("inf"))
+    tt: TranspositionTable = {}
+    move = -1
+    for d in range(1, depth + 1):
+        move, _ = negamax(state, d, float("-inf"), float("inf"), tt)
     return move
@@ -15,13 +15,19 @@ import random
 from shogi_ai.game.protocol import GameState
 
 
-def random_move(state: GameState) -> int:
+def random_move(state: GameState, rng: random.Random | None = None) -> int:
     """Return a random legal move.
 
     合法手の中から一様ランダムで1手を返す。
     合法手がない場合は ValueError を送出する（終局局面では呼ばれないはず）。
+
+    rng を渡すとその乱数生成器で選ぶ（シードを固定して対局を再現したいとき用）。
+    省略時はモジュール共有の random を使う。合法手は状態がキャッシュしたリストを
+    そのまま使い、コピーは作らない。
     """
     moves = state.legal_moves()
     if not moves:
         raise ValueError("No legal moves available")
-    return random.choice(moves)  # 一様ランダムサンプリング
+    if rng is None:
+        return random.choice(moves)  # 一様ランダムサンプリング
+    return rng.choice(moves)
@@ -11,7 +11,9 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from functools import cache
 
 from shogi_ai.game.animal_shogi.types import (
     COLS,
@@ -19,6 +21,21 @@ from shogi_ai.game.animal_shogi.types import (
     PieceType,
     Player,
 )
+from shogi_ai.game.zobrist import ZobristTable
+
+# Zobrist 乱数表（持ち駒は各駒種最大2枚）
+ZOBRIST = ZobristTable(len(PieceType), ROWS * COLS, max_hand_count=2, seed=368817)
+
+# 駒コード: 盤面を1マス1バイトの bytes（Board.codes）でも持つための整数表現
+# 0 = 空きマス、1 + 駒種 * 2 + 所有者 = 駒。find_lion などは bytes の C 実装の検索で済む
+EMPTY_CODE = 0
+NUM_CODES = 1 + len(PieceType) * 2
+_CODE_BYTES = tuple(bytes((c,)) for c in range(NUM_CODES))
+
+
+def piece_code(piece_type: int, owner: int) -> int:
+    """駒 (piece_type, owner) の駒コードを返す。"""
+    return 1 + piece_type * 2 + owner
 
 
 @dataclass(frozen=True)  # イミュータブル（変更不可）なデータクラス
@@ -32,50 +49,96 @@ class Piece:
     owner: Player
 
 
-@dataclass(frozen=True)
-class Board:
-    """Immutable board state for 3x4 どうぶつしょうぎ.
+# (piece_type * 2 + owner) → 共有の Piece インスタンス（駒コード - 1 で引く表）。
+# Piece はイミュータブルなので、手を適用するたびに新しく作らずこれを使い回す。
+# 手の適用で置く駒は必ず実在するので、None を含まないこの表を引く
+OWNED_PIECES: tuple[Piece, ...] = tuple(
+    Piece(PieceType(i // 2), Player(i % 2)) for i in range(NUM_CODES - 1)
+)
+# 駒コード → 共有の Piece インスタンス（コード0の空きマスは None）
+PIECES: tuple[Piece | None, ...] = (None, *OWNED_PIECES)
 
-    3×4 = 12マスの盤面を表すイミュータブルなデータ構造。
 
-    squares: 12要素のタプル（行優先）。各要素は Piece | None。
-             squares[row * COLS + col] でマス(row, col)にアクセス。
-    hands: 2要素のタプル。hands[0]=先手の持ち駒、hands[1]=後手の持ち駒。
+@cache
+def _initial_squares() -> tuple[Piece | None, ...]:
+    """Return the standard starting position.
+
+    標準的な初期配置を返す。
+    初回に作ったタプルを返し続けるので、Board() のたびに配置を組み直さない
+    （タプルも Piece もイミュータブルなので共有して安全）。
+
+    Row 0 (top):    GOTE side — Elephant Lion Giraffe  （後手の陣地）
+    Row 1:          _ Chick(GOTE) _
+    Row 2:          _ Chick(SENTE) _
+    Row 3 (bottom): SENTE side — Giraffe Lion Elephant  （先手の陣地）
     """
+    squares: list[Piece | None] = [None] * (ROWS * COLS)
 
-    squares: tuple[Piece | None, ...] = field(default_factory=lambda: Board._initial_squares())
-    hands: tuple[tuple[PieceType, ...], tuple[PieceType, ...]] = ((), ())
+    # 後手の後ろ段（Row 0）: ぞう・ライオン・きりん
+    squares[0 * COLS + 0] = Piece(PieceType.GIRAFFE, Player.GOTE)
+    squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
+    squares[0 * COLS + 2] = Piece(PieceType.ELEPHANT, Player.GOTE)
 
-    @staticmethod
-    def _initial_squares() -> tuple[Piece | None, ...]:
-        """Return the standard starting position.
+    # Row 1: 後手のひよこ（中央）
+    squares[1 * COLS + 1] = Piece(PieceType.CHICK, Player.GOTE)
 
-        標準的な初期配置を返す。
+    # Row 2: 先手のひよこ（中央）
+    squares[2 * COLS + 1] = Piece(PieceType.CHICK, Player.SENTE)
 
-        Row 0 (top):    GOTE side — Elephant Lion Giraffe  （後手の陣地）
-        Row 1:          _ Chick(GOTE) _
-        Row 2:          _ Chick(SENTE) _
-        Row 3 (bottom): SENTE side — Giraffe Lion Elephant  （先手の陣地）
-        """
-        squares: list[Piece | None] = [None] * (ROWS * COLS)
+    # 先手の後ろ段（Row 3）: ぞう・ライオン・きりん（左右対称）
+    squares[3 * COLS + 0] = Piece(PieceType.ELEPHANT, Player.SENTE)
+    squares[3 * COLS + 1] = Piece(PieceType.LION, Player.SENTE)
+    squares[3 * COLS + 2] = Piece(PieceType.GIRAFFE, Player.SENTE)
 
-        # 後手の後ろ段（Row 0）: ぞう・ライオン・きりん
-        squares[0 * COLS + 0] = Piece(PieceType.GIRAFFE, Player.GOTE)
-        squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
-        squares[0 * COLS + 2] = Piece(PieceType.ELEPHANT, Player.GOTE)
+    return tuple(squares)
 
-        # Row 1: 後手のひよこ（中央）
-        squares[1 * COLS + 1] = Piece(PieceType.CHICK, Player.GOTE)
 
-        # Row 2: 先手のひよこ（中央）
-        squares[2 * COLS + 1] = Piece(PieceType.CHICK, Player.SENTE)
+@dataclass(frozen=True, slots=True)
+class Board:
+    """Immutable board state for 3x4 どうぶつしょうぎ.
 
-        # 先手の後ろ段（Row 3）: ぞう・ライオン・きりん（左右対称）
-        squares[3 * COLS + 0] = Piece(PieceType.ELEPHANT, Player.SENTE)
-        squares[3 * COLS + 1] = Piece(PieceType.LION, Player.SENTE)
-        squares[3 * COLS + 2] = Piece(PieceType.GIRAFFE, Player.SENTE)
+    3×4 = 12マスの盤面を表すイミュータブルなデータ構造。
 
-        return tuple(squares)
+    squares: 12要素のタプル（行優先）。各要素は Piece | None。
+             squares[row * COLS + col] でマス(row, col)にアクセス。
+    hands: 2要素のタプル。hands[0]=先手の持ち駒、hands[1]=後手の持ち駒（駒種の昇順）。
+    """
+
+    squares: tuple[Piece | None, ...] = field(default_factory=_initial_squares)
+    hands: tuple[tuple[PieceType, ...], tuple[PieceType, ...]] = ((), ())
+    # Zobrist ハッシュ。-1 は未計算を表し、__post_init__ で盤面全体から計算する。
+    # set_piece などの変更メソッドは差分更新した値を渡すので再計算は起きない。
+    zobrist: int = field(default=-1, compare=False, repr=False)
+    # squares と同じ内容の駒コード列（1マス1バイト）。空なら __post_init__ で作る。
+    codes: bytes = field(default=b"", compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.zobrist < 0:
+            # 外から渡された持ち駒は駒種の昇順に揃える
+            # （add_to_hand などの二分探索と、持ち駒の同値判定がこの順序を前提にする）
+            hands = (tuple(sorted(self.hands[0])), tuple(sorted(self.hands[1])))
+            object.__setattr__(self, "hands", hands)
+            object.__setattr__(self, "zobrist", ZOBRIST.board_hash(self.squares, hands))
+        if not self.codes:
+            codes = bytes(
+                EMPTY_CODE if p is None else piece_code(p.piece_type, p.owner)
+                for p in self.squares
+            )
+            object.__setattr__(self, "codes", codes)
+
+    def __eq__(self, other: object) -> bool:
+        # Zobrist ハッシュを先に比べ、違えば即座に False（ほとんどの不一致はここで決まる）。
+        # 一致したら衝突に備えて駒コード列（memcmp）と持ち駒で確かめる
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (
+            self.zobrist == other.zobrist
+            and self.codes == other.codes
+            and self.hands == other.hands
+        )
+
+    def __hash__(self) -> int:
+        return self.zobrist
 
     def piece_at(self, row: int, col: int) -> Piece | None:
         """Return the piece at (row, col), or None.
@@ -92,8 +155,41 @@ class Board:
         """
         idx = row * COLS + col
         squares = list(self.squares)  # タプルをリストに変換して変更
+        old = squares[idx]
         squares[idx] = piece
-        return Board(squares=tuple(squares), hands=self.hands)
+        # 差分更新: 取り除く駒と置く駒の鍵だけを XOR する
+        h = self.zobrist
+        code = EMPTY_CODE
+        if old is not None:
+            h ^= ZOBRIST.piece(old.piece_type, old.owner, idx)
+        if piece is not None:
+            h ^= ZOBRIST.piece(piece.piece_type, piece.owner, idx)
+            code = piece_code(piece.piece_type, piece.owner)
+        codes = self.codes[:idx] + _CODE_BYTES[code] + self.codes[idx + 1 :]
+        return Board(squares=tuple(squares), hands=self.hands, zobrist=h, codes=codes)
+
+    def move_piece(self, from_idx: int, to_idx: int, piece: Piece) -> Board:
+        """Return a new Board with from_idx emptied and piece placed on to_idx.
+
+        移動元を空にし、移動先に piece を置いた新しい Board を返す。
+        set_piece を2回呼ぶのと同じ結果だが、盤面のコピーは1回で済む。
+        移動先にあった駒は盤上から消えるだけなので、持ち駒への追加は呼び出し側で行う。
+        """
+        squares = list(self.squares)
+        moved = squares[from_idx]
+        captured = squares[to_idx]
+        squares[from_idx] = None
+        squares[to_idx] = piece
+        # 差分更新: 動いた駒・取られた駒・置いた駒の鍵だけを XOR する
+        h = self.zobrist ^ ZOBRIST.piece(piece.piece_type, piece.owner, to_idx)
+        if moved is not None:
+            h ^= ZOBRIST.piece(moved.piece_type, moved.owner, from_idx)
+        if captured is not None:
+            h ^= ZOBRIST.piece(captured.piece_type, captured.owner, to_idx)
+        codes = bytearray(self.codes)
+        codes[from_idx] = EMPTY_CODE
+        codes[to_idx] = piece_code(piece.piece_type, piece.owner)
+        return Board(squares=tuple(squares), hands=self.hands, zobrist=h, codes=bytes(codes))
 
     def add_to_hand(self, player: Player, piece_type: PieceType) -> Board:
         """Return a new Board with piece_type added to player's hand.
@@ -101,26 +197,40 @@ class Board:
         プレイヤーの持ち駒に駒を追加した新しい Board を返す。
         成り駒（にわとり）を取ったら元の駒種（ひよこ）に戻す。
         """
-        hands = list(self.hands)
-        hand = list(hands[player.value])
         # 成り駒を取ったら元に戻す（にわとり → ひよこ）
         if piece_type == PieceType.HEN:
             piece_type = PieceType.CHICK
-        hand.append(piece_type)
-        hand.sort()  # ソートすることで持ち駒の順序を一意に保つ
-        hands[player.value] = tuple(hand)
-        return Board(squares=self.squares, hands=(hands[0], hands[1]))
+        hand = self.hands[player]
+        # 持ち駒はソート済みに保つ（順序を一意にする）ので、二分探索で挿入位置と枚数が分かる
+        end = bisect_right(hand, piece_type)
+        count = end - bisect_left(hand, piece_type)
+        new_hand = (*hand[:end], piece_type, *hand[end:])
+        hands = (new_hand, self.hands[1]) if player == 0 else (self.hands[0], new_hand)
+        h = (
+            self.zobrist
+            ^ ZOBRIST.hand(player, piece_type, count)
+            ^ ZOBRIST.hand(player, piece_type, count + 1)
+        )
+        return Board(squares=self.squares, hands=hands, zobrist=h, codes=self.codes)
 
     def remove_from_hand(self, player: Player, piece_type: PieceType) -> Board:
         """Return a new Board with one piece_type removed from player's hand.
 
         プレイヤーの持ち駒から駒を1枚取り除いた新しい Board を返す。
         """
-        hands = list(self.hands)
-        hand = list(hands[player.value])
-        hand.remove(piece_type)  # 最初に見つかった1枚を削除
-        hands[player.value] = tuple(hand)
-        return Board(squares=self.squares, hands=(hands[0], hands[1]))
+        hand = self.hands[player]
+        start = bisect_left(hand, piece_type)
+        count = bisect_right(hand, piece_type) - start
+        if not count:
+            raise ValueError(f"{piece_type!r} is not in hand")
+        new_hand = hand[:start] + hand[start + 1 :]
+        hands = (new_hand, self.hands[1]) if player == 0 else (self.hands[0], new_hand)
+        h = (
+            self.zobrist
+            ^ ZOBRIST.hand(player, piece_type, count)
+            ^ ZOBRIST.hand(player, piece_type, count - 1)
+        )
+        return Board(squares=self.squares, hands=hands, zobrist=h, codes=self.codes)
 
     def find_lion(self, player: Player) -> int | None:
         """Return the index of player's lion, or None if captured.
@@ -128,7 +238,5 @@ class Board:
         プレイヤーのライオンのマスインデックスを返す。
         ライオンが取られていれば None（勝敗判定に使用）。
         """
-        for idx, piece in enumerate(self.squares):
-            if piece is not None and piece.piece_type == PieceType.LION and piece.owner == player:
-                return idx
-        return None
+        idx = self.codes.find(_CODE_BYTES[piece_code(PieceType.LION, player)])
+        return idx if idx >= 0 else None
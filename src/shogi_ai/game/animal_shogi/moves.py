@@ -16,7 +16,7 @@ from __future__ import annotations
 
 from typing import Final
 
-from shogi_ai.game.animal_shogi.board import Board, Piece
+from shogi_ai.game.animal_shogi.board import NUM_CODES, OWNED_PIECES, Board, Piece, piece_code
 from shogi_ai.game.animal_shogi.types import (
     COLS,
     HAND_PIECE_TYPES,
@@ -32,6 +32,36 @@ ACTION_SPACE = 180  # どうぶつしょうぎの全行動数
 DROP_OFFSET: Final[int] = ROWS * COLS * ROWS * COLS  # = 144
 
 
+def _build_targets() -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """駒コード → 移動元マス → 移動先マスのタプル、の表を作る。
+
+    盤外判定と後手の向きの反転を起動時に1回だけ済ませておくので、
+    合法手生成では表を引いて自駒のマスを除くだけになる。
+    移動先の並びは PIECE_MOVES の方向の順（従来の生成順と同じ）。
+    """
+    table: list[tuple[tuple[int, ...], ...]] = [()] * NUM_CODES
+    for pt, deltas in PIECE_MOVES.items():
+        for player in Player:
+            per_square: list[tuple[int, ...]] = []
+            for idx in range(ROWS * COLS):
+                row, col = idx // COLS, idx % COLS
+                targets: list[int] = []
+                for dr, dc in deltas:
+                    # 後手（GOTE）は移動方向を縦に反転（先後対称な設計）
+                    if player == Player.GOTE:
+                        dr = -dr
+                    nr, nc = row + dr, col + dc
+                    if 0 <= nr < ROWS and 0 <= nc < COLS:
+                        targets.append(nr * COLS + nc)
+                per_square.append(tuple(targets))
+            table[piece_code(pt, player)] = tuple(per_square)
+    return tuple(table)
+
+
+# 駒コードごとの移動先表: _TARGETS[code][from_idx] = 移動先マスのタプル
+_TARGETS = _build_targets()
+
+
 def encode_board_move(from_idx: int, to_idx: int) -> int:
     """Encode a board move as an integer.
 
@@ -51,12 +81,8 @@ def encode_drop_move(piece_type: PieceType, to_idx: int) -> int:
     return DROP_OFFSET + pt_index * 12 + to_idx
 
 
-def decode_move(move: int) -> dict:
-    """Decode a move integer into a descriptive dict.
-
-    整数の手を人間が読める辞書形式にデコードする。
-    表示や Web API のレスポンスで使用する。
-    """
+def _decode(move: int) -> dict:
+    """手の整数を辞書に変換する（_DECODED の表を作るときだけ使う）。"""
     if move < DROP_OFFSET:  # 盤上の手
         from_idx = move // 12
         to_idx = move % 12
@@ -76,6 +102,33 @@ def decode_move(move: int) -> dict:
         }
 
 
+# 全180手のデコード結果と (移動元, 移動先) を起動時に作っておく
+_DECODED = tuple(_decode(move) for move in range(ACTION_SPACE))
+_MOVE_SQUARES: tuple[tuple[int | None, int], ...] = tuple(
+    (move // 12, move % 12) if move < DROP_OFFSET else (None, (move - DROP_OFFSET) % 12)
+    for move in range(ACTION_SPACE)
+)
+
+
+def decode_move(move: int) -> dict:
+    """Decode a move integer into a descriptive dict.
+
+    整数の手を人間が読める辞書形式にデコードする。
+    表示や Web API のレスポンスで使用する。
+    事前に作った表を引き、呼び出し側が書き換えても表が壊れないようコピーを返す。
+    """
+    return dict(_DECODED[move])
+
+
+def move_squares(move: int) -> tuple[int | None, int]:
+    """Return (from_idx, to_idx) of a move; from_idx is None for drops.
+
+    手の移動元・移動先のマスインデックスを返す（打ち手の移動元は None）。
+    decode_move と違い辞書を作らないので、探索中の手の並べ替えに使える。
+    """
+    return _MOVE_SQUARES[move]
+
+
 def legal_moves(board: Board, player: Player) -> list[int]:
     """Generate all legal moves for the given player.
 
@@ -90,42 +143,28 @@ def legal_moves(board: Board, player: Player) -> list[int]:
     自玉が取られる手は除外しない（ライオン取りが勝利条件のため）。
     """
     moves: list[int] = []
+    codes = board.codes  # 駒コード列（0=空き, 1 + 駒種 * 2 + 所有者）
 
     # --- 盤上の手の生成 ---
-    for idx, piece in enumerate(board.squares):
-        if piece is None or piece.owner != player:
+    # 駒コードの下位ビット（code - 1 の偶奇）が所有者を表す
+    # どうぶつしょうぎの成りは強制なので、成る手と成らない手を区別する必要はない
+    for idx, code in enumerate(codes):
+        if not code or (code - 1) & 1 != player:
             continue  # 空マスまたは相手の駒はスキップ
-        row, col = idx // COLS, idx % COLS
-        deltas = PIECE_MOVES[piece.piece_type]
-
-        for dr, dc in deltas:
-            # 後手（GOTE）は移動方向を縦に反転（先後対称な設計）
-            if player == Player.GOTE:
-                dr = -dr
-            nr, nc = row + dr, col + dc
-            if not (0 <= nr < ROWS and 0 <= nc < COLS):
-                continue  # 盤外はスキップ
-            target = board.piece_at(nr, nc)
-            if target is not None and target.owner == player:
+        base = idx * 12
+        for to_idx in _TARGETS[code][idx]:
+            target = codes[to_idx]
+            if target and (target - 1) & 1 == player:
                 continue  # 自分の駒のある場所には動けない
-
-            to_idx = nr * COLS + nc
-            move = encode_board_move(idx, to_idx)
-
-            # 成り判定（ひよこが相手陣地後段に到達 → 自動的ににわとりになる）
-            if _should_promote(piece, player, nr):
-                moves.append(move)  # どうぶつしょうぎの成りは強制・任意同一
-            else:
-                moves.append(move)
+            moves.append(base + to_idx)  # encode_board_move(idx, to_idx)
 
     # --- 持ち駒打ちの生成 ---
     hand = board.hands[player.value]
-    unique_in_hand = set(hand)  # 同じ駒種を重複して生成しないよう集合に
-    for pt in unique_in_hand:
-        for idx in range(ROWS * COLS):
-            if board.squares[idx] is not None:
-                continue  # 駒のあるマスには打てない
-            moves.append(encode_drop_move(pt, idx))
+    if hand:
+        empty = [idx for idx, code in enumerate(codes) if not code]  # 駒のあるマスには打てない
+        unique_in_hand = set(hand)  # 同じ駒種を重複して生成しないよう集合に
+        for pt in unique_in_hand:
+            moves.extend([encode_drop_move(pt, idx) for idx in empty])
 
     return moves
 
@@ -166,15 +205,8 @@ def _apply_board_move(board: Board, player: Player, move: int) -> Board:
     if _should_promote(piece, player, to_row):
         new_piece_type = PieceType.HEN
 
-    # 駒を移動: 移動元を空にして、移動先に新しい駒を置く
-    new_board = new_board.set_piece(from_row, from_col, None)
-    new_board = new_board.set_piece(
-        to_idx // COLS,
-        to_idx % COLS,
-        Piece(new_piece_type, player),
-    )
-
-    return new_board
+    # 駒を移動: 移動元を空にして、移動先に新しい駒を置く（盤面のコピーは1回）
+    return new_board.move_piece(from_idx, to_idx, OWNED_PIECES[new_piece_type * 2 + player])
 
 
 def _apply_drop_move(board: Board, player: Player, move: int) -> Board:
@@ -191,7 +223,7 @@ def _apply_drop_move(board: Board, player: Player, move: int) -> Board:
 
     # 持ち駒から1枚取り除いて盤上に配置
     new_board = board.remove_from_hand(player, piece_type)
-    new_board = new_board.set_piece(to_row, to_col, Piece(piece_type, player))
+    new_board = new_board.set_piece(to_row, to_col, OWNED_PIECES[piece_type * 2 + player])
 
     return new_board
 
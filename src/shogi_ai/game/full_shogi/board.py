@@ -6,16 +6,32 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from functools import cache
 
 from shogi_ai.game.full_shogi.types import (
     COLS,
     NUM_SQUARES,
-    ROWS,
     UNPROMOTION_MAP,
     PieceType,
     Player,
 )
+from shogi_ai.game.zobrist import ZobristTable
+
+# Zobrist 乱数表（持ち駒は歩の18枚が最大）
+ZOBRIST = ZobristTable(len(PieceType), NUM_SQUARES, max_hand_count=18, seed=368818)
+
+# 駒コード: 盤面を1マス1バイトの bytes（Board.codes）でも持つための整数表現
+# 0 = 空きマス、1 + 駒種 * 2 + 所有者 = 駒。find_lion などは bytes の C 実装の検索で済む
+EMPTY_CODE = 0
+NUM_CODES = 1 + len(PieceType) * 2
+_CODE_BYTES = tuple(bytes((c,)) for c in range(NUM_CODES))
+
+
+def piece_code(piece_type: int, owner: int) -> int:
+    """駒 (piece_type, owner) の駒コードを返す。"""
+    return 1 + piece_type * 2 + owner
 
 
 @dataclass(frozen=True)
@@ -29,77 +45,122 @@ class Piece:
     owner: Player
 
 
-@dataclass(frozen=True)
+# (piece_type * 2 + owner) → 共有の Piece インスタンス（駒コード - 1 で引く表）。
+# Piece はイミュータブルなので、手を適用するたびに新しく作らずこれを使い回す。
+# 手の適用で置く駒は必ず実在するので、None を含まないこの表を引く
+OWNED_PIECES: tuple[Piece, ...] = tuple(
+    Piece(PieceType(i // 2), Player(i % 2)) for i in range(NUM_CODES - 1)
+)
+# 駒コード → 共有の Piece インスタンス（コード0の空きマスは None）
+PIECES: tuple[Piece | None, ...] = (None, *OWNED_PIECES)
+
+
+@cache
+def _initial_squares() -> tuple[Piece | None, ...]:
+    """Return the standard starting position (平手).
+
+    本将棋の標準初期配置（平手）を返す。
+    初回に作ったタプルを返し続けるので、Board() のたびに配置を組み直さない。
+
+    Row 0 = 後手の後段（上端）、Row 8 = 先手の後段（下端）。
+    将棋盤の「9筋」表記と異なり、プログラムでは列0が左（9筋）になる点に注意。
+    """
+    squares: list[Piece | None] = [None] * NUM_SQUARES
+
+    # 後手の後段（Row 0）: 香桂銀金王金銀桂香
+    gote_back = [
+        PieceType.LANCE,
+        PieceType.KNIGHT,
+        PieceType.SILVER,
+        PieceType.GOLD,
+        PieceType.KING,
+        PieceType.GOLD,
+        PieceType.SILVER,
+        PieceType.KNIGHT,
+        PieceType.LANCE,
+    ]
+    for c, pt in enumerate(gote_back):
+        squares[0 * COLS + c] = Piece(pt, Player.GOTE)
+
+    # Row 1: 後手の飛角（飛車=右、角行=左に配置）
+    squares[1 * COLS + 1] = Piece(PieceType.ROOK, Player.GOTE)  # 飛車
+    squares[1 * COLS + 7] = Piece(PieceType.BISHOP, Player.GOTE)  # 角行
+
+    # Row 2: 後手の歩兵（9枚）
+    for c in range(COLS):
+        squares[2 * COLS + c] = Piece(PieceType.PAWN, Player.GOTE)
+
+    # 先手の歩兵（Row 6）
+    for c in range(COLS):
+        squares[6 * COLS + c] = Piece(PieceType.PAWN, Player.SENTE)
+
+    # Row 7: 先手の飛角（後手と鏡像）
+    squares[7 * COLS + 1] = Piece(PieceType.BISHOP, Player.SENTE)  # 角行
+    squares[7 * COLS + 7] = Piece(PieceType.ROOK, Player.SENTE)  # 飛車
+
+    # 先手の後段（Row 8）: 香桂銀金王金銀桂香
+    sente_back = [
+        PieceType.LANCE,
+        PieceType.KNIGHT,
+        PieceType.SILVER,
+        PieceType.GOLD,
+        PieceType.KING,
+        PieceType.GOLD,
+        PieceType.SILVER,
+        PieceType.KNIGHT,
+        PieceType.LANCE,
+    ]
+    for c, pt in enumerate(sente_back):
+        squares[8 * COLS + c] = Piece(pt, Player.SENTE)
+
+    return tuple(squares)
+
+
+@dataclass(frozen=True, slots=True)
 class Board:
     """Immutable board state for 9x9 本将棋.
 
     9×9 = 81マスの盤面を表すイミュータブルなデータ構造。
 
     squares: 81要素のタプル（行優先）。squares[row * COLS + col] でアクセス。
-    hands: 2要素のタプル。hands[0]=先手の持ち駒、hands[1]=後手の持ち駒。
+    hands: 2要素のタプル。hands[0]=先手の持ち駒、hands[1]=後手の持ち駒（駒種の昇順）。
     """
 
-    squares: tuple[Piece | None, ...] = field(default_factory=lambda: Board._initial_squares())
+    squares: tuple[Piece | None, ...] = field(default_factory=_initial_squares)
     hands: tuple[tuple[PieceType, ...], tuple[PieceType, ...]] = ((), ())
-
-    @staticmethod
-    def _initial_squares() -> tuple[Piece | None, ...]:
-        """Return the standard starting position (平手).
-
-        本将棋の標準初期配置（平手）を返す。
-
-        Row 0 = 後手の後段（上端）、Row 8 = 先手の後段（下端）。
-        将棋盤の「9筋」表記と異なり、プログラムでは列0が左（9筋）になる点に注意。
-        """
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-
-        # 後手の後段（Row 0）: 香桂銀金王金銀桂香
-        gote_back = [
-            PieceType.LANCE,
-            PieceType.KNIGHT,
-            PieceType.SILVER,
-            PieceType.GOLD,
-            PieceType.KING,
-            PieceType.GOLD,
-            PieceType.SILVER,
-            PieceType.KNIGHT,
-            PieceType.LANCE,
-        ]
-        for c, pt in enumerate(gote_back):
-            squares[0 * COLS + c] = Piece(pt, Player.GOTE)
-
-        # Row 1: 後手の飛角（飛車=右、角行=左に配置）
-        squares[1 * COLS + 1] = Piece(PieceType.ROOK, Player.GOTE)  # 飛車
-        squares[1 * COLS + 7] = Piece(PieceType.BISHOP, Player.GOTE)  # 角行
-
-        # Row 2: 後手の歩兵（9枚）
-        for c in range(COLS):
-            squares[2 * COLS + c] = Piece(PieceType.PAWN, Player.GOTE)
-
-        # 先手の歩兵（Row 6）
-        for c in range(COLS):
-            squares[6 * COLS + c] = Piece(PieceType.PAWN, Player.SENTE)
-
-        # Row 7: 先手の飛角（後手と鏡像）
-        squares[7 * COLS + 1] = Piece(PieceType.BISHOP, Player.SENTE)  # 角行
-        squares[7 * COLS + 7] = Piece(PieceType.ROOK, Player.SENTE)  # 飛車
-
-        # 先手の後段（Row 8）: 香桂銀金王金銀桂香
-        sente_back = [
-            PieceType.LANCE,
-            PieceType.KNIGHT,
-            PieceType.SILVER,
-            PieceType.GOLD,
-            PieceType.KING,
-            PieceType.GOLD,
-            PieceType.SILVER,
-            PieceType.KNIGHT,
-            PieceType.LANCE,
-        ]
-        for c, pt in enumerate(sente_back):
-            squares[8 * COLS + c] = Piece(pt, Player.SENTE)
-
-        return tuple(squares)
+    # Zobrist ハッシュ。-1 は未計算を表し、__post_init__ で盤面全体から計算する。
+    # set_piece などの変更メソッドは差分更新した値を渡すので再計算は起きない。
+    zobrist: int = field(default=-1, compare=False, repr=False)
+    # squares と同じ内容の駒コード列（1マス1バイト）。空なら __post_init__ で作る。
+    codes: bytes = field(default=b"", compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.zobrist < 0:
+            # 外から渡された持ち駒は駒種の昇順に揃える
+            # （add_to_hand などの二分探索と、持ち駒の同値判定がこの順序を前提にする）
+            hands = (tuple(sorted(self.hands[0])), tuple(sorted(self.hands[1])))
+            object.__setattr__(self, "hands", hands)
+            object.__setattr__(self, "zobrist", ZOBRIST.board_hash(self.squares, hands))
+        if not self.codes:
+            codes = bytes(
+                EMPTY_CODE if p is None else piece_code(p.piece_type, p.owner)
+                for p in self.squares
+            )
+            object.__setattr__(self, "codes", codes)
+
+    def __eq__(self, other: object) -> bool:
+        # Zobrist ハッシュを先に比べ、違えば即座に False（ほとんどの不一致はここで決まる）。
+        # 一致したら衝突に備えて駒コード列（memcmp）と持ち駒で確かめる
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (
+            self.zobrist == other.zobrist
+            and self.codes == other.codes
+            and self.hands == other.hands
+        )
+
+    def __hash__(self) -> int:
+        return self.zobrist
 
     def piece_at(self, row: int, col: int) -> Piece | None:
         """マス(row, col)の駒を返す。駒がなければ None。"""
@@ -109,8 +170,41 @@ class Board:
         """マス(row, col)の駒を変更した新しい Board を返す。"""
         idx = row * COLS + col
         squares = list(self.squares)
+        old = squares[idx]
         squares[idx] = piece
-        return Board(squares=tuple(squares), hands=self.hands)
+        # 差分更新: 取り除く駒と置く駒の鍵だけを XOR する
+        h = self.zobrist
+        code = EMPTY_CODE
+        if old is not None:
+            h ^= ZOBRIST.piece(old.piece_type, old.owner, idx)
+        if piece is not None:
+            h ^= ZOBRIST.piece(piece.piece_type, piece.owner, idx)
+            code = piece_code(piece.piece_type, piece.owner)
+        codes = self.codes[:idx] + _CODE_BYTES[code] + self.codes[idx + 1 :]
+        return Board(squares=tuple(squares), hands=self.hands, zobrist=h, codes=codes)
+
+    def move_piece(self, from_idx: int, to_idx: int, piece: Piece) -> Board:
+        """Return a new Board with from_idx emptied and piece placed on to_idx.
+
+        移動元を空にし、移動先に piece を置いた新しい Board を返す。
+        set_piece を2回呼ぶのと同じ結果だが、盤面のコピーは1回で済む。
+        移動先にあった駒は盤上から消えるだけなので、持ち駒への追加は呼び出し側で行う。
+        """
+        squares = list(self.squares)
+        moved = squares[from_idx]
+        captured = squares[to_idx]
+        squares[from_idx] = None
+        squares[to_idx] = piece
+        # 差分更新: 動いた駒・取られた駒・置いた駒の鍵だけを XOR する
+        h = self.zobrist ^ ZOBRIST.piece(piece.piece_type, piece.owner, to_idx)
+        if moved is not None:
+            h ^= ZOBRIST.piece(moved.piece_type, moved.owner, from_idx)
+        if captured is not None:
+            h ^= ZOBRIST.piece(captured.piece_type, captured.owner, to_idx)
+        codes = bytearray(self.codes)
+        codes[from_idx] = EMPTY_CODE
+        codes[to_idx] = piece_code(piece.piece_type, piece.owner)
+        return Board(squares=tuple(squares), hands=self.hands, zobrist=h, codes=bytes(codes))
 
     def add_to_hand(self, player: Player, piece_type: PieceType) -> Board:
         """Add piece to hand, reverting promoted pieces to base form.
@@ -118,32 +212,44 @@ class Board:
         取った駒を持ち駒に追加する。成り駒は元の駒種に戻す。
         例: 龍（成り飛）を取ったら、飛車として持ち駒に加える。
         """
-        hands = list(self.hands)
-        hand = list(hands[player.value])
         # 成り駒を取ったら元に戻す（UNPROMOTION_MAP で逆引き）
         base_type = UNPROMOTION_MAP.get(piece_type, piece_type)
-        hand.append(base_type)
-        hand.sort()  # 一意な順序を保つ
-        hands[player.value] = tuple(hand)
-        return Board(squares=self.squares, hands=(hands[0], hands[1]))
+        hand = self.hands[player]
+        # 持ち駒はソート済みに保つ（一意な順序）ので、二分探索で挿入位置と枚数が分かる
+        end = bisect_right(hand, base_type)
+        count = end - bisect_left(hand, base_type)
+        new_hand = (*hand[:end], base_type, *hand[end:])
+        hands = (new_hand, self.hands[1]) if player == 0 else (self.hands[0], new_hand)
+        h = (
+            self.zobrist
+            ^ ZOBRIST.hand(player, base_type, count)
+            ^ ZOBRIST.hand(player, base_type, count + 1)
+        )
+        return Board(squares=self.squares, hands=hands, zobrist=h, codes=self.codes)
 
     def remove_from_hand(self, player: Player, piece_type: PieceType) -> Board:
         """持ち駒から1枚取り除いた新しい Board を返す。"""
-        hands = list(self.hands)
-        hand = list(hands[player.value])
-        hand.remove(piece_type)
-        hands[player.value] = tuple(hand)
-        return Board(squares=self.squares, hands=(hands[0], hands[1]))
+        hand = self.hands[player]
+        start = bisect_left(hand, piece_type)
+        count = bisect_right(hand, piece_type) - start
+        if not count:
+            raise ValueError(f"{piece_type!r} is not in hand")
+        new_hand = hand[:start] + hand[start + 1 :]
+        hands = (new_hand, self.hands[1]) if player == 0 else (self.hands[0], new_hand)
+        h = (
+            self.zobrist
+            ^ ZOBRIST.hand(player, piece_type, count)
+            ^ ZOBRIST.hand(player, piece_type, count - 1)
+        )
+        return Board(squares=self.squares, hands=hands, zobrist=h, codes=self.codes)
 
     def find_king(self, player: Player) -> int | None:
         """プレイヤーの王将のマスインデックスを返す。王将がなければ None。
 
         チェック判定や終局判定に使用する。
         """
-        for idx, piece in enumerate(self.squares):
-            if piece is not None and piece.piece_type == PieceType.KING and piece.owner == player:
-                return idx
-        return None
+        idx = self.codes.find(_CODE_BYTES[piece_code(PieceType.KING, player)])
+        return idx if idx >= 0 else None
 
     def count_pawns_in_column(self, player: Player, col: int) -> int:
         """Count unpromoted pawns of player in a column (for 二歩 check).
@@ -151,9 +257,5 @@ class Board:
         指定列にあるプレイヤーの未成歩の枚数を返す。
         二歩（同じ列に2枚の歩を置くこと）を判定するために使用する。
         """
-        count = 0
-        for r in range(ROWS):
-            p = self.piece_at(r, col)
-            if p is not None and p.owner == player and p.piece_type == PieceType.PAWN:
-                count += 1
-        return count
+        # 列 col のマスは codes[col::COLS]（1マス1バイト）なので bytes.count で数えられる
+        return self.codes[col::COLS].count(piece_code(PieceType.PAWN, player))
@@ -11,7 +11,9 @@ Move encoding (from×to approach):
 
 from __future__ import annotations
 
-from shogi_ai.game.full_shogi.board import Board, Piece
+from functools import lru_cache
+
+from shogi_ai.game.full_shogi.board import NUM_CODES, OWNED_PIECES, Board, piece_code
 from shogi_ai.game.full_shogi.types import (
     COLS,
     DRAGON_EXTRA_STEPS,
@@ -76,15 +78,68 @@ def decode_move(move: int) -> dict:
         }
 
 
+def _move_squares(move: int) -> tuple[int | None, int]:
+    """手の (移動元, 移動先) を計算する（_MOVE_SQUARES の表を作るときだけ使う）。"""
+    if move >= _DROP_MOVE_BASE:
+        return None, (move - _DROP_MOVE_BASE) % NUM_SQUARES
+    if move >= _PROMO_MOVE_BASE:
+        move -= _PROMO_MOVE_BASE
+    return move // NUM_SQUARES, move % NUM_SQUARES
+
+
+# 全13689手の (移動元, 移動先) を起動時に作っておく（探索中の手の並べ替えで引く）
+_MOVE_SQUARES = tuple(_move_squares(move) for move in range(ACTION_SPACE))
+
+
+def move_squares(move: int) -> tuple[int | None, int]:
+    """Return (from_idx, to_idx) of a move; from_idx is None for drops."""
+    return _MOVE_SQUARES[move]
+
+
 def legal_moves(board: Board, player: Player) -> list[int]:
-    """Generate all legal moves (excluding moves that leave king in check)."""
+    """Generate all legal moves (excluding moves that leave king in check).
+
+    同じ局面（盤面・持ち駒・手番が一致）の結果はキャッシュから返す。
+    Board のハッシュは Zobrist 値で、等価判定は codes と持ち駒まで比べるので、
+    ハッシュが衝突しても別局面の結果を取り違えない。
+    """
+    return list(_cached_legal_moves(board, player))
+
+
+@lru_cache(maxsize=4096)
+def _cached_legal_moves(board: Board, player: Player) -> tuple[int, ...]:
+    # キャッシュ内の結果は共有されるのでタプルで持ち、呼び出し側にはコピーを返す
     pseudo = _pseudo_legal_moves(board, player)
+    king_idx = board.find_king(player)
+    if king_idx is None:
+        # 玉がない局面（テスト用など）は、すべての手を指してみて確かめる
+        return tuple(
+            move for move in pseudo if not _is_in_check(apply_move(board, player, move), player)
+        )
+
+    # 指してみて確かめるのは玉自身の移動だけ。それ以外の手は表を引くだけで判定する:
+    # - 王手されていれば、王手している駒を取るか間に入る手でなければならない（両王手なら不可）
+    # - ピンされた駒は、ピンの直線の上でしか動けない
+    checks = _check_blocks(board, player, king_idx)
+    if not checks:
+        blocks = None
+    elif len(checks) == 1:
+        blocks = checks[0]
+    else:
+        blocks = frozenset()
+    pins = _pinned_lines(board, player, king_idx)
     legal: list[int] = []
     for move in pseudo:
-        new_board = apply_move(board, player, move)
-        if not _is_in_check(new_board, player):
-            legal.append(move)
-    return legal
+        from_idx, to_idx = _MOVE_SQUARES[move]
+        if from_idx == king_idx:
+            if _is_in_check(apply_move(board, player, move), player):
+                continue
+        elif blocks is not None and to_idx not in blocks:
+            continue  # 王手を解消しない
+        elif from_idx in pins and to_idx not in pins[from_idx]:
+            continue  # ピンの直線から外れると玉が飛び利きにさらされる
+        legal.append(move)
+    return tuple(legal)
 
 
 def apply_move(board: Board, player: Player, move: int) -> Board:
@@ -106,103 +161,23 @@ def _generate_board_moves(
     player: Player,
     moves: list[int],
 ) -> None:
-    """Generate board moves (step, slide, knight)."""
-    for idx in range(NUM_SQUARES):
-        piece = board.squares[idx]
-        if piece is None or piece.owner != player:
-            continue
-
-        row, col = idx // COLS, idx % COLS
-        pt = piece.piece_type
-
-        # Step moves
-        if pt in STEP_MOVES:
-            for dr, dc in STEP_MOVES[pt]:
-                if player == Player.GOTE:
-                    dr = -dr
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < ROWS and 0 <= nc < COLS:
-                    target = board.piece_at(nr, nc)
-                    if target is None or target.owner != player:
-                        to_idx = nr * COLS + nc
-                        _add_move_with_promotion(
-                            moves,
-                            idx,
-                            to_idx,
-                            pt,
-                            player,
-                            row,
-                            nr,
-                        )
-
-        # Knight moves
-        if pt == PieceType.KNIGHT:
-            for dr, dc in KNIGHT_MOVES:
-                if player == Player.GOTE:
-                    dr = -dr
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < ROWS and 0 <= nc < COLS:
-                    target = board.piece_at(nr, nc)
-                    if target is None or target.owner != player:
-                        to_idx = nr * COLS + nc
-                        _add_move_with_promotion(
-                            moves,
-                            idx,
-                            to_idx,
-                            pt,
-                            player,
-                            row,
-                            nr,
-                        )
-
-        # Slide moves
-        if pt in SLIDE_MOVES:
-            for dr, dc in SLIDE_MOVES[pt]:
-                if player == Player.GOTE:
-                    dr, dc = -dr, -dc
-                nr, nc = row + dr, col + dc
-                while 0 <= nr < ROWS and 0 <= nc < COLS:
-                    target = board.piece_at(nr, nc)
-                    if target is not None and target.owner == player:
-                        break
-                    to_idx = nr * COLS + nc
-                    _add_move_with_promotion(
-                        moves,
-                        idx,
-                        to_idx,
-                        pt,
-                        player,
-                        row,
-                        nr,
-                    )
-                    if target is not None:
-                        break  # Captured, stop sliding
-                    nr, nc = nr + dr, nc + dc
-
-        # Horse extra step moves (orthogonal 1-step)
-        if pt == PieceType.HORSE:
-            for dr, dc in HORSE_EXTRA_STEPS:
-                if player == Player.GOTE:
-                    dr = -dr
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < ROWS and 0 <= nc < COLS:
-                    target = board.piece_at(nr, nc)
-                    if target is None or target.owner != player:
-                        to_idx = nr * COLS + nc
-                        # Horse cannot promote further
-                        moves.append(encode_board_move(idx, to_idx))
-
-        # Dragon extra step moves (diagonal 1-step)
-        if pt == PieceType.DRAGON:
-            for dr, dc in DRAGON_EXTRA_STEPS:
-                if player == Player.GOTE:
-                    dr = -dr
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < ROWS and 0 <= nc < COLS:
-                    target = board.piece_at(nr, nc)
-                    if target is None or target.owner != player:
-                        to_idx = nr * COLS + nc
-                        moves.append(encode_board_move(idx, to_idx))
+    """Generate board moves (step, slide, knight).
+
+    盤上の手を生成する。移動先と手のエンコードは _MOVE_RAYS を引くだけで、
+    ここでは自駒・相手駒による遮りだけを判定する。
+    """
+    codes = board.codes  # 駒コード列（0=空き, 1 + 駒種 * 2 + 所有者）
+    for idx, code in enumerate(codes):
+        if not code or (code - 1) & 1 != player:
+            continue  # 空マスまたは相手の駒はスキップ
+        for ray in _MOVE_RAYS[code][idx]:
+            for to_idx, encoded in ray:
+                target = codes[to_idx]
+                if target and (target - 1) & 1 == player:
+                    break  # 自駒で遮られる
+                moves.extend(encoded)
+                if target:
+                    break  # Captured, stop sliding
 
 
 def _add_move_with_promotion(
@@ -247,6 +222,135 @@ def _must_promote(piece_type: PieceType, player: Player, dest_row: int) -> bool:
     return False
 
 
+# 1方向分の移動先の列。_MOVE_RAYS は移動先ごとに (to_idx, その移動先への手) を持つ
+_MoveRay = tuple[tuple[int, tuple[int, ...]], ...]
+
+
+def _ray(row: int, col: int, dr: int, dc: int, limit: int) -> list[int]:
+    """(row, col) から (dr, dc) 方向に最大 limit マス、盤内の移動先を並べる。"""
+    squares: list[int] = []
+    nr, nc = row + dr, col + dc
+    while 0 <= nr < ROWS and 0 <= nc < COLS and len(squares) < limit:
+        squares.append(nr * COLS + nc)
+        nr, nc = nr + dr, nc + dc
+    return squares
+
+
+def _piece_directions(
+    piece_type: PieceType,
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]], list[tuple[int, int]]]:
+    """駒種の (1マス移動・桂馬, 飛び, 馬・龍の追加1マス) の方向（先手視点）を返す。"""
+    steps = list(STEP_MOVES.get(piece_type, []))
+    if piece_type == PieceType.KNIGHT:
+        steps += KNIGHT_MOVES
+    extra_steps: list[tuple[int, int]] = []
+    if piece_type == PieceType.HORSE:
+        extra_steps = HORSE_EXTRA_STEPS
+    elif piece_type == PieceType.DRAGON:
+        extra_steps = DRAGON_EXTRA_STEPS
+    return steps, SLIDE_MOVES.get(piece_type, []), extra_steps
+
+
+def _build_rays() -> tuple[tuple[tuple[_MoveRay, ...], ...], ...]:
+    """駒コード → 移動元マス → 方向ごとの移動先の列、の表を作る。
+
+    1マス移動と桂馬の跳びは長さ1の方向、飛び駒は盤端までの方向として同じ形で持つ。
+    方向の並びは 1マス移動 → 桂馬 → 飛び → 馬・龍の追加1マス（従来の生成順と同じ）。
+    盤外判定・後手の向きの反転・成り/不成の展開を起動時に1回だけ済ませておく。
+    """
+    move_table: list[tuple[tuple[_MoveRay, ...], ...]] = [()] * NUM_CODES
+    for pt in PieceType:
+        steps, slides, extra_steps = _piece_directions(pt)
+        for player in Player:
+            # 後手は1マス移動の縦方向、飛びの縦横両方向を反転する
+            sign = -1 if player == Player.GOTE else 1
+            move_per_square: list[tuple[_MoveRay, ...]] = []
+            for idx in range(NUM_SQUARES):
+                row, col = idx // COLS, idx % COLS
+                rays = [_ray(row, col, sign * dr, dc, 1) for dr, dc in steps]
+                rays += [_ray(row, col, sign * dr, sign * dc, ROWS) for dr, dc in slides]
+                rays += [_ray(row, col, sign * dr, dc, 1) for dr, dc in extra_steps]
+                rays = [ray for ray in rays if ray]
+
+                move_rays: list[_MoveRay] = []
+                for ray in rays:
+                    entries: list[tuple[int, tuple[int, ...]]] = []
+                    for to_idx in ray:
+                        encoded: list[int] = []
+                        _add_move_with_promotion(
+                            encoded, idx, to_idx, pt, player, row, to_idx // COLS
+                        )
+                        entries.append((to_idx, tuple(encoded)))
+                    move_rays.append(tuple(entries))
+                move_per_square.append(tuple(move_rays))
+            move_table[piece_code(pt, player)] = tuple(move_per_square)
+    return tuple(move_table)
+
+
+# 玉から見た8方向（飛び利きを逆向きにたどる方向）
+_LINE_DIRECTIONS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+def _build_attack_tables() -> tuple[
+    tuple[tuple[frozenset[int], ...], ...],
+    tuple[tuple[int, ...], ...],
+    tuple[tuple[tuple[int, tuple[int, ...]], ...], ...],
+    tuple[tuple[frozenset[int], ...], ...],
+]:
+    """王手判定用の表を作る。
+
+    - 1マス利き（桂馬・馬龍の追加1マスを含む）: 駒コード → マス → 利きのマスの集合
+    - 1マス利きの利き元: マス → そのマスに1マス利き（桂馬を含む）を持ちうるマス
+    - 玉から見た直線: マス → (方向番号, 盤端までのマスの列) の列
+    - 飛び利きの利き手: 攻める側 → 方向番号 → その方向から玉へ飛んでこられる駒コード
+    """
+    step_table: list[tuple[frozenset[int], ...]] = [()] * NUM_CODES
+    slide_attackers: list[list[set[int]]] = [[set() for _ in _LINE_DIRECTIONS] for _ in Player]
+    for pt in PieceType:
+        steps, slides, extra_steps = _piece_directions(pt)
+        for player in Player:
+            sign = -1 if player == Player.GOTE else 1
+            code = piece_code(pt, player)
+            step_table[code] = tuple(
+                frozenset(
+                    sq
+                    for dr, dc in steps + extra_steps
+                    for sq in _ray(idx // COLS, idx % COLS, sign * dr, dc, 1)
+                )
+                for idx in range(NUM_SQUARES)
+            )
+            # 駒が (dr, dc) に飛ぶなら、玉から逆向き (-dr, -dc) にたどって最初に当たる駒として利く
+            for dr, dc in slides:
+                line = _LINE_DIRECTIONS.index((-sign * dr, -sign * dc))
+                slide_attackers[player][line].add(code)
+
+    # 隣接8マスと、先後どちらの桂馬でも跳んでこられる4マス
+    source_offsets = _LINE_DIRECTIONS + [(dr, dc) for dr in (-2, 2) for dc in (-1, 1)]
+    sources = tuple(
+        tuple(sq for dr, dc in source_offsets for sq in _ray(idx // COLS, idx % COLS, dr, dc, 1))
+        for idx in range(NUM_SQUARES)
+    )
+    lines = tuple(
+        tuple(
+            (line, tuple(ray))
+            for line, (dr, dc) in enumerate(_LINE_DIRECTIONS)
+            if (ray := _ray(idx // COLS, idx % COLS, dr, dc, ROWS))
+        )
+        for idx in range(NUM_SQUARES)
+    )
+    attackers = tuple(
+        tuple(frozenset(codes) for codes in per_line) for per_line in slide_attackers
+    )
+    return tuple(step_table), sources, lines, attackers
+
+
+# 駒コードごとの表: _MOVE_RAYS[code][from_idx] = 方向ごとの (移動先, 手) の列
+_MOVE_RAYS = _build_rays()
+# 王手判定用: _STEP_ATTACKS[code][idx] = 1マス利きの集合、_STEP_SOURCES[idx] = 1マス利きの利き元、
+# _KING_LINES[idx] = 玉から見た8方向の直線、_SLIDE_ATTACKERS[owner][line] = その直線の飛び駒
+_STEP_ATTACKS, _STEP_SOURCES, _KING_LINES, _SLIDE_ATTACKERS = _build_attack_tables()
+
+
 def _generate_drop_moves(
     board: Board,
     player: Player,
@@ -256,19 +360,23 @@ def _generate_drop_moves(
 ) -> None:
     """Generate drop moves with nifu (二歩) and dead-piece restrictions."""
     hand = board.hands[player.value]
+    if not hand:
+        return
     unique_in_hand = set(hand)
+    codes = board.codes
+    empty = [idx for idx, code in enumerate(codes) if not code]  # 駒のあるマスには打てない
+    # 二歩の判定用: 自分の未成の歩がある列
+    own_pawn = piece_code(PieceType.PAWN, player)
+    pawn_cols = {idx % COLS for idx, code in enumerate(codes) if code == own_pawn}
 
     for pt in unique_in_hand:
-        for idx in range(NUM_SQUARES):
-            if board.squares[idx] is not None:
-                continue
-
+        for idx in empty:
             row = idx // ROWS
             col = idx % COLS
 
             # 二歩: Cannot drop pawn in column that already has own pawn
             if pt == PieceType.PAWN:
-                if board.count_pawns_in_column(player, col) > 0:
+                if col in pawn_cols:
                     continue
 
             # 行き所のない駒: Cannot drop where piece has no future moves
@@ -330,13 +438,8 @@ def _apply_board_move(board: Board, player: Player, move: int) -> Board:
     if promote and piece.piece_type in PROMOTION_MAP:
         new_type = PROMOTION_MAP[piece.piece_type]
 
-    # Move piece
-    from_row, from_col = from_idx // COLS, from_idx % COLS
-    to_row, to_col = to_idx // COLS, to_idx % COLS
-    new_board = new_board.set_piece(from_row, from_col, None)
-    new_board = new_board.set_piece(to_row, to_col, Piece(new_type, player))
-
-    return new_board
+    # Move piece (移動元を空にして移動先に置く。盤面のコピーは1回)
+    return new_board.move_piece(from_idx, to_idx, OWNED_PIECES[new_type * 2 + player])
 
 
 def _apply_drop(board: Board, player: Player, move: int) -> Board:
@@ -348,85 +451,83 @@ def _apply_drop(board: Board, player: Player, move: int) -> Board:
     to_row, to_col = to_idx // COLS, to_idx % COLS
 
     new_board = board.remove_from_hand(player, pt)
-    new_board = new_board.set_piece(to_row, to_col, Piece(pt, player))
+    new_board = new_board.set_piece(to_row, to_col, OWNED_PIECES[pt * 2 + player])
     return new_board
 
 
+def _check_blocks(board: Board, player: Player, king_idx: int) -> list[frozenset[int]]:
+    """Return, per checking piece, the squares where a non-king move resolves that check.
+
+    player の玉に王手している相手の駒ごとに、玉以外の駒で王手を解消できるマスを返す。
+    1マス利きならその駒のマス（取る）、飛び利きならさらに玉との間のマス（合駒）。
+    王手されていなければ空のリスト。
+    """
+    codes = board.codes
+    opponent = player.opponent
+    blocks: list[frozenset[int]] = []
+    for sq in _STEP_SOURCES[king_idx]:
+        code = codes[sq]
+        if code and (code - 1) & 1 == opponent and king_idx in _STEP_ATTACKS[code][sq]:
+            blocks.append(frozenset((sq,)))
+    attackers = _SLIDE_ATTACKERS[opponent]
+    for line, squares in _KING_LINES[king_idx]:
+        for i, sq in enumerate(squares):
+            code = codes[sq]
+            if code:
+                if code in attackers[line]:
+                    blocks.append(frozenset(squares[: i + 1]))
+                break
+    return blocks
+
+
+def _pinned_lines(board: Board, player: Player, king_idx: int) -> dict[int, frozenset[int]]:
+    """Map each of player's pinned pieces to the squares it may still move to.
+
+    玉と相手の飛び駒の間にある唯一の自駒（ピンされた駒）ごとに、動いてよいマスを返す。
+    動いてよいのは玉と飛び駒の間のマスと、飛び駒を取るマスだけ。
+    """
+    codes = board.codes
+    attackers = _SLIDE_ATTACKERS[player.opponent]
+    pins: dict[int, frozenset[int]] = {}
+    for line, squares in _KING_LINES[king_idx]:
+        blocker = -1
+        for i, sq in enumerate(squares):
+            code = codes[sq]
+            if not code:
+                continue
+            if blocker < 0 and (code - 1) & 1 == player:
+                blocker = sq  # 最初に当たった自駒。その先に飛び駒がいればピン
+                continue
+            if blocker >= 0 and code in attackers[line]:
+                pins[blocker] = frozenset(squares[: i + 1])
+            break
+    return pins
+
+
 def _is_in_check(board: Board, player: Player) -> bool:
     """Check if player's king is under attack."""
     king_idx = board.find_king(player)
     if king_idx is None:
         return True  # King captured = in check
 
+    codes = board.codes
     opponent = player.opponent
-    king_row, king_col = king_idx // COLS, king_idx % COLS
-
-    # Check all opponent pieces for attacks on king
-    for idx in range(NUM_SQUARES):
-        piece = board.squares[idx]
-        if piece is None or piece.owner != opponent:
-            continue
-        if _attacks_square(board, piece, idx, king_row, king_col, opponent):
-            return True
-
-    return False
 
+    # 1マス利き（桂馬を含む）: 全駒を調べず、玉に1マス利きを持ちうるマスの駒だけを見る
+    for sq in _STEP_SOURCES[king_idx]:
+        code = codes[sq]
+        if code and (code - 1) & 1 == opponent and king_idx in _STEP_ATTACKS[code][sq]:
+            return True
 
-def _attacks_square(
-    board: Board,
-    piece: Piece,
-    piece_idx: int,
-    target_row: int,
-    target_col: int,
-    attacker: Player,
-) -> bool:
-    """Check if a piece at piece_idx attacks (target_row, target_col)."""
-    row, col = piece_idx // COLS, piece_idx % COLS
-    pt = piece.piece_type
-
-    # Step attacks
-    if pt in STEP_MOVES:
-        for dr, dc in STEP_MOVES[pt]:
-            if attacker == Player.GOTE:
-                dr = -dr
-            if row + dr == target_row and col + dc == target_col:
-                return True
-
-    # Knight attacks
-    if pt == PieceType.KNIGHT:
-        for dr, dc in KNIGHT_MOVES:
-            if attacker == Player.GOTE:
-                dr = -dr
-            if row + dr == target_row and col + dc == target_col:
-                return True
-
-    # Slide attacks
-    if pt in SLIDE_MOVES:
-        for dr, dc in SLIDE_MOVES[pt]:
-            if attacker == Player.GOTE:
-                dr, dc = -dr, -dc
-            nr, nc = row + dr, col + dc
-            while 0 <= nr < ROWS and 0 <= nc < COLS:
-                if nr == target_row and nc == target_col:
+    # 飛び利き: 玉から8方向にたどり、最初に当たった駒がその方向へ飛ぶ相手の駒なら王手
+    # （相手の全駒から利きをたどるより、玉の周りの直線だけを見るほうが調べるマスが少ない）
+    attackers = _SLIDE_ATTACKERS[opponent]
+    for line, squares in _KING_LINES[king_idx]:
+        for sq in squares:
+            code = codes[sq]
+            if code:
+                if code in attackers[line]:
                     return True
-                if board.piece_at(nr, nc) is not None:
-                    break
-                nr, nc = nr + dr, nc + dc
-
-    # Horse extra steps
-    if pt == PieceType.HORSE:
-        for dr, dc in HORSE_EXTRA_STEPS:
-            if attacker == Player.GOTE:
-                dr = -dr
-            if row + dr == target_row and col + dc == target_col:
-                return True
-
-    # Dragon extra steps
-    if pt == PieceType.DRAGON:
-        for dr, dc in DRAGON_EXTRA_STEPS:
-            if attacker == Player.GOTE:
-                dr = -dr
-            if row + dr == target_row and col + dc == target_col:
-                return True
+                break
 
     return False
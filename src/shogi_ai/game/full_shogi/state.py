@@ -7,13 +7,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 
 import torch
 
-from shogi_ai.game.full_shogi.board import Board
+from shogi_ai.game.full_shogi.board import NUM_CODES, ZOBRIST, Board
 from shogi_ai.game.full_shogi.moves import ACTION_SPACE
 from shogi_ai.game.full_shogi.moves import apply_move as _apply_move
 from shogi_ai.game.full_shogi.moves import legal_moves as _legal_moves
+from shogi_ai.game.full_shogi.moves import move_squares as _move_squares
 from shogi_ai.game.full_shogi.types import (
     COLS,
     HAND_PIECE_TYPES,
@@ -22,6 +24,19 @@ from shogi_ai.game.full_shogi.types import (
 )
 
 
+def _piece_planes(player: int) -> tuple[int, ...]:
+    """駒コード → player から見た駒チャンネル（自分 ch.0-13、相手 ch.14-27）の表。"""
+    planes = [0] * NUM_CODES
+    for code in range(1, NUM_CODES):
+        piece_type, owner = divmod(code - 1, 2)
+        planes[code] = piece_type if owner == player else 14 + piece_type
+    return tuple(planes)
+
+
+# 手番プレイヤーごとの駒チャンネル表: _PIECE_PLANES[current_player][code]
+_PIECE_PLANES = (_piece_planes(0), _piece_planes(1))
+
+
 @dataclass(frozen=True)
 class FullShogiState:
     """Immutable game state for 本将棋 (9x9).
@@ -47,6 +62,13 @@ class FullShogiState:
         """現在の手番プレイヤー（0=先手, 1=後手）。"""
         return self._current_player.value
 
+    @property
+    def zobrist(self) -> int:
+        """局面の Zobrist ハッシュ（盤面・持ち駒・手番）。置換表のキーに使う。"""
+        if self._current_player == Player.GOTE:
+            return self.board.zobrist ^ ZOBRIST.side
+        return self.board.zobrist
+
     @property
     def is_terminal(self) -> bool:
         """ゲームが終局ならば True。
@@ -59,7 +81,7 @@ class FullShogiState:
                 return True
         return len(self.legal_moves()) == 0
 
-    @property
+    @cached_property
     def winner(self) -> int | None:
         """勝者を返す。対局中は None。"""
         # 王将がいない場合（異常終了）
@@ -74,7 +96,17 @@ class FullShogiState:
         return None
 
     def legal_moves(self) -> list[int]:
-        """合法手のリストを返す。"""
+        """合法手のリストを返す。
+
+        局面はイミュータブルなので、生成は局面ごとに1回だけ行い同じリストを返す。
+        返したリストは共有されるので、呼び出し側で変更しないこと。
+        """
+        return self._legal
+
+    @cached_property
+    def _legal(self) -> list[int]:
+        # frozen でも cached_property はインスタンスの __dict__ に直接書くので使える
+        # （eq・hash はフィールドだけを見るので、キャッシュは比較に影響しない）
         return _legal_moves(self.board, self._current_player)
 
     def apply_move(self, move: int) -> FullShogiState:
@@ -86,6 +118,10 @@ class FullShogiState:
             _move_count=self._move_count + 1,
         )
 
+    def move_squares(self, move: int) -> tuple[int | None, int]:
+        """手の (移動元, 移動先) マスインデックスを返す。打ち手の移動元は None。"""
+        return _move_squares(move)
+
     def to_tensor_planes(self) -> torch.Tensor:
         """Convert to tensor planes for neural network input.
 
@@ -104,14 +140,13 @@ class FullShogiState:
         cp = self._current_player
 
         # 盤上の駒をテンソルに配置
-        for idx, piece in enumerate(self.board.squares):
-            if piece is None:
-                continue
-            r, c = idx // COLS, idx % COLS
-            if piece.owner == cp:
-                planes[piece.piece_type.value, r, c] = 1.0  # 自分の駒
-            else:
-                planes[14 + piece.piece_type.value, r, c] = 1.0  # 相手の駒
+        # マスごとに代入せず、(チャンネル, マス) の添字をまとめて1回で書き込む
+        codes = self.board.codes
+        occupied = [idx for idx, code in enumerate(codes) if code]
+        if occupied:
+            piece_planes = _PIECE_PLANES[cp]
+            channels = [piece_planes[codes[idx]] for idx in occupied]
+            planes.view(43, ROWS * COLS)[channels, occupied] = 1.0
 
         # 持ち駒数をチャンネルに記録（自分・相手それぞれ7種）
         for i, pt in enumerate(HAND_PIECE_TYPES):
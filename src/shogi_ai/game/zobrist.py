@@ -0,0 +1,80 @@
+"""Zobrist hashing shared by どうぶつしょうぎ and 本将棋.
+
+Zobrist ハッシュ用の乱数表。
+
+(駒種, 所有者, マス) と (所有者, 持ち駒種, 枚数) ごとに 64bit 乱数を1つ割り当て、
+局面に含まれる要素の XOR を局面のハッシュ値とする。
+XOR は自己逆元なので、駒を1枚動かしたときは変化した要素だけを XOR し直せばよい
+（差分更新）。これにより置換表（transposition table）のキーを O(1) で得られる。
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable, Sequence
+from typing import Protocol
+
+
+class _PieceLike(Protocol):
+    """Zobrist 表が参照する駒の属性（Piece はゲームごとに別クラスのため）。"""
+
+    @property
+    def piece_type(self) -> int: ...
+
+    @property
+    def owner(self) -> int: ...
+
+
+class ZobristTable:
+    """Fixed random keys for pieces on squares, hand counts and side to move.
+
+    固定シードで生成する Zobrist 乱数表。
+    シードを固定するのは、プロセスをまたいでも同じ局面が同じハッシュになるようにするため。
+
+    持ち駒は「枚数ごと」に鍵を持つ（枚数0の鍵は0）。
+    枚数 c → c+1 の変化は hand(c) ^ hand(c+1) を XOR するだけで反映できる。
+    """
+
+    def __init__(
+        self,
+        num_piece_types: int,
+        num_squares: int,
+        max_hand_count: int,
+        seed: int,
+    ) -> None:
+        rng = random.Random(seed)
+        self._num_squares = num_squares
+        self._hand_stride = max_hand_count + 1
+        # piece[(piece_type * 2 + owner) * num_squares + square]
+        self._piece = tuple(rng.getrandbits(64) for _ in range(num_piece_types * 2 * num_squares))
+        # hand[(owner * num_piece_types + piece_type) * (max_hand_count + 1) + count]
+        self._hand = tuple(
+            0 if count == 0 else rng.getrandbits(64)
+            for _ in range(2 * num_piece_types)
+            for count in range(self._hand_stride)
+        )
+        self._num_piece_types = num_piece_types
+        self.side = rng.getrandbits(64)  # 後手番のときに XOR する鍵
+
+    def piece(self, piece_type: int, owner: int, square: int) -> int:
+        """マス square にある駒 (piece_type, owner) の鍵を返す。"""
+        return self._piece[(piece_type * 2 + owner) * self._num_squares + square]
+
+    def hand(self, owner: int, piece_type: int, count: int) -> int:
+        """owner が piece_type を count 枚持っている状態の鍵を返す（count=0 は 0）。"""
+        return self._hand[(owner * self._num_piece_types + piece_type) * self._hand_stride + count]
+
+    def board_hash(
+        self,
+        squares: Sequence[_PieceLike | None],
+        hands: Iterable[Sequence[int]],
+    ) -> int:
+        """盤面全体からハッシュ値を計算する（差分更新の起点に使う）。"""
+        h = 0
+        for sq, piece in enumerate(squares):
+            if piece is not None:
+                h ^= self.piece(piece.piece_type, piece.owner, sq)
+        for owner, hand in enumerate(hands):
+            for pt in set(hand):
+                h ^= self.hand(owner, pt, hand.count(pt))
+        return h
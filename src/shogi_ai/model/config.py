@@ -22,6 +22,8 @@ class NetworkConfig:
         action_size:  行動空間のサイズ（合法手の最大数）
         num_res_blocks: 残差ブロックの数（多いほど表現力が高いが学習が重い）
         num_channels:   畳み込み層のチャンネル数（多いほど表現力が高い）
+        value_hidden:   価値ヘッドの隠れ層の幅（16 程度でも十分。既定値 64 は
+                        保存済みモデルとの互換性のため）
     """
 
     board_h: int
@@ -30,6 +32,7 @@ class NetworkConfig:
     action_size: int
     num_res_blocks: int = 3
     num_channels: int = 64
+    value_hidden: int = 64
 
 
 # どうぶつしょうぎ用のプリセット設定
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import copy
+
 import torch
 from torch import Tensor, nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 
 from shogi_ai.model.config import NetworkConfig
 
@@ -88,8 +91,8 @@ class DualHeadNetwork(nn.Module):
         # 1×1 畳み込みでチャンネル数を1に削減してから全結合層へ
         self.value_conv = nn.Conv2d(config.num_channels, 1, 1, bias=False)
         self.value_bn = nn.BatchNorm2d(1)
-        self.value_fc1 = nn.Linear(config.board_h * config.board_w, 64)
-        self.value_fc2 = nn.Linear(64, 1)
+        self.value_fc1 = nn.Linear(config.board_h * config.board_w, config.value_hidden)
+        self.value_fc2 = nn.Linear(config.value_hidden, 1)
 
     def forward(self, x: Tensor) -> tuple[Tensor, Tensor]:
         # 共通ボディ: 入力層 → 残差タワー
@@ -108,3 +111,33 @@ class DualHeadNetwork(nn.Module):
         v = torch.tanh(self.value_fc2(v))  # tanh で [-1, +1] に収める
 
         return p, v
+
+
+def fuse_for_inference(network: DualHeadNetwork) -> DualHeadNetwork:
+    """Return an eval-mode copy with every Conv → BN pair folded into one conv.
+
+    推論専用のネットワークを作る（元のネットワークは変更しない）。
+
+    eval モードの BatchNorm は学習済みの統計量による固定のアフィン変換なので、
+    直前の畳み込みの重みとバイアスに畳み込める。BN 層は恒等写像に置き換わり、
+    自己対局・アリーナの順伝播ごとのカーネル起動が減る。出力は元のネットワークと
+    浮動小数点誤差の範囲で一致する。
+    """
+    fused = copy.deepcopy(network).eval()
+
+    pairs: list[tuple[nn.Module, str, str]] = [
+        (fused, "input_conv", "input_bn"),
+        (fused, "policy_conv", "policy_bn"),
+        (fused, "value_conv", "value_bn"),
+    ]
+    for block in fused.res_blocks:
+        pairs.append((block, "conv1", "bn1"))
+        pairs.append((block, "conv2", "bn2"))
+
+    for owner, conv_name, bn_name in pairs:
+        conv = getattr(owner, conv_name)
+        bn = getattr(owner, bn_name)
+        setattr(owner, conv_name, fuse_conv_bn_eval(conv, bn))
+        setattr(owner, bn_name, nn.Identity())
+
+    return fused
@@ -23,7 +23,7 @@ class TrainingExample(NamedTuple):
     value_target:  対局結果（+1=勝, -1=負, 0=引き分け）（価値の教師）
     """
 
-    state_tensor: Tensor  # (in_channels, board_h, board_w)
+    state_tensor: Tensor  # (in_channels, board_h, board_w), uint8（0/1 と持ち駒数のみ）
     policy_target: Tensor  # (action_space_size,)
     value_target: float  # +1 (win) / -1 (loss) / 0 (draw)
 
@@ -41,6 +41,7 @@ def play_game(
     network: DualHeadNetwork,
     state: GameState,
     config: SelfPlayConfig,
+    mcts: MCTS | None = None,
 ) -> list[TrainingExample]:
     """Play one game of self-play and return training examples.
 
@@ -54,10 +55,12 @@ def play_game(
     Temperature schedule:
     - First `temperature_threshold` moves: τ=1.0 (exploratory)
     - After that: τ→0 (deterministic, pick best)
+
+    mcts を渡すと、その評価キャッシュを複数局で共有できる。
     """
     examples: list[tuple[Tensor, Tensor, int]] = []
-    mcts_config = MCTSConfig(num_simulations=config.num_simulations)
-    mcts = MCTS(network, mcts_config)
+    if mcts is None:
+        mcts = MCTS(network, MCTSConfig(num_simulations=config.num_simulations))
 
     move_count = 0
     max_moves = 200  # 無限ループ防止（引き分けとして扱う）
@@ -77,7 +80,9 @@ def play_game(
 
         # MCTS で行動確率を計算
         action_probs = mcts.search(state)
-        tensor = state.to_tensor_planes()
+        # 入力プレーンは 0/1 と持ち駒数だけなので uint8 で保持する（float32 の 1/4 のメモリ）
+        # 訓練時に Trainer が float に戻す
+        tensor = state.to_tensor_planes().to(torch.uint8)
         policy = torch.tensor(action_probs, dtype=torch.float32)
 
         # (局面テンソル, 方策, 手番プレイヤー) を記録
@@ -113,10 +118,12 @@ def generate_training_data(
     """Generate training data from multiple self-play games.
 
     複数の自己対局を行い、訓練データをまとめて返す。
+    MCTS を全局で共有し、初期局面や序盤の頻出局面の評価を使い回す。
     """
+    mcts = MCTS(network, MCTSConfig(num_simulations=config.num_simulations))
     all_examples: list[TrainingExample] = []
     for _ in range(config.num_games):
-        examples = play_game(network, initial_state, config)
+        examples = play_game(network, initial_state, config, mcts)
         all_examples.extend(examples)
     return all_examples
 
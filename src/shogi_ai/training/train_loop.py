@@ -12,25 +12,33 @@ AlphaZeroの学習は次のサイクルを繰り返す:
 
 from __future__ import annotations
 
-import copy
-import queue
 import threading
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 import torch
 
 from shogi_ai.engine.mcts import MCTS, MCTSConfig
 from shogi_ai.game.protocol import GameState
 from shogi_ai.model.config import NetworkConfig
-from shogi_ai.model.network import DualHeadNetwork
+from shogi_ai.model.network import DualHeadNetwork, fuse_for_inference
 from shogi_ai.training.arena import pit
 from shogi_ai.training.self_play import SelfPlayConfig, generate_training_data
 from shogi_ai.training.trainer import Trainer, TrainerConfig
 
 
+class ProgressQueue(Protocol):
+    """Destination for training progress events.
+
+    進捗イベントの送り先。put() を持つものなら何でもよい（queue.Queue もそのまま渡せる）。
+    Web UI はイベントループ上の asyncio.Queue に転送するアダプタを渡す。
+    """
+
+    def put(self, item: dict[str, Any], /) -> None: ...
+
+
 @dataclass(frozen=True)
 class TrainLoopConfig:
     """訓練ループの設定パラメータ。
@@ -68,8 +76,12 @@ def _make_mcts_fn(
     """MCTS手選択関数を作成する。アリーナ対戦・対局で使用。
 
     temperature=0.01 にすることで、ほぼ最善手を選ぶ確定的な行動になる。
+    対局中は重みを更新しないので、Conv+BN を畳み込んだ推論用コピーで探索する。
     """
-    mcts = MCTS(network, MCTSConfig(num_simulations=num_simulations, temperature=0.01))
+    mcts = MCTS(
+        fuse_for_inference(network),
+        MCTSConfig(num_simulations=num_simulations, temperature=0.01),
+    )
 
     def fn(state: GameState) -> int:
         probs = mcts.search(state)
@@ -83,7 +95,7 @@ def run_training(
     initial_state: GameState,
     network_config: NetworkConfig,
     loop_config: TrainLoopConfig,
-    progress_queue: queue.Queue[dict[str, Any]],
+    progress_queue: ProgressQueue,
     stop_event: threading.Event,
 ) -> None:
     """訓練ループ本体。バックグラウンドスレッドで実行される。
@@ -103,9 +115,15 @@ def run_training(
     best_network = DualHeadNetwork(network_config).to(device)
     model_path = Path(loop_config.model_path)
     if model_path.exists():
-        state_dict = torch.load(model_path, map_location=device, weights_only=True)
+        # mmap=True: ファイルをメモリマップして読み込み、CPU 上に state_dict の
+        # 完全なコピーを作らずにデバイスへ転送する（torch.save の zip 形式が前提）
+        state_dict = torch.load(model_path, map_location=device, weights_only=True, mmap=True)
         best_network.load_state_dict(state_dict)
 
+    # 挑戦者ネットワークは1つだけ確保して世代ごとに重みを上書きする
+    # （deepcopy で毎世代フルコピーを確保するとデバイスメモリのピークが増える）
+    new_network = DualHeadNetwork(network_config).to(device)
+
     trainer_config = TrainerConfig()
     self_play_config = SelfPlayConfig(
         num_games=loop_config.num_self_play_games,
@@ -127,8 +145,10 @@ def run_training(
             }
         )
 
-        best_network.eval()
-        data = generate_training_data(best_network, initial_state, self_play_config)
+        # 自己対局も推論のみなので、Conv+BN を畳み込んだコピーで探索する
+        data = generate_training_data(
+            fuse_for_inference(best_network), initial_state, self_play_config
+        )
 
         if stop_event.is_set():
             progress_queue.put({"type": "stopped"})
@@ -145,7 +165,7 @@ def run_training(
             }
         )
 
-        new_network = copy.deepcopy(best_network).to(device)
+        new_network.load_state_dict(best_network.state_dict())
         trainer = Trainer(new_network, trainer_config, device)
         losses = trainer.train(data)
 
@@ -179,7 +199,8 @@ def run_training(
         # ── Phase 4: 採用判定 ──────────────────────────────────────────
         adopted = win_rate >= loop_config.win_rate_threshold
         if adopted:
-            best_network = new_network
+            # 新旧を入れ替える（旧最良は次世代の挑戦者として再利用）
+            best_network, new_network = new_network, best_network
             torch.save(best_network.state_dict(), model_path)
 
         progress_queue.put(
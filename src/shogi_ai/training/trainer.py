@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import random
+import os
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import torch
-from torch import nn
+from torch import Tensor, nn
 
 from shogi_ai.model.network import DualHeadNetwork
 from shogi_ai.training.self_play import TrainingExample
@@ -48,11 +49,48 @@ class Trainer:
         self.config = config
         self.device = device
         # Adam オプティマイザ（SGD より安定して学習しやすい）
+        # 全パラメータの更新をまとめて実行する（CUDA は fused、それ以外は foreach）
+        fused = device.type == "cuda"
         self.optimizer = torch.optim.Adam(
             network.parameters(),
             lr=config.lr,
             weight_decay=config.weight_decay,  # L2 正則化
+            fused=fused,
+            foreach=not fused,
         )
+        # 環境変数 TORCH_COMPILE=1 のときだけ順伝播を torch.compile する
+        # （初回のコンパイルに時間がかかるため既定では無効）
+        # self.network はパラメータ参照・保存用に未コンパイルのまま保持する
+        self._net: Callable[[Tensor], tuple[Tensor, Tensor]] = network
+        if os.environ.get("TORCH_COMPILE") == "1":
+            mode = "reduce-overhead" if device.type == "cuda" else "default"
+            self._net = torch.compile(network, mode=mode)
+        # ミニバッチ用の CPU バッファ（初回の train() で確保し、以降は使い回す）
+        self._buffers: tuple[Tensor, Tensor, Tensor] | None = None
+
+    def _batch_buffers(
+        self, all_states: Tensor, all_policies: Tensor
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Return reusable (states, policies, values) CPU buffers of batch_size rows.
+
+        ミニバッチを組み立てる CPU バッファを返す。形状が変わったときだけ確保し直す。
+        転送は同期コピーなので、転送が終わる前に次のバッチで上書きされることはない。
+        """
+        size = self.config.batch_size
+        state_shape = (size, *all_states.shape[1:])
+        policy_shape = (size, *all_policies.shape[1:])
+        if (
+            self._buffers is None
+            or self._buffers[0].shape != state_shape
+            or self._buffers[0].dtype != all_states.dtype
+            or self._buffers[1].shape != policy_shape
+        ):
+            self._buffers = (
+                torch.empty(state_shape, dtype=all_states.dtype),
+                torch.empty(policy_shape, dtype=torch.float32),
+                torch.empty((size, 1), dtype=torch.float32),
+            )
+        return self._buffers
 
     def train(self, examples: list[TrainingExample]) -> dict[str, float]:
         """Train for one generation. Returns average losses.
@@ -64,38 +102,70 @@ class Trainer:
         if not examples:
             return {"policy_loss": 0.0, "value_loss": 0.0, "total_loss": 0.0}
 
+        # 訓練データを項目ごとに1本のテンソルへまとめる（train() ごとに1回だけ）
+        # 以降のシャッフルとミニバッチ抽出はインデックス操作だけで済む
+        all_states = torch.stack([ex.state_tensor for ex in examples])
+        all_policies = torch.stack([ex.policy_target for ex in examples])
+        all_values = torch.tensor([ex.value_target for ex in examples], dtype=torch.float32)
+        return self.train_tensors(all_states, all_policies, all_values)
+
+    def train_tensors(
+        self, all_states: Tensor, all_policies: Tensor, all_values: Tensor
+    ) -> dict[str, float]:
+        """Train for one generation on pre-stacked examples. Returns average losses.
+
+        項目ごとに積み上げ済みの訓練データで1世代分の訓練を行う。
+        TrainingExample のリストを経由しないので、まとめて用意したデータを直接渡せる。
+
+        Args:
+            all_states: (N, C, H, W) の局面テンソル（uint8 のままでよい）
+            all_policies: (N, action_size) の目標確率分布（float32 以外は変換する）
+            all_values: (N,) または (N, 1) の対局結果
+        """
+        num_examples = all_states.shape[0]
+        if num_examples == 0:
+            return {"policy_loss": 0.0, "value_loss": 0.0, "total_loss": 0.0}
+
         self.network.train()  # 訓練モード（バッチ正規化・ドロップアウトが有効）
-        total_policy_loss = 0.0
-        total_value_loss = 0.0
+        # 損失の合計はデバイス上で足し込み、最後に1回だけ .item() で取り出す
+        # （ステップごとの .item() はデバイス→ホストの同期待ちになる）
+        total_policy_loss = torch.zeros((), device=self.device)
+        total_value_loss = torch.zeros((), device=self.device)
         total_batches = 0
 
+        # 教師は float32 のバッファに集めるので、dtype をここで揃えておく
+        all_policies = all_policies.to(torch.float32)
+        all_values = all_values.to(torch.float32).reshape(num_examples, 1)
+        states_buf, policies_buf, values_buf = self._batch_buffers(all_states, all_policies)
+        # 端数のミニバッチは捨ててバッチ形状を一定に保つ（torch.compile の再コンパイル防止）
+        # ただしデータが1バッチに満たないときは、その端数だけで学習する
+        batch_size = self.config.batch_size
+        num_used = (num_examples // batch_size) * batch_size or num_examples
+
         for _ in range(self.config.epochs_per_generation):
             # エポックごとにシャッフル（過学習防止・勾配の偏り解消）
-            random.shuffle(examples)
-            for i in range(0, len(examples), self.config.batch_size):
-                batch = examples[i : i + self.config.batch_size]
-                if not batch:
-                    continue
-
-                # テンソルをまとめてデバイスに送る
-                states = torch.stack([ex.state_tensor for ex in batch]).to(self.device)
-                target_policies = torch.stack([ex.policy_target for ex in batch]).to(self.device)
-                target_values = (
-                    torch.tensor(
-                        [ex.value_target for ex in batch],
-                        dtype=torch.float32,
-                    )
-                    .unsqueeze(1)
-                    .to(self.device)
-                )
+            # 捨てる端数はエポックごとに変わるので、全データが学習に使われる
+            perm = torch.randperm(num_examples)
+            for i in range(0, num_used, batch_size):
+                idx = perm[i : i + batch_size]
+
+                # 確保済みバッファに集めてからデバイスに送る（毎ステップの確保を避ける）
+                # 局面は uint8 のまま転送し、デバイス上で float に戻す
+                n = len(idx)
+                torch.index_select(all_states, 0, idx, out=states_buf[:n])
+                torch.index_select(all_policies, 0, idx, out=policies_buf[:n])
+                torch.index_select(all_values, 0, idx, out=values_buf[:n])
+                states = states_buf[:n].to(self.device).float()
+                target_policies = policies_buf[:n].to(self.device)
+                target_values = values_buf[:n].to(self.device)
 
                 # 順伝播（フォワードパス）
-                policy_logits, values = self.network(states)
+                policy_logits, values = self._net(states)
 
                 # 方策損失: クロスエントロピー（MCTS確率分布との差）
-                # log_softmax + 内積 でクロスエントロピーを効率的に計算
-                log_probs = nn.functional.log_softmax(policy_logits, dim=1)
-                policy_loss = -(target_policies * log_probs).sum(dim=1).mean()
+                # cross_entropy は確率分布（ソフトターゲット）をそのまま教師にできる
+                # log_softmax と内積を別々に計算するより中間テンソルが少ない
+                policy_loss = nn.functional.cross_entropy(policy_logits, target_policies)
 
                 # 価値損失: 平均二乗誤差（対局結果との差）
                 value_loss = nn.functional.mse_loss(values, target_values)
@@ -104,20 +174,20 @@ class Trainer:
                 loss = policy_loss + value_loss
 
                 # 逆伝播と重み更新
-                self.optimizer.zero_grad()  # 勾配をリセット
+                self.optimizer.zero_grad(set_to_none=True)  # 勾配をリセット（ゼロ埋めせず破棄）
                 loss.backward()  # 逆伝播で勾配計算
                 self.optimizer.step()  # オプティマイザで重み更新
 
-                total_policy_loss += policy_loss.item()
-                total_value_loss += value_loss.item()
+                total_policy_loss += policy_loss.detach()
+                total_value_loss += value_loss.detach()
                 total_batches += 1
 
         if total_batches == 0:
             return {"policy_loss": 0.0, "value_loss": 0.0, "total_loss": 0.0}
 
         # バッチ数で割って平均損失を返す
-        avg_policy = total_policy_loss / total_batches
-        avg_value = total_value_loss / total_batches
+        avg_policy = total_policy_loss.item() / total_batches
+        avg_value = total_value_loss.item() / total_batches
         return {
             "policy_loss": avg_policy,
             "value_loss": avg_value,
@@ -13,44 +13,174 @@ FastAPI を使った将棋AI Web アプリケーション。
 from __future__ import annotations
 
 import asyncio
-import json
-import queue
+import functools
+import os
 import threading
+import time
 import uuid
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
 from pathlib import Path
 from typing import Any
 
 import torch
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from pydantic_core import to_json
 
+from shogi_ai.engine.batch_eval import BatchedEvaluator
 from shogi_ai.engine.mcts import MCTS, MCTSConfig
 from shogi_ai.engine.minimax import minimax_move
 from shogi_ai.engine.random_player import random_move
+from shogi_ai.game.animal_shogi.board import piece_code as animal_piece_code
 from shogi_ai.game.animal_shogi.display import board_to_str as animal_format
 from shogi_ai.game.animal_shogi.moves import decode_move as animal_decode
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
+from shogi_ai.game.animal_shogi.types import PieceType as AnimalPieceType
+from shogi_ai.game.animal_shogi.types import Player as AnimalPlayer
+from shogi_ai.game.full_shogi.board import piece_code as full_piece_code
 from shogi_ai.game.full_shogi.display import format_board as full_format
 from shogi_ai.game.full_shogi.moves import decode_move as full_decode
 from shogi_ai.game.full_shogi.state import FullShogiState
+from shogi_ai.game.full_shogi.types import PieceType as FullPieceType
+from shogi_ai.game.full_shogi.types import Player as FullPlayer
 from shogi_ai.game.protocol import GameState
 from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG, FULL_SHOGI_CONFIG
-from shogi_ai.model.network import DualHeadNetwork
+from shogi_ai.model.network import DualHeadNetwork, fuse_for_inference
 from shogi_ai.training.train_loop import TrainLoopConfig, run_training
 
 # 静的ファイル（HTML, CSS, JS）のディレクトリ
 STATIC_DIR = Path(__file__).parent / "static"
 
-app = FastAPI(title="Shogi AI")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """起動時に MCTS 用ネットワークを構築しておく。
+
+    ネットワークは _load_mcts のキャッシュで全対局に共有されるので、
+    最初の MCTS 対局リクエストで構築・ウォームアップを待たずに済む。
+    """
+    for game_type in _INITIAL_STATES:
+        _load_mcts(game_type, None, None)
+    yield
+
+
+app = FastAPI(title="Shogi AI", lifespan=lifespan)
 # /static/ 以下で静的ファイルを配信
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+
+@dataclass(slots=True)
+class GameSession:
+    """1対局分の情報。
+
+    state:      現在の局面
+    game_type:  "animal" or "full"
+    sente_fn:   先手のAI手選択関数（None = 人間）
+    gote_fn:    後手のAI手選択関数（後手は常にAI）
+    legal_moves / legal_set: 現在の局面の合法手（set_state で1回だけ計算する）
+        手の検証には frozenset（O(1) の in 判定）、レスポンスにはリストを使う。
+    version:    局面が変わるたびに増える番号（GET /api/state の ETag に使う）
+    lock:       同じ対局への手の適用を直列化するロック
+        （AI の思考中は他のリクエストも進むので、同じ対局の手が混ざらないようにする）
+    payload:    現在の局面の JSON 表現のキャッシュ（set_state で破棄し、state_dict で作る）
+    """
+
+    state: GameState
+    game_type: str
+    sente_fn: Callable[[GameState], int] | None
+    gote_fn: Callable[[GameState], int]
+    legal_moves: list[int] = field(default_factory=list)
+    legal_set: frozenset[int] = frozenset()
+    version: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    payload: dict[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        self.set_state(self.state)
+
+    def set_state(self, state: GameState) -> list[int]:
+        """局面を更新し、その合法手をキャッシュして返す。"""
+        legal = state.legal_moves()
+        self.state = state
+        self.legal_moves = legal
+        self.legal_set = frozenset(legal)
+        self.version += 1
+        self.payload = None
+        return legal
+
+    def state_dict(self) -> dict[str, Any]:
+        """現在の局面の JSON 表現を返す（局面が変わるまで同じ辞書を使い回す）。
+
+        GET /api/state のポーリングでは局面が変わらないことが多いので、
+        盤面の走査や盤面表示の文字列化を毎回やり直さない。
+        """
+        if self.payload is None:
+            self.payload = _state_to_dict(self.state, self.game_type, self.legal_moves)
+        return self.payload
+
+
+class _SessionStore:
+    """In-memory game sessions with LRU and idle-timeout eviction.
+
+    対局情報のインメモリストア。新規対局のたびに増え続けないよう、
+    - 最後のアクセスから ttl 秒経った対局は捨てる（放置された対局）
+    - maxsize を超えたら最も長くアクセスされていない対局から捨てる（LRU）
+    OrderedDict をアクセス順に並べておくので、どちらも先頭から見るだけで済む。
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # game_id → (最終アクセス時刻, 対局)。末尾ほど最近アクセスされた対局
+        self._sessions: OrderedDict[str, tuple[float, GameSession]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __setitem__(self, game_id: str, game: GameSession) -> None:
+        now = self._clock()
+        self._expire(now)
+        self._sessions[game_id] = (now, game)
+        self._sessions.move_to_end(game_id)
+        while len(self._sessions) > self.maxsize:
+            self._sessions.popitem(last=False)
+
+    def get(self, game_id: str) -> GameSession | None:
+        """対局を返し、最近使った対局として記録する。期限切れ・不明なら None。"""
+        now = self._clock()
+        self._expire(now)
+        entry = self._sessions.get(game_id)
+        if entry is None:
+            return None
+        self._sessions[game_id] = (now, entry[1])
+        self._sessions.move_to_end(game_id)
+        return entry[1]
+
+    def _expire(self, now: float) -> None:
+        """ttl 秒以上アクセスのない対局を先頭（最も古いもの）から捨てる。"""
+        while self._sessions:
+            last_access, _ = next(iter(self._sessions.values()))
+            if now - last_access < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+
+
 # 対局情報のインメモリストレージ（サーバ再起動で消える簡易実装）
 # 本番環境では Redis や DB に保存する
-_games: dict[str, dict[str, Any]] = {}
+_games = _SessionStore(maxsize=10_000, ttl=3600.0)
 
 # 訓練セッション管理（同時に1セッションのみ）
 _train_state: dict[str, Any] = {
@@ -60,10 +190,81 @@ _train_state: dict[str, Any] = {
     "progress_queue": None,
 }
 
+# モデル読み込みの排他ロック（同じモデルを複数スレッドで同時に構築しないため）
+_model_lock = threading.Lock()
+
+# AI の思考（ミニマックス・MCTS）を実行するスレッドプール
+# CPU を使い続ける探索をイベントループ上で直接呼ぶと、その間すべてのリクエストが止まる
+_AI_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="shogi-ai")
+
+# SSE のハートビート間隔（秒）: この間イベントがなければ接続維持用に送る
+_HEARTBEAT_SEC = 30.0
+
 # ゲーム種別ごとの訓練済みモデルパス（/api/train/load で更新）
 _trained_model_paths: dict[str, str] = {}
 
 
+def _piece_meta_table(
+    piece_types: Iterable[IntEnum],
+    players: Iterable[IntEnum],
+    code_fn: Callable[[int, int], int],
+) -> list[dict[str, Any] | None]:
+    """駒コード → 駒の JSON 表現 の表を作る（空きマスのコード 0 は None）。"""
+    table: list[dict[str, Any] | None] = [None]
+    for pt in piece_types:
+        for owner in players:
+            code = code_fn(pt, owner)
+            table.extend([None] * (code + 1 - len(table)))
+            table[code] = {
+                "type": pt.value,  # 駒種インデックス
+                "owner": owner.value,  # 所有者（0=先手, 1=後手）
+                "name": pt.name,  # 駒名（文字列）
+            }
+    return table
+
+
+# 駒の JSON 表現をゲーム種別ごとに事前計算しておく（Board.codes の値で引く）
+# 両ゲームの駒種は値が重なる IntEnum なので、テーブルはゲーム種別で分ける
+_PIECE_META: dict[str, list[dict[str, Any] | None]] = {
+    "animal": _piece_meta_table(AnimalPieceType, AnimalPlayer, animal_piece_code),
+    "full": _piece_meta_table(FullPieceType, FullPlayer, full_piece_code),
+}
+
+# ゲーム種別ごとの初期局面（状態はイミュータブルなので、全対局で同じオブジェクトを共有できる）
+_INITIAL_STATES: dict[str, GameState] = {
+    "animal": AnimalShogiState(),
+    "full": FullShogiState(),
+}
+
+# ゲーム種別ごとの表示関数と盤面サイズ（行数, 列数）
+_BOARD_META: dict[str, tuple[Callable[[Any], str], int, int]] = {
+    "animal": (animal_format, 4, 3),
+    "full": (full_format, 9, 9),
+}
+
+
+class _LoopQueue:
+    """Forward progress events from the training thread to an asyncio.Queue.
+
+    訓練スレッドからイベントループ上の asyncio.Queue へイベントを渡すアダプタ。
+    asyncio.Queue はスレッドセーフではないので、put はループに委譲する。
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        target: asyncio.Queue[dict[str, Any]],
+    ) -> None:
+        self._loop = loop
+        self._target = target
+
+    def put(self, item: dict[str, Any], /) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._target.put_nowait, item)
+        except RuntimeError:
+            pass  # イベントループ終了後（サーバ停止時）のイベントは捨てる
+
+
 class NewGameRequest(BaseModel):
     """新規対局リクエストのスキーマ。"""
 
@@ -86,6 +287,35 @@ class TrainRequest(BaseModel):
     num_generations: int = 10  # 訓練する世代数
 
 
+@functools.lru_cache(maxsize=8)
+def _load_mcts(game_type: str, model_path: str | None, mtime_ns: int | None) -> MCTS:
+    """Build the MCTS AI for a game type and model file (cached).
+
+    ネットワークの構築・重みの読み込み・MCTS の生成は重いので、
+    (ゲーム種別, モデルパス, 更新時刻) ごとに1回だけ行って使い回す。
+    モデルファイルが上書きされると更新時刻が変わり、新しい重みで作り直される。
+    """
+    del mtime_ns  # キャッシュキーとしてのみ使用
+    # ゲーム種別に応じたネットワーク設定を選択
+    config = ANIMAL_SHOGI_CONFIG if game_type == "animal" else FULL_SHOGI_CONFIG
+    net = DualHeadNetwork(config)
+    # 訓練済みモデルが存在すれば読み込む（なければランダム初期化のまま）
+    if model_path is not None:
+        # mmap=True: ファイルをメモリマップして読む（複数ワーカーでページキャッシュを共有）
+        state_dict = torch.load(model_path, map_location="cpu", weights_only=True, mmap=True)
+        net.load_state_dict(state_dict)
+    # 推論専用: Conv+BN を畳み込んだ eval モードのコピーを使う
+    net = fuse_for_inference(net)
+    # 最初の対局リクエストが遅くならないよう、ここで数回順伝播して
+    # カーネルの選択やメモリ確保などの初回コストを済ませておく
+    dummy = torch.zeros(1, config.in_channels, config.board_h, config.board_w)
+    with torch.inference_mode():
+        for _ in range(3):
+            net(dummy)
+    # 同時に思考中の対局の葉局面をまとめて評価する（探索内でも8局面ずつまとめる）
+    return MCTS(net, MCTSConfig(num_simulations=50, batch_size=8), BatchedEvaluator(net))
+
+
 def _get_ai_fn(
     ai_type: str,
     game_type: str,
@@ -104,16 +334,13 @@ def _get_ai_fn(
         depth = 4 if game_type == "animal" else 2
         return lambda state: minimax_move(state, depth=depth)
     if ai_type == "mcts":
-        # ゲーム種別に応じたネットワーク設定を選択
-        config = ANIMAL_SHOGI_CONFIG if game_type == "animal" else FULL_SHOGI_CONFIG
-        net = DualHeadNetwork(config)
-        # 訓練済みモデルが存在すれば読み込む（なければランダム初期化のまま）
         model_path_str = _trained_model_paths.get(game_type)
-        if model_path_str and Path(model_path_str).exists():
-            state_dict = torch.load(model_path_str, map_location="cpu", weights_only=True)
-            net.load_state_dict(state_dict)
-        net.eval()  # 推論モード
-        mcts = MCTS(net, MCTSConfig(num_simulations=50))
+        model_path = Path(model_path_str) if model_path_str else None
+        with _model_lock:
+            if model_path is not None and model_path.exists():
+                mcts = _load_mcts(game_type, str(model_path), model_path.stat().st_mtime_ns)
+            else:
+                mcts = _load_mcts(game_type, None, None)
 
         def mcts_move(state: GameState) -> int:
             probs = mcts.search(state)
@@ -126,58 +353,37 @@ def _get_ai_fn(
     raise ValueError(msg)
 
 
-def _state_to_dict(state: GameState, game_type: str) -> dict[str, Any]:
+def _state_to_dict(
+    state: GameState,
+    game_type: str,
+    legal: list[int] | None = None,
+) -> dict[str, Any]:
     """Convert game state to JSON-serializable dict.
 
     局面情報を JSON 形式（辞書）に変換する。
     フロントエンドの JavaScript がこの形式を受け取って盤面を描画する。
+    legal に計算済みの合法手を渡すと、再計算を省略する。
     """
+    if legal is None:
+        legal = state.legal_moves()
+    winner = state.winner
     board = state.board  # type: ignore[attr-defined]
+    board_format, rows, cols = _BOARD_META[game_type]
+    piece_meta = _PIECE_META[game_type]
 
-    if game_type == "animal":
-        board_display = animal_format(board)
-        squares: list[dict[str, Any] | None] = []
-        for piece in board.squares:
-            if piece is None:
-                squares.append(None)
-            else:
-                squares.append(
-                    {
-                        "type": piece.piece_type.value,  # 駒種インデックス
-                        "owner": piece.owner.value,  # 所有者（0=先手, 1=後手）
-                        "name": piece.piece_type.name,  # 駒名（文字列）
-                    }
-                )
-        hands = [
-            [pt.name for pt in board.hands[0]],  # 先手の持ち駒
-            [pt.name for pt in board.hands[1]],  # 後手の持ち駒
-        ]
-        rows, cols = 4, 3
-    else:
-        board_display = full_format(board)
-        squares = []
-        for piece in board.squares:
-            if piece is None:
-                squares.append(None)
-            else:
-                squares.append(
-                    {
-                        "type": piece.piece_type.value,
-                        "owner": piece.owner.value,
-                        "name": piece.piece_type.name,
-                    }
-                )
-        hands = [
-            [pt.name for pt in board.hands[0]],
-            [pt.name for pt in board.hands[1]],
-        ]
-        rows, cols = 9, 9
+    # 盤面の駒情報（駒コードで事前計算した辞書を引くだけ）
+    squares = [piece_meta[code] for code in board.codes]
+    hands = [
+        [pt.name for pt in board.hands[0]],  # 先手の持ち駒
+        [pt.name for pt in board.hands[1]],  # 後手の持ち駒
+    ]
+    board_display = board_format(board)
 
     return {
         "current_player": state.current_player,  # 手番（0=先手, 1=後手）
-        "is_terminal": state.is_terminal,  # 終局フラグ
-        "winner": state.winner,  # 勝者（None=対局中）
-        "legal_moves": state.legal_moves(),  # 合法手リスト
+        "is_terminal": winner is not None or not legal,  # 終局フラグ
+        "winner": winner,  # 勝者（None=対局中）
+        "legal_moves": legal,  # 合法手リスト
         "squares": squares,  # 盤面の駒情報（81または12要素）
         "hands": hands,  # 持ち駒情報
         "rows": rows,
@@ -202,12 +408,9 @@ async def new_game(req: NewGameRequest) -> dict[str, Any]:
     """
     game_id = str(uuid.uuid4())[:8]  # 短いIDを生成
 
-    # ゲーム種別に応じた初期局面を作成
-    if req.game_type == "animal":
-        state: GameState = AnimalShogiState()
-    elif req.game_type == "full":
-        state = FullShogiState()
-    else:
+    # ゲーム種別に応じた初期局面を取得
+    state = _INITIAL_STATES.get(req.game_type)
+    if state is None:
         raise HTTPException(400, f"Unknown game type: {req.game_type}")
 
     # 先手・後手の手選択関数を初期化
@@ -216,17 +419,17 @@ async def new_game(req: NewGameRequest) -> dict[str, Any]:
     gote_fn = _get_ai_fn(req.ai_type, req.game_type)
 
     # 対局情報をメモリに保存
-    _games[game_id] = {
-        "state": state,
-        "game_type": req.game_type,
-        "sente_fn": sente_fn,  # None = 人間（先手）
-        "gote_fn": gote_fn,  # 後手は常にAI
-        "ai_fn": gote_fn,  # 後方互換: /api/move で使用
-    }
+    game = GameSession(
+        state=state,
+        game_type=req.game_type,
+        sente_fn=sente_fn,
+        gote_fn=gote_fn,
+    )
+    _games[game_id] = game
 
     return {
         "game_id": game_id,
-        "state": _state_to_dict(state, req.game_type),
+        "state": game.state_dict(),
     }
 
 
@@ -243,45 +446,59 @@ async def make_move(req: MoveRequest) -> dict[str, Any]:
     if game is None:
         raise HTTPException(404, "Game not found")
 
-    state: GameState = game["state"]
-    game_type: str = game["game_type"]
+    game_type = game.game_type
+
+    async with game.lock:
+        state = game.state
 
-    if state.is_terminal:
-        raise HTTPException(400, "Game is already over")
+        if state.is_terminal:
+            raise HTTPException(400, "Game is already over")
 
-    if req.move not in state.legal_moves():
-        raise HTTPException(400, f"Illegal move: {req.move}")
+        if req.move not in game.legal_set:
+            raise HTTPException(400, f"Illegal move: {req.move}")
 
-    # プレイヤーの手を適用
-    state = state.apply_move(req.move)
+        # プレイヤーの手を適用
+        state = state.apply_move(req.move)
 
-    # ゲームが終わっていなければ AI が応答
-    ai_move = None
-    if not state.is_terminal:
-        ai_fn = game["ai_fn"]
-        ai_move = ai_fn(state)
-        state = state.apply_move(ai_move)
+        # ゲームが終わっていなければ AI が応答（探索はスレッドプールで実行する）
+        ai_move = None
+        if not state.is_terminal:
+            ai_move = await asyncio.get_running_loop().run_in_executor(
+                _AI_EXECUTOR, game.gote_fn, state
+            )
+            state = state.apply_move(ai_move)
 
-    # 最新の局面を保存
-    game["state"] = state
+        # 最新の局面を保存（応答はロック内で作り、後続の手が混ざらないようにする）
+        game.set_state(state)
+        payload = game.state_dict()
 
     decode_fn = animal_decode if game_type == "animal" else full_decode
 
     return {
-        "state": _state_to_dict(state, game_type),
+        "state": payload,
         "player_move": req.move,
         "ai_move": ai_move,
         "ai_move_decoded": decode_fn(ai_move) if ai_move is not None else None,
     }
 
 
-@app.get("/api/state/{game_id}")
-async def get_state(game_id: str) -> dict[str, Any]:
-    """現在の局面情報を取得する（ページ再読み込み時などに使用）。"""
+@app.get("/api/state/{game_id}", response_model=None)
+async def get_state(
+    game_id: str, request: Request, response: Response
+) -> dict[str, Any] | Response:
+    """現在の局面情報を取得する（ページ再読み込み時などに使用）。
+
+    ETag に局面のバージョンを入れ、クライアントが If-None-Match で同じ値を
+    送ってきた場合は局面が変わっていないので 304（本文なし）を返す。
+    """
     game = _games.get(game_id)
     if game is None:
         raise HTTPException(404, "Game not found")
-    return _state_to_dict(game["state"], game["game_type"])
+    etag = f'"{game_id}-{game.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return game.state_dict()
 
 
 @app.post("/api/train/start")
@@ -295,27 +512,28 @@ async def train_start(req: TrainRequest) -> dict[str, Any]:
         raise HTTPException(400, "Training is already running")
 
     if req.game_type == "animal":
-        state: GameState = AnimalShogiState()
         net_config = ANIMAL_SHOGI_CONFIG
         model_path = "best_model_animal.pt"
     elif req.game_type == "full":
-        state = FullShogiState()
         net_config = FULL_SHOGI_CONFIG
         model_path = "best_model_full.pt"
     else:
         raise HTTPException(400, f"Unknown game type: {req.game_type}")
 
+    state = _INITIAL_STATES[req.game_type]
     loop_config = TrainLoopConfig(
         num_generations=req.num_generations,
         model_path=model_path,
     )
 
-    progress_queue: queue.Queue[dict[str, Any]] = queue.Queue()
+    # SSE 側は await で待てるよう asyncio.Queue を使い、訓練スレッドにはアダプタを渡す
+    progress_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    sink = _LoopQueue(asyncio.get_running_loop(), progress_queue)
     stop_event = threading.Event()
 
     thread = threading.Thread(
         target=run_training,
-        args=(state, net_config, loop_config, progress_queue, stop_event),
+        args=(state, net_config, loop_config, sink, stop_event),
         daemon=True,
     )
 
@@ -347,23 +565,24 @@ async def train_stream() -> StreamingResponse:
       stopped:         ユーザーが停止
       heartbeat:       接続維持（30秒ごと）
     """
-    q: queue.Queue[dict[str, Any]] | None = _train_state.get("progress_queue")
+    q: asyncio.Queue[dict[str, Any]] | None = _train_state.get("progress_queue")
     if q is None:
         raise HTTPException(404, "No training session")
 
     async def event_generator() -> Any:
-        loop = asyncio.get_running_loop()
         while True:
             try:
-                # 最大1秒待機（スレッドプールでブロッキング get を実行）
-                event = await loop.run_in_executor(None, lambda: q.get(timeout=1))
-                yield f"data: {json.dumps(event)}\n\n"
-                if event.get("type") in ("done", "stopped"):
-                    _train_state["running"] = False
-                    break
-            except queue.Empty:
+                # スレッドを占有せず await で待つ（イベントが来ればすぐ返る）
+                event = await asyncio.wait_for(q.get(), timeout=_HEARTBEAT_SEC)
+            except TimeoutError:
                 # 接続を維持するためにハートビートを送る
-                yield 'data: {"type": "heartbeat"}\n\n'
+                yield b'data: {"type":"heartbeat"}\n\n'
+                continue
+            # pydantic-core の Rust 実装で直接 bytes にシリアライズする
+            yield b"data: " + to_json(event) + b"\n\n"
+            if event.get("type") in ("done", "stopped"):
+                _train_state["running"] = False
+                break
 
     return StreamingResponse(
         event_generator(),
@@ -430,21 +649,24 @@ async def auto_move(game_id: str) -> dict[str, Any]:
     if game is None:
         raise HTTPException(404, "Game not found")
 
-    state: GameState = game["state"]
-    game_type: str = game["game_type"]
+    game_type = game.game_type
+
+    async with game.lock:
+        state = game.state
 
-    if state.is_terminal:
-        raise HTTPException(400, "Game is already over")
+        if state.is_terminal:
+            raise HTTPException(400, "Game is already over")
 
-    # 現在の手番プレイヤーのAI関数を取得
-    moved_by = state.current_player
-    fn = game.get("sente_fn") if moved_by == 0 else game.get("gote_fn")
-    if fn is None:
-        raise HTTPException(400, "Current player is human — use /api/move instead")
+        # 現在の手番プレイヤーのAI関数を取得
+        moved_by = state.current_player
+        fn = game.sente_fn if moved_by == 0 else game.gote_fn
+        if fn is None:
+            raise HTTPException(400, "Current player is human — use /api/move instead")
 
-    move = fn(state)
-    state = state.apply_move(move)
-    game["state"] = state
+        move = await asyncio.get_running_loop().run_in_executor(_AI_EXECUTOR, fn, state)
+        state = state.apply_move(move)
+        game.set_state(state)
+        payload = game.state_dict()
 
     decode_fn = animal_decode if game_type == "animal" else full_decode
     decoded = decode_fn(move)
@@ -457,7 +679,7 @@ async def auto_move(game_id: str) -> dict[str, Any]:
         tr, tc = decoded["to"]
         move_str = f"打({tr},{tc})"
     return {
-        "state": _state_to_dict(state, game_type),
+        "state": payload,
         "move": move,
         "move_decoded": move_str,
         "moved_by": moved_by,
@@ -1 +1,17 @@
 """Shared test fixtures."""
+
+import pytest
+
+from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG
+from shogi_ai.model.network import DualHeadNetwork
+
+
+@pytest.fixture(scope="session")
+def animal_net() -> DualHeadNetwork:
+    """推論モードのどうぶつしょうぎ用ネットワーク（重みの初期化を1回で済ませて共有する）。
+
+    読み取り専用で使うこと。勾配や BN 統計量を書き換えるテストは copy.deepcopy して使う。
+    """
+    net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
+    net.eval()
+    return net
@@ -0,0 +1,51 @@
+"""Tests for cross-thread batched evaluation."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from shogi_ai.engine.batch_eval import BatchedEvaluator
+from shogi_ai.engine.mcts import MCTS, MCTSConfig
+from shogi_ai.game.animal_shogi.state import AnimalShogiState
+from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG
+from shogi_ai.model.network import DualHeadNetwork
+
+
+class TestBatchedEvaluator:
+    def test_single_call_matches_network(self, animal_net: DualHeadNetwork) -> None:
+        evaluator = BatchedEvaluator(animal_net)
+        x = torch.randn(3, 14, 4, 3)
+        policy, value = evaluator(x)
+        with torch.inference_mode():
+            expected_policy, expected_value = animal_net(x)
+        assert torch.allclose(policy, expected_policy, atol=1e-5)
+        assert torch.allclose(value, expected_value, atol=1e-5)
+
+    def test_concurrent_calls_get_their_own_rows(self, animal_net: DualHeadNetwork) -> None:
+        evaluator = BatchedEvaluator(animal_net, max_batch_size=4)
+        inputs = [torch.randn(i % 3 + 1, 14, 4, 3) for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outputs = list(pool.map(evaluator, inputs))
+        with torch.inference_mode():
+            for x, (policy, value) in zip(inputs, outputs, strict=True):
+                expected_policy, expected_value = animal_net(x)
+                assert torch.allclose(policy, expected_policy, atol=1e-5)
+                assert torch.allclose(value, expected_value, atol=1e-5)
+
+    def test_error_propagates(self, animal_net: DualHeadNetwork) -> None:
+        evaluator = BatchedEvaluator(animal_net)
+        with pytest.raises(RuntimeError):
+            evaluator(torch.randn(1, 3, 4, 3))  # チャンネル数が合わない
+        # 失敗後も次の呼び出しは評価できる
+        policy, _ = evaluator(torch.randn(1, 14, 4, 3))
+        assert policy.shape == (1, ANIMAL_SHOGI_CONFIG.action_size)
+
+    def test_mcts_with_evaluator(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(
+            animal_net, MCTSConfig(num_simulations=16, batch_size=4), BatchedEvaluator(animal_net)
+        )
+        probs = mcts.search(AnimalShogiState())
+        assert abs(sum(probs) - 1.0) < 0.01
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
 
 from shogi_ai.engine.mcts import MCTS, MCTSConfig, MCTSNode
@@ -9,16 +11,9 @@ from shogi_ai.game.animal_shogi.board import Board, Piece
 from shogi_ai.game.animal_shogi.moves import ACTION_SPACE
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
 from shogi_ai.game.animal_shogi.types import COLS, PieceType, Player
-from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG
 from shogi_ai.model.network import DualHeadNetwork
 
 
-def _make_network() -> DualHeadNetwork:
-    net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-    net.eval()
-    return net
-
-
 class TestMCTSNode:
     def test_initial_q_value(self) -> None:
         node = MCTSNode()
@@ -30,9 +25,8 @@ class TestMCTSNode:
 
 
 class TestMCTSSearch:
-    def test_returns_valid_probabilities(self) -> None:
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=10))
+    def test_returns_valid_probabilities(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10))
         state = AnimalShogiState()
         probs = mcts.search(state)
 
@@ -44,7 +38,7 @@ class TestMCTSSearch:
             if i not in legal:
                 assert p == 0.0 or abs(p) < 1e-6
 
-    def test_finds_checkmate_in_one(self) -> None:
+    def test_finds_checkmate_in_one(self, animal_net: DualHeadNetwork) -> None:
         """MCTS should strongly prefer capturing the lion."""
         squares: list[Piece | None] = [None] * 12
         squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
@@ -53,8 +47,7 @@ class TestMCTSSearch:
         board = Board(squares=tuple(squares), hands=((), ()))
         state = AnimalShogiState(board=board, _current_player=Player.SENTE)
 
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=50))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=50))
         probs = mcts.search(state)
 
         # The winning move (giraffe captures lion)
@@ -63,7 +56,7 @@ class TestMCTSSearch:
         winning_move = encode_board_move(1 * COLS + 1, 0 * COLS + 1)
         assert probs[winning_move] > 0.5
 
-    def test_terminal_state_returns_zeros(self) -> None:
+    def test_terminal_state_returns_zeros(self, animal_net: DualHeadNetwork) -> None:
         """Terminal state with no legal moves returns all zeros."""
         squares: list[Piece | None] = [None] * 12
         squares[10] = Piece(PieceType.LION, Player.SENTE)
@@ -71,17 +64,106 @@ class TestMCTSSearch:
         state = AnimalShogiState(board=board, _current_player=Player.SENTE)
         assert state.is_terminal
 
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=10))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10))
         probs = mcts.search(state)
         assert sum(probs) == 0.0
 
-    def test_deterministic_temperature(self) -> None:
+    def test_deterministic_temperature(self, animal_net: DualHeadNetwork) -> None:
         """Temperature=0 should give deterministic selection."""
-        net = _make_network()
         torch.manual_seed(42)
-        mcts = MCTS(net, MCTSConfig(num_simulations=20, temperature=0))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=20, temperature=0))
         state = AnimalShogiState()
         probs = mcts.search(state)
         # Exactly one move should have probability 1.0
         assert sum(1 for p in probs if p > 0.99) == 1
+
+
+class TestMCTSCache:
+    def test_repeated_evaluation_hits_cache(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10))
+        state = AnimalShogiState()
+        first = mcts._evaluate(state)
+        second = mcts._evaluate(state)
+        assert first is second
+
+    def test_priors_cover_legal_moves_only(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10))
+        state = AnimalShogiState()
+        priors, _ = mcts._evaluate(state)
+        assert set(priors) == set(state.legal_moves())
+        assert abs(sum(priors.values()) - 1.0) < 1e-5
+
+    def test_cache_size_bounded(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=20, cache_size=5))
+        mcts.search(AnimalShogiState())
+        assert len(mcts._cache) <= 5
+
+    def test_cache_disabled(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10, cache_size=0))
+        mcts.search(AnimalShogiState())
+        assert len(mcts._cache) == 0
+
+    def test_clear_cache(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=10))
+        mcts.search(AnimalShogiState())
+        mcts.clear_cache()
+        assert len(mcts._cache) == 0
+
+    def test_shared_across_threads(self, animal_net: DualHeadNetwork) -> None:
+        """The web app runs searches for several games on one MCTS concurrently."""
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=20, cache_size=8))
+        states = [AnimalShogiState()]
+        for move in AnimalShogiState().legal_moves():
+            states.append(AnimalShogiState().apply_move(move))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(mcts.search, states * 2))
+        assert all(abs(sum(probs) - 1.0) < 0.01 for probs in results)
+        assert len(mcts._cache) <= 8
+
+
+class TestMCTSBatchedSearch:
+    def test_returns_valid_probabilities(self, animal_net: DualHeadNetwork) -> None:
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=32, batch_size=8))
+        state = AnimalShogiState()
+        probs = mcts.search(state)
+
+        assert len(probs) == ACTION_SPACE
+        assert abs(sum(probs) - 1.0) < 0.01
+        legal = set(state.legal_moves())
+        assert all(p == 0.0 for i, p in enumerate(probs) if i not in legal)
+
+    def test_virtual_loss_undone(self, animal_net: DualHeadNetwork) -> None:
+        """After the search every node's value stays within [-N, N]."""
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=40, batch_size=8))
+        root = MCTSNode()
+        state = AnimalShogiState()
+        priors, _ = mcts._evaluate(state)
+        for move in state.legal_moves():
+            root.children[move] = MCTSNode(prior=priors[move])
+        for _ in range(5):
+            mcts._simulate_batch(root, state, 8)
+
+        visits = sum(c.visit_count for c in root.children.values())
+        assert 0 < visits <= 40
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children.values():
+                assert abs(child.total_value) <= child.visit_count + 1e-6
+                stack.append(child)
+
+    def test_finds_checkmate_in_one(self, animal_net: DualHeadNetwork) -> None:
+        squares: list[Piece | None] = [None] * 12
+        squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
+        squares[3 * COLS + 1] = Piece(PieceType.LION, Player.SENTE)
+        squares[1 * COLS + 1] = Piece(PieceType.GIRAFFE, Player.SENTE)
+        board = Board(squares=tuple(squares), hands=((), ()))
+        state = AnimalShogiState(board=board, _current_player=Player.SENTE)
+
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=64, batch_size=8))
+        probs = mcts.search(state)
+
+        from shogi_ai.game.animal_shogi.moves import encode_board_move
+
+        winning_move = encode_board_move(1 * COLS + 1, 0 * COLS + 1)
+        assert probs[winning_move] > 0.5
@@ -11,26 +11,18 @@ from shogi_ai.game.animal_shogi.board import Board, Piece
 from shogi_ai.game.animal_shogi.moves import ACTION_SPACE, encode_board_move
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
 from shogi_ai.game.animal_shogi.types import COLS, PieceType, Player
-from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG
 from shogi_ai.model.network import DualHeadNetwork
 
 
-def _make_network() -> DualHeadNetwork:
-    net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-    net.eval()
-    return net
-
-
 def _make_state(squares: list[Piece | None], player: Player = Player.SENTE) -> AnimalShogiState:
     board = Board(squares=tuple(squares), hands=((), ()))
     return AnimalShogiState(board=board, _current_player=player)
 
 
 class TestMCTSMinimalSimulations:
-    def test_num_simulations_1(self) -> None:
+    def test_num_simulations_1(self, animal_net: DualHeadNetwork) -> None:
         """num_simulations=1 の最小ケースで正しい確率分布を返す。"""
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=1))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=1))
         state = AnimalShogiState()
         probs = mcts.search(state)
 
@@ -39,18 +31,16 @@ class TestMCTSMinimalSimulations:
         total = sum(probs)
         assert abs(total - 1.0) < 0.01
 
-    def test_probabilities_sum_to_one(self) -> None:
+    def test_probabilities_sum_to_one(self, animal_net: DualHeadNetwork) -> None:
         """通常局面では確率の合計が 1.0 になる。"""
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=5))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=5))
         state = AnimalShogiState()
         probs = mcts.search(state)
         assert abs(sum(probs) - 1.0) < 0.01
 
-    def test_illegal_moves_have_zero_probability(self) -> None:
+    def test_illegal_moves_have_zero_probability(self, animal_net: DualHeadNetwork) -> None:
         """非合法手の確率は 0 であること。"""
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=5))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=5))
         state = AnimalShogiState()
         probs = mcts.search(state)
         legal = set(state.legal_moves())
@@ -60,7 +50,7 @@ class TestMCTSMinimalSimulations:
 
 
 class TestMCTSNearTerminal:
-    def test_one_move_from_win(self) -> None:
+    def test_one_move_from_win(self, animal_net: DualHeadNetwork) -> None:
         """ライオン取りが1手で可能な局面で、MCTSがその手を高確率で選ぶ。"""
         squares: list[Piece | None] = [None] * 12
         # 後手ライオン (0,1) / 先手ライオン (3,1) / 先手きりん (1,1) で取れる
@@ -70,27 +60,25 @@ class TestMCTSNearTerminal:
         state = _make_state(squares, Player.SENTE)
         assert not state.is_terminal  # まだ終局ではない
 
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=30))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=30))
         probs = mcts.search(state)
 
         winning_move = encode_board_move(1 * COLS + 1, 0 * COLS + 1)
         # 勝ち手が最も高い確率を持つべき
         assert probs[winning_move] == max(probs)
 
-    def test_terminal_state_returns_all_zeros(self) -> None:
+    def test_terminal_state_returns_all_zeros(self, animal_net: DualHeadNetwork) -> None:
         """終局状態では全手の確率が 0 になる（合法手なし）。"""
         squares: list[Piece | None] = [None] * 12
         squares[10] = Piece(PieceType.LION, Player.SENTE)  # 先手ライオンのみ
         state = _make_state(squares, Player.SENTE)
         assert state.is_terminal
 
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=5))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=5))
         probs = mcts.search(state)
         assert sum(probs) == 0.0
 
-    def test_already_won_state(self) -> None:
+    def test_already_won_state(self, animal_net: DualHeadNetwork) -> None:
         """勝敗確定済み局面でも MCTS がクラッシュしない。"""
         squares: list[Piece | None] = [None] * 12
         # 後手ライオンなし → 先手の勝ち（is_terminal=True）
@@ -99,8 +87,7 @@ class TestMCTSNearTerminal:
         assert state.is_terminal
         assert state.winner == Player.SENTE.value
 
-        net = _make_network()
-        mcts = MCTS(net, MCTSConfig(num_simulations=1))
+        mcts = MCTS(animal_net, MCTSConfig(num_simulations=1))
         probs = mcts.search(state)
         # クラッシュせず、全ゼロを返す
         assert sum(probs) == 0.0
@@ -4,10 +4,16 @@ from __future__ import annotations
 
 import pytest
 
-from shogi_ai.engine.minimax import evaluate, minimax_move, negamax
+from shogi_ai.engine.minimax import (
+    TranspositionTable,
+    _order_moves,
+    evaluate,
+    minimax_move,
+    negamax,
+)
 from shogi_ai.engine.random_player import random_move
 from shogi_ai.game.animal_shogi.board import Board, Piece
-from shogi_ai.game.animal_shogi.moves import ACTION_SPACE
+from shogi_ai.game.animal_shogi.moves import ACTION_SPACE, encode_board_move
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
 from shogi_ai.game.animal_shogi.types import COLS, PieceType, Player
 
@@ -36,6 +42,19 @@ class TestEvaluate:
         score = evaluate(state)
         assert score > 50  # Very high for current player (Sente)
 
+    def test_material_from_both_perspectives(self) -> None:
+        squares: list[Piece | None] = [None] * 12
+        squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
+        squares[3 * COLS + 1] = Piece(PieceType.LION, Player.SENTE)
+        squares[3 * COLS + 0] = Piece(PieceType.ELEPHANT, Player.SENTE)
+        squares[1 * COLS + 2] = Piece(PieceType.CHICK, Player.GOTE)
+        board = Board(squares=tuple(squares), hands=((PieceType.GIRAFFE,), ()))
+        sente = AnimalShogiState(board=board, _current_player=Player.SENTE)
+        gote = AnimalShogiState(board=board, _current_player=Player.GOTE)
+        # 先手: ぞう3 + 持ち駒きりん3 − ひよこ1
+        assert evaluate(sente) == 5.0
+        assert evaluate(gote) == -5.0
+
 
 class TestNegamax:
     def test_returns_valid_move(self) -> None:
@@ -133,3 +152,59 @@ class TestAlphaBetaPruning:
         state = AnimalShogiState()
         move, score = negamax(state, depth=6, alpha=float("-inf"), beta=float("inf"))
         assert 0 <= move < ACTION_SPACE
+
+
+class TestTranspositionTable:
+    def test_transposed_positions_share_hash(self) -> None:
+        # 先手きりん↑・後手ライオン・先手ライオン と、先手の2手を入れ替えた手順
+        a = AnimalShogiState().apply_move(140).apply_move(15).apply_move(126)
+        b = AnimalShogiState().apply_move(126).apply_move(15).apply_move(140)
+        assert a.board == b.board
+        assert a.zobrist == b.zobrist
+
+    def test_side_to_move_changes_hash(self) -> None:
+        state = AnimalShogiState()
+        other = AnimalShogiState(board=state.board, _current_player=Player.GOTE)
+        assert state.zobrist != other.zobrist
+
+    def test_warm_table_gives_same_result(self) -> None:
+        state = AnimalShogiState()
+        tt: TranspositionTable = {}
+        cold = negamax(state, depth=4, alpha=float("-inf"), beta=float("inf"), tt=tt)
+        assert tt
+        warm = negamax(state, depth=4, alpha=float("-inf"), beta=float("inf"), tt=tt)
+        assert warm == cold
+
+    def test_searches_do_not_share_a_table(self) -> None:
+        state = AnimalShogiState()
+        tt: TranspositionTable = {}
+        negamax(state, depth=2, alpha=float("-inf"), beta=float("inf"), tt=tt)
+        snapshot = dict(tt)
+        # 別の探索は自分の表を使うので、他の探索の表には触れない
+        minimax_move(state.apply_move(state.legal_moves()[0]), depth=3)
+        assert tt == snapshot
+
+
+class TestMoveOrdering:
+    def test_capture_first_most_valuable_victim(self) -> None:
+        squares: list[Piece | None] = [None] * 12
+        squares[0 * COLS + 1] = Piece(PieceType.LION, Player.GOTE)
+        squares[3 * COLS + 1] = Piece(PieceType.LION, Player.SENTE)
+        squares[1 * COLS + 1] = Piece(PieceType.GIRAFFE, Player.SENTE)
+        squares[1 * COLS + 0] = Piece(PieceType.CHICK, Player.GOTE)
+        state = _make_state(squares, Player.SENTE)
+        ordered = _order_moves(state, state.legal_moves(), tt_move=-1)
+        assert ordered[0] == encode_board_move(1 * COLS + 1, 0 * COLS + 1)  # ライオン取り
+        assert ordered[1] == encode_board_move(1 * COLS + 1, 1 * COLS + 0)  # ひよこ取り
+
+    def test_tt_move_first(self) -> None:
+        state = AnimalShogiState()
+        moves = state.legal_moves()
+        assert _order_moves(state, moves, tt_move=moves[-1])[0] == moves[-1]
+
+    def test_iterative_deepening_matches_fixed_depth(self) -> None:
+        state = AnimalShogiState()
+        _, expected = negamax(state, depth=4, alpha=float("-inf"), beta=float("inf"))
+        move = minimax_move(state, depth=4)
+        _, score = negamax(state.apply_move(move), 3, float("-inf"), float("inf"))
+        assert -score == expected
@@ -1,5 +1,7 @@
 """Tests for random player."""
 
+import random
+
 from shogi_ai.engine.random_player import random_move
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
 
@@ -19,3 +21,10 @@ def test_game_completes() -> None:
         move = random_move(state)
         state = state.apply_move(move)
     assert state.is_terminal
+
+
+def test_seeded_rng_is_reproducible() -> None:
+    state = AnimalShogiState()
+    first = [random_move(state, random.Random(7)) for _ in range(5)]
+    second = [random_move(state, random.Random(7)) for _ in range(5)]
+    assert first == second
@@ -0,0 +1,33 @@
+"""Shared fixtures for animal shogi tests."""
+
+import pytest
+import torch
+
+from shogi_ai.game.animal_shogi.board import Board
+from shogi_ai.game.animal_shogi.moves import legal_moves
+from shogi_ai.game.animal_shogi.state import AnimalShogiState
+from shogi_ai.game.animal_shogi.types import Player
+
+
+@pytest.fixture(scope="session")
+def initial_board() -> Board:
+    """初期局面の盤面（イミュータブルなのでセッション全体で共有する）。"""
+    return Board()
+
+
+@pytest.fixture(scope="session")
+def initial_state() -> AnimalShogiState:
+    """初期局面の状態（合法手のキャッシュもテスト間で共有される）。"""
+    return AnimalShogiState()
+
+
+@pytest.fixture(scope="session")
+def initial_sente_moves(initial_board: Board) -> frozenset[int]:
+    """初期局面での先手の合法手（1回だけ生成し、所属判定用に集合で持つ）。"""
+    return frozenset(legal_moves(initial_board, Player.SENTE))
+
+
+@pytest.fixture(scope="session")
+def initial_planes(initial_state: AnimalShogiState) -> torch.Tensor:
+    """初期局面の入力テンソル（読み取り専用のテスト間で1回の変換を共有する）。"""
+    return initial_state.to_tensor_planes()
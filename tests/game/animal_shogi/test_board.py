@@ -1,52 +1,55 @@
 """Tests for Board representation."""
 
-from shogi_ai.game.animal_shogi.board import Board, Piece
+from shogi_ai.game.animal_shogi.board import (
+    EMPTY_CODE,
+    OWNED_PIECES,
+    PIECES,
+    Board,
+    Piece,
+    piece_code,
+)
 from shogi_ai.game.animal_shogi.types import COLS, ROWS, PieceType, Player
 
 
 class TestInitialPosition:
-    def test_board_size(self) -> None:
-        board = Board()
-        assert len(board.squares) == ROWS * COLS
+    def test_board_size(self, initial_board: Board) -> None:
+        assert len(initial_board.squares) == ROWS * COLS
 
-    def test_sente_lion_at_3_1(self) -> None:
-        board = Board()
-        piece = board.piece_at(3, 1)
+    def test_sente_lion_at_3_1(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(3, 1)
         assert piece is not None
         assert piece.piece_type == PieceType.LION
         assert piece.owner == Player.SENTE
 
-    def test_gote_lion_at_0_1(self) -> None:
-        board = Board()
-        piece = board.piece_at(0, 1)
+    def test_gote_lion_at_0_1(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(0, 1)
         assert piece is not None
         assert piece.piece_type == PieceType.LION
         assert piece.owner == Player.GOTE
 
-    def test_sente_pieces(self) -> None:
-        board = Board()
+    def test_sente_pieces(self, initial_board: Board) -> None:
         # Elephant at (3,0), Lion at (3,1), Giraffe at (3,2)
-        assert board.piece_at(3, 0) == Piece(PieceType.ELEPHANT, Player.SENTE)
-        assert board.piece_at(3, 2) == Piece(PieceType.GIRAFFE, Player.SENTE)
+        assert initial_board.piece_at(3, 0) == Piece(PieceType.ELEPHANT, Player.SENTE)
+        assert initial_board.piece_at(3, 2) == Piece(PieceType.GIRAFFE, Player.SENTE)
         # Chick at (2,1)
-        assert board.piece_at(2, 1) == Piece(PieceType.CHICK, Player.SENTE)
+        assert initial_board.piece_at(2, 1) == Piece(PieceType.CHICK, Player.SENTE)
 
-    def test_gote_pieces(self) -> None:
-        board = Board()
+    def test_gote_pieces(self, initial_board: Board) -> None:
         # Giraffe at (0,0), Lion at (0,1), Elephant at (0,2)
-        assert board.piece_at(0, 0) == Piece(PieceType.GIRAFFE, Player.GOTE)
-        assert board.piece_at(0, 2) == Piece(PieceType.ELEPHANT, Player.GOTE)
+        assert initial_board.piece_at(0, 0) == Piece(PieceType.GIRAFFE, Player.GOTE)
+        assert initial_board.piece_at(0, 2) == Piece(PieceType.ELEPHANT, Player.GOTE)
         # Chick at (1,1)
-        assert board.piece_at(1, 1) == Piece(PieceType.CHICK, Player.GOTE)
+        assert initial_board.piece_at(1, 1) == Piece(PieceType.CHICK, Player.GOTE)
 
-    def test_empty_squares(self) -> None:
-        board = Board()
+    def test_empty_squares(self, initial_board: Board) -> None:
         for r, c in [(1, 0), (1, 2), (2, 0), (2, 2)]:
-            assert board.piece_at(r, c) is None
+            assert initial_board.piece_at(r, c) is None
 
-    def test_empty_hands(self) -> None:
-        board = Board()
-        assert board.hands == ((), ())
+    def test_empty_hands(self, initial_board: Board) -> None:
+        assert initial_board.hands == ((), ())
+
+    def test_initial_squares_shared(self) -> None:
+        assert Board().squares is Board().squares
 
 
 class TestBoardOperations:
@@ -57,6 +60,16 @@ class TestBoardOperations:
         assert new_board.piece_at(1, 0) == piece
         assert board.piece_at(1, 0) is None  # Original unchanged
 
+    def test_move_piece_matches_set_piece(self) -> None:
+        # 2,1 のひよこで 1,1 の後手のひよこを取る（取った駒の持ち駒処理は呼び出し側）
+        board = Board()
+        chick = Piece(PieceType.CHICK, Player.SENTE)
+        moved = board.move_piece(2 * COLS + 1, 1 * COLS + 1, chick)
+        expected = board.set_piece(2, 1, None).set_piece(1, 1, chick)
+        assert moved == expected
+        assert moved.zobrist == expected.zobrist
+        assert moved.codes == expected.codes
+
     def test_add_to_hand(self) -> None:
         board = Board()
         new_board = board.add_to_hand(Player.SENTE, PieceType.CHICK)
@@ -73,10 +86,23 @@ class TestBoardOperations:
         new_board = board.remove_from_hand(Player.SENTE, PieceType.CHICK)
         assert new_board.hands[Player.SENTE.value] == (PieceType.GIRAFFE,)
 
-    def test_find_lion(self) -> None:
-        board = Board()
-        sente_lion = board.find_lion(Player.SENTE)
-        gote_lion = board.find_lion(Player.GOTE)
+    def test_unsorted_hands_are_sorted(self) -> None:
+        board = Board(hands=((PieceType.GIRAFFE, PieceType.CHICK, PieceType.CHICK), ()))
+        assert board.hands[Player.SENTE.value] == (
+            PieceType.CHICK,
+            PieceType.CHICK,
+            PieceType.GIRAFFE,
+        )
+        assert board == Board(hands=((PieceType.CHICK, PieceType.CHICK, PieceType.GIRAFFE), ()))
+        added = board.add_to_hand(Player.SENTE, PieceType.CHICK)
+        assert added == Board(hands=(added.hands[0], ()))
+        removed = board.remove_from_hand(Player.SENTE, PieceType.CHICK)
+        assert removed.hands[Player.SENTE.value] == (PieceType.CHICK, PieceType.GIRAFFE)
+        assert removed.zobrist == Board(hands=(removed.hands[0], ())).zobrist
+
+    def test_find_lion(self, initial_board: Board) -> None:
+        sente_lion = initial_board.find_lion(Player.SENTE)
+        gote_lion = initial_board.find_lion(Player.GOTE)
         assert sente_lion == 3 * COLS + 1  # (3, 1) = index 10
         assert gote_lion == 0 * COLS + 1  # (0, 1) = index 1
 
@@ -86,3 +112,50 @@ class TestBoardOperations:
         squares[1] = None  # Remove gote lion at (0, 1)
         board = Board(squares=tuple(squares))
         assert board.find_lion(Player.GOTE) is None
+
+
+class TestZobrist:
+    def test_incremental_matches_full_hash(self) -> None:
+        board = (
+            Board()
+            .set_piece(2, 1, None)
+            .add_to_hand(Player.GOTE, PieceType.CHICK)
+            .set_piece(1, 1, Piece(PieceType.HEN, Player.SENTE))
+        )
+        fresh = Board(squares=board.squares, hands=board.hands)
+        assert board.zobrist == fresh.zobrist
+
+    def test_hand_round_trip_restores_hash(self) -> None:
+        board = Board()
+        changed = board.add_to_hand(Player.SENTE, PieceType.GIRAFFE)
+        assert changed.zobrist != board.zobrist
+        assert changed.remove_from_hand(Player.SENTE, PieceType.GIRAFFE).zobrist == board.zobrist
+
+    def test_equal_boards_share_hash(self) -> None:
+        # 差分更新で作った盤面と、同じ内容を一から作った盤面は等しく、ハッシュも同じ
+        moved = Board().set_piece(2, 1, None).set_piece(2, 0, Piece(PieceType.CHICK, Player.SENTE))
+        fresh = Board(squares=moved.squares, hands=moved.hands)
+        assert moved == fresh
+        assert hash(moved) == hash(fresh) == moved.zobrist
+        assert len({Board(), moved, fresh}) == 2
+        assert moved != Board()
+
+
+class TestPieceCodes:
+    def test_codes_follow_squares(self) -> None:
+        board = Board().set_piece(2, 1, None).set_piece(0, 0, Piece(PieceType.HEN, Player.SENTE))
+        fresh = Board(squares=board.squares, hands=board.hands)
+        assert board.codes == fresh.codes
+        assert board.codes[2 * COLS + 1] == EMPTY_CODE
+        assert board.codes[0] == piece_code(PieceType.HEN, Player.SENTE)
+
+    def test_pieces_table_matches_codes(self) -> None:
+        assert PIECES[EMPTY_CODE] is None
+        for pt in PieceType:
+            for player in Player:
+                assert PIECES[piece_code(pt, player)] == Piece(pt, player)
+                assert OWNED_PIECES[pt * 2 + player] is PIECES[piece_code(pt, player)]
+
+    def test_find_lion_after_move(self) -> None:
+        board = Board().set_piece(3, 1, None).set_piece(2, 0, Piece(PieceType.LION, Player.SENTE))
+        assert board.find_lion(Player.SENTE) == 2 * COLS + 0
@@ -7,6 +7,7 @@ from shogi_ai.game.animal_shogi.moves import (
     encode_board_move,
     encode_drop_move,
     legal_moves,
+    move_squares,
 )
 from shogi_ai.game.animal_shogi.types import COLS, PieceType, Player
 
@@ -26,6 +27,15 @@ class TestMoveEncoding:
         assert info["piece_type"] == PieceType.CHICK
         assert info["to"] == (1, 0)
 
+    def test_move_squares(self) -> None:
+        assert move_squares(encode_board_move(10, 7)) == (10, 7)
+        assert move_squares(encode_drop_move(PieceType.ELEPHANT, 5)) == (None, 5)
+
+    def test_decode_returns_fresh_dict(self) -> None:
+        move = encode_board_move(10, 7)
+        decode_move(move)["to"] = (0, 0)
+        assert decode_move(move)["to"] == (2, 1)
+
 
 class TestLegalMoves:
     def test_initial_position_sente(self) -> None:
@@ -33,27 +43,24 @@ class TestLegalMoves:
         moves = legal_moves(board, Player.SENTE)
         assert len(moves) > 0
 
-    def test_initial_sente_chick_can_advance(self) -> None:
+    def test_initial_sente_chick_can_advance(self, initial_sente_moves: frozenset[int]) -> None:
         """Sente's chick at (2,1) can move to (1,1) capturing gote's chick."""
-        board = Board()
-        moves = legal_moves(board, Player.SENTE)
+        moves = initial_sente_moves
         chick_advance = encode_board_move(2 * COLS + 1, 1 * COLS + 1)
         assert chick_advance in moves
 
-    def test_initial_sente_lion_moves(self) -> None:
+    def test_initial_sente_lion_moves(self, initial_sente_moves: frozenset[int]) -> None:
         """Sente's lion at (3,1) can move to (2,0) and (2,2)."""
-        board = Board()
-        moves = legal_moves(board, Player.SENTE)
+        moves = initial_sente_moves
         lion_idx = 3 * COLS + 1  # (3,1) = 10
         # Lion can go to (2,0)=6, (2,2)=8 (not (2,1) blocked by own chick,
         # not (3,0) own elephant, not (3,2) own giraffe)
         assert encode_board_move(lion_idx, 6) in moves
         assert encode_board_move(lion_idx, 8) in moves
 
-    def test_cannot_capture_own_piece(self) -> None:
+    def test_cannot_capture_own_piece(self, initial_sente_moves: frozenset[int]) -> None:
         """Sente's lion should not be able to move to squares with own pieces."""
-        board = Board()
-        moves = legal_moves(board, Player.SENTE)
+        moves = initial_sente_moves
         lion_idx = 10
         own_elephant = 9  # (3,0)
         own_giraffe = 11  # (3,2)
@@ -151,6 +158,16 @@ class TestGoteMovement:
         chick_advance = encode_board_move(1 * COLS + 1, 2 * COLS + 1)
         assert chick_advance in moves
 
+    def test_gote_lion_in_corner(self) -> None:
+        """Only on-board, non-own squares are generated from a corner."""
+        squares: list[Piece | None] = [None] * 12
+        squares[0] = Piece(PieceType.LION, Player.GOTE)
+        squares[1] = Piece(PieceType.GIRAFFE, Player.GOTE)
+        squares[11] = Piece(PieceType.LION, Player.SENTE)
+        board = Board(squares=tuple(squares), hands=((), ()))
+        lion_moves = [m for m in legal_moves(board, Player.GOTE) if m // 12 == 0]
+        assert sorted(m % 12 for m in lion_moves) == [1 * COLS + 0, 1 * COLS + 1]
+
 
 class TestMoveEncodingBoundary:
     """手エンコードの境界値テスト。"""
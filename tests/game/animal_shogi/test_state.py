@@ -1,5 +1,7 @@
 """Tests for AnimalShogiState."""
 
+import torch
+
 from shogi_ai.game.animal_shogi.board import Board, Piece
 from shogi_ai.game.animal_shogi.moves import encode_board_move
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
@@ -8,27 +10,22 @@ from shogi_ai.game.protocol import GameState
 
 
 class TestProtocolCompliance:
-    def test_implements_game_state(self) -> None:
-        state = AnimalShogiState()
-        assert isinstance(state, GameState)
+    def test_implements_game_state(self, initial_state: AnimalShogiState) -> None:
+        assert isinstance(initial_state, GameState)
 
 
 class TestInitialState:
-    def test_sente_starts(self) -> None:
-        state = AnimalShogiState()
-        assert state.current_player == Player.SENTE.value
+    def test_sente_starts(self, initial_state: AnimalShogiState) -> None:
+        assert initial_state.current_player == Player.SENTE.value
 
-    def test_not_terminal(self) -> None:
-        state = AnimalShogiState()
-        assert not state.is_terminal
+    def test_not_terminal(self, initial_state: AnimalShogiState) -> None:
+        assert not initial_state.is_terminal
 
-    def test_winner_none(self) -> None:
-        state = AnimalShogiState()
-        assert state.winner is None
+    def test_winner_none(self, initial_state: AnimalShogiState) -> None:
+        assert initial_state.winner is None
 
-    def test_has_legal_moves(self) -> None:
-        state = AnimalShogiState()
-        assert len(state.legal_moves()) > 0
+    def test_has_legal_moves(self, initial_state: AnimalShogiState) -> None:
+        assert len(initial_state.legal_moves()) > 0
 
 
 class TestApplyMove:
@@ -46,6 +43,12 @@ class TestApplyMove:
         assert state.current_player == Player.SENTE.value
         assert state.board == Board()
 
+    def test_legal_moves_cached(self) -> None:
+        state = AnimalShogiState()
+        assert state.legal_moves() is state.legal_moves()
+        # キャッシュは比較に影響しない
+        assert state == AnimalShogiState()
+
 
 class TestTerminalConditions:
     def test_lion_capture_wins(self) -> None:
@@ -98,19 +101,22 @@ class TestTerminalConditions:
 
 
 class TestTensorPlanes:
-    def test_shape(self) -> None:
-        state = AnimalShogiState()
-        tensor = state.to_tensor_planes()
-        assert tensor.shape == (14, ROWS, COLS)
+    def test_shape(self, initial_planes: torch.Tensor) -> None:
+        assert initial_planes.shape == (14, ROWS, COLS)
 
-    def test_sente_lion_plane(self) -> None:
-        state = AnimalShogiState()
-        tensor = state.to_tensor_planes()
+    def test_sente_lion_plane(self, initial_planes: torch.Tensor) -> None:
         # Lion is PieceType 3, sente's lion at (3,1)
-        assert tensor[PieceType.LION.value, 3, 1] == 1.0
+        assert initial_planes[PieceType.LION.value, 3, 1] == 1.0
 
-    def test_turn_indicator(self) -> None:
-        state = AnimalShogiState()
+    def test_turn_indicator(self, initial_planes: torch.Tensor) -> None:
+        # SENTE's turn: plane 13 should be all 1s（合計ではなく要素ごとに確かめる）
+        assert bool((initial_planes[13] == 1.0).all())
+
+    def test_piece_planes_from_gote_view(self) -> None:
+        state = AnimalShogiState(_current_player=Player.GOTE)
         tensor = state.to_tensor_planes()
-        # SENTE's turn: plane 13 should be all 1s
-        assert tensor[13].sum() == ROWS * COLS
+        # 後手番では後手のライオンが自分の駒（ch.3）、先手のライオンが相手の駒（ch.8）
+        assert tensor[PieceType.LION.value, 0, 1] == 1.0
+        assert tensor[5 + PieceType.LION.value, 3, 1] == 1.0
+        # 盤上の8枚がちょうど1回ずつ置かれる
+        assert tensor[:10].sum() == 8
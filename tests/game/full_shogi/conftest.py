@@ -0,0 +1,27 @@
+"""Shared fixtures for full shogi tests."""
+
+from __future__ import annotations
+
+import pytest
+import torch
+
+from shogi_ai.game.full_shogi.board import Board
+from shogi_ai.game.full_shogi.state import FullShogiState
+
+
+@pytest.fixture(scope="session")
+def initial_board() -> Board:
+    """初期局面の盤面（イミュータブルなのでセッション全体で共有する）。"""
+    return Board()
+
+
+@pytest.fixture(scope="session")
+def initial_state() -> FullShogiState:
+    """初期局面の状態（合法手のキャッシュもテスト間で共有される）。"""
+    return FullShogiState()
+
+
+@pytest.fixture(scope="session")
+def initial_planes(initial_state: FullShogiState) -> torch.Tensor:
+    """初期局面の入力テンソル（読み取り専用のテスト間で1回の変換を共有する）。"""
+    return initial_state.to_tensor_planes()
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from shogi_ai.game.full_shogi.board import Board, Piece
+from shogi_ai.game.full_shogi.board import (
+    EMPTY_CODE,
+    OWNED_PIECES,
+    PIECES,
+    Board,
+    Piece,
+    piece_code,
+)
 from shogi_ai.game.full_shogi.types import (
     COLS,
     NUM_SQUARES,
@@ -12,67 +19,53 @@ from shogi_ai.game.full_shogi.types import (
 
 
 class TestInitialPosition:
-    def test_81_squares(self) -> None:
-        board = Board()
-        assert len(board.squares) == NUM_SQUARES
+    def test_81_squares(self, initial_board: Board) -> None:
+        assert len(initial_board.squares) == NUM_SQUARES
 
-    def test_sente_king_at_row8_col4(self) -> None:
-        board = Board()
-        piece = board.piece_at(8, 4)
+    def test_sente_king_at_row8_col4(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(8, 4)
         assert piece is not None
         assert piece.piece_type == PieceType.KING
         assert piece.owner == Player.SENTE
 
-    def test_gote_king_at_row0_col4(self) -> None:
-        board = Board()
-        piece = board.piece_at(0, 4)
+    def test_gote_king_at_row0_col4(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(0, 4)
         assert piece is not None
         assert piece.piece_type == PieceType.KING
         assert piece.owner == Player.GOTE
 
-    def test_sente_rook_at_row7_col7(self) -> None:
-        board = Board()
-        piece = board.piece_at(7, 7)
+    def test_sente_rook_at_row7_col7(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(7, 7)
         assert piece is not None
         assert piece.piece_type == PieceType.ROOK
         assert piece.owner == Player.SENTE
 
-    def test_gote_bishop_at_row1_col7(self) -> None:
-        board = Board()
-        piece = board.piece_at(1, 7)
+    def test_gote_bishop_at_row1_col7(self, initial_board: Board) -> None:
+        piece = initial_board.piece_at(1, 7)
         assert piece is not None
         assert piece.piece_type == PieceType.BISHOP
         assert piece.owner == Player.GOTE
 
-    def test_sente_pawns_on_row6(self) -> None:
-        board = Board()
-        for c in range(COLS):
-            piece = board.piece_at(6, c)
-            assert piece is not None
-            assert piece.piece_type == PieceType.PAWN
-            assert piece.owner == Player.SENTE
+    def test_sente_pawns_on_row6(self, initial_board: Board) -> None:
+        row = initial_board.codes[6 * COLS : 7 * COLS]
+        assert row == bytes([piece_code(PieceType.PAWN, Player.SENTE)]) * COLS
 
-    def test_gote_pawns_on_row2(self) -> None:
-        board = Board()
-        for c in range(COLS):
-            piece = board.piece_at(2, c)
-            assert piece is not None
-            assert piece.piece_type == PieceType.PAWN
-            assert piece.owner == Player.GOTE
+    def test_gote_pawns_on_row2(self, initial_board: Board) -> None:
+        row = initial_board.codes[2 * COLS : 3 * COLS]
+        assert row == bytes([piece_code(PieceType.PAWN, Player.GOTE)]) * COLS
 
-    def test_empty_squares_in_middle(self) -> None:
-        board = Board()
-        for r in range(3, 6):
-            for c in range(COLS):
-                assert board.piece_at(r, c) is None
+    def test_empty_squares_in_middle(self, initial_board: Board) -> None:
+        assert initial_board.codes[3 * COLS : 6 * COLS] == bytes([EMPTY_CODE]) * (3 * COLS)
+        assert initial_board.squares[3 * COLS : 6 * COLS] == (None,) * (3 * COLS)
 
-    def test_empty_hands(self) -> None:
-        board = Board()
-        assert board.hands == ((), ())
+    def test_empty_hands(self, initial_board: Board) -> None:
+        assert initial_board.hands == ((), ())
 
-    def test_piece_count(self) -> None:
-        board = Board()
-        pieces = [p for p in board.squares if p is not None]
+    def test_initial_squares_shared(self) -> None:
+        assert Board().squares is Board().squares
+
+    def test_piece_count(self, initial_board: Board) -> None:
+        pieces = [p for p in initial_board.squares if p is not None]
         assert len(pieces) == 40  # 20 per side
 
 
@@ -83,21 +76,81 @@ class TestBoardOperations:
         assert new_board.piece_at(4, 4) is not None
         assert board.piece_at(4, 4) is None  # Original unchanged
 
+    def test_move_piece_matches_set_piece(self) -> None:
+        # 6,4 の歩で 2,4 の後手の歩を取って成る（取った駒の持ち駒処理は呼び出し側）
+        board = Board()
+        promoted = Piece(PieceType.PRO_PAWN, Player.SENTE)
+        moved = board.move_piece(6 * COLS + 4, 2 * COLS + 4, promoted)
+        expected = board.set_piece(6, 4, None).set_piece(2, 4, promoted)
+        assert moved == expected
+        assert moved.zobrist == expected.zobrist
+        assert moved.codes == expected.codes
+
     def test_add_to_hand_reverts_promotion(self) -> None:
         board = Board()
         new_board = board.add_to_hand(Player.SENTE, PieceType.PRO_PAWN)
         assert PieceType.PAWN in new_board.hands[0]
         assert PieceType.PRO_PAWN not in new_board.hands[0]
 
-    def test_find_king(self) -> None:
-        board = Board()
-        sente_king = board.find_king(Player.SENTE)
-        gote_king = board.find_king(Player.GOTE)
+    def test_unsorted_hands_are_sorted(self) -> None:
+        board = Board(hands=((PieceType.GOLD, PieceType.PAWN, PieceType.PAWN), ()))
+        assert board.hands[0] == (PieceType.PAWN, PieceType.PAWN, PieceType.GOLD)
+        assert board == Board(hands=((PieceType.PAWN, PieceType.PAWN, PieceType.GOLD), ()))
+        added = board.add_to_hand(Player.SENTE, PieceType.PAWN)
+        assert added.hands[0] == (PieceType.PAWN,) * 3 + (PieceType.GOLD,)
+        assert added.zobrist == Board(hands=(added.hands[0], ())).zobrist
+        removed = board.remove_from_hand(Player.SENTE, PieceType.PAWN)
+        assert removed == Board(hands=((PieceType.PAWN, PieceType.GOLD), ()))
+
+    def test_find_king(self, initial_board: Board) -> None:
+        sente_king = initial_board.find_king(Player.SENTE)
+        gote_king = initial_board.find_king(Player.GOTE)
         assert sente_king == 8 * COLS + 4
         assert gote_king == 0 * COLS + 4
 
-    def test_count_pawns_in_column(self) -> None:
-        board = Board()
+    def test_count_pawns_in_column(self, initial_board: Board) -> None:
         # Column 4 has one sente pawn (row 6) and one gote pawn (row 2)
-        assert board.count_pawns_in_column(Player.SENTE, 4) == 1
+        assert initial_board.count_pawns_in_column(Player.SENTE, 4) == 1
+        assert initial_board.count_pawns_in_column(Player.GOTE, 4) == 1
+
+    def test_count_pawns_ignores_promoted(self) -> None:
+        board = Board().set_piece(6, 4, Piece(PieceType.PRO_PAWN, Player.SENTE))
+        assert board.count_pawns_in_column(Player.SENTE, 4) == 0
         assert board.count_pawns_in_column(Player.GOTE, 4) == 1
+
+
+class TestZobrist:
+    def test_incremental_matches_full_hash(self) -> None:
+        board = (
+            Board()
+            .set_piece(6, 2, None)
+            .set_piece(5, 2, Piece(PieceType.PAWN, Player.SENTE))
+            .add_to_hand(Player.SENTE, PieceType.DRAGON)
+            .add_to_hand(Player.SENTE, PieceType.PAWN)
+        )
+        fresh = Board(squares=board.squares, hands=board.hands)
+        assert board.zobrist == fresh.zobrist
+
+    def test_different_positions_differ(self) -> None:
+        board = Board()
+        assert board.set_piece(4, 4, Piece(PieceType.PAWN, Player.SENTE)).zobrist != board.zobrist
+
+
+class TestPieceCodes:
+    def test_codes_follow_squares(self) -> None:
+        board = Board().set_piece(6, 4, None).set_piece(4, 4, Piece(PieceType.DRAGON, Player.GOTE))
+        fresh = Board(squares=board.squares, hands=board.hands)
+        assert board.codes == fresh.codes
+        assert board.codes[6 * COLS + 4] == EMPTY_CODE
+        assert board.codes[4 * COLS + 4] == piece_code(PieceType.DRAGON, Player.GOTE)
+
+    def test_pieces_table_matches_codes(self) -> None:
+        assert PIECES[EMPTY_CODE] is None
+        for pt in PieceType:
+            for player in Player:
+                assert PIECES[piece_code(pt, player)] == Piece(pt, player)
+                assert OWNED_PIECES[pt * 2 + player] is PIECES[piece_code(pt, player)]
+
+    def test_find_king_missing(self) -> None:
+        board = Board().set_piece(8, 4, None)
+        assert board.find_king(Player.SENTE) is None
@@ -36,6 +36,7 @@ from shogi_ai.game.full_shogi.moves import (
     encode_board_move,
     encode_drop_move,
     legal_moves,
+    move_squares,
 )
 from shogi_ai.game.full_shogi.state import FullShogiState
 from shogi_ai.game.full_shogi.types import (
@@ -72,20 +73,86 @@ def _make_board(
     )
 
 
-def _moves_from(board: Board, player: Player, from_row: int, from_col: int) -> list[dict]:
-    """Return decoded legal moves that originate from (from_row, from_col)."""
-    all_moves = legal_moves(board, player)
-    result = []
-    for move in all_moves:
-        d = decode_move(move)
-        if d["type"] == "board" and d["from"] == (from_row, from_col):
-            result.append(d)
-    return result
+# 両玉だけを置いた盤面（多くのテストの出発点。Board はイミュータブルなので共有する）
+_KINGS_ONLY = _make_board(
+    [
+        (8, 4, PieceType.KING, Player.SENTE),
+        (0, 4, PieceType.KING, Player.GOTE),
+    ]
+)
 
 
-def _destination_set(moves: list[dict]) -> set[tuple[int, int]]:
-    """Extract the set of (to_row, to_col) from a list of decoded moves."""
-    return {d["to"] for d in moves}
+# 期待される移動先（テストごとに組み直さないようモジュール定数にしておく）
+# 先手の駒を中央 (4,4) に置いたときの1マス移動先
+_SILVER_FROM_CENTER = frozenset({(3, 3), (3, 4), (3, 5), (5, 3), (5, 5)})
+_GOLD_FROM_CENTER = frozenset({(3, 3), (3, 4), (3, 5), (4, 3), (4, 5), (5, 4)})
+_KING_FROM_CENTER = frozenset({(3, 3), (3, 4), (3, 5), (4, 3), (4, 5), (5, 3), (5, 4), (5, 5)})
+# 先手の桂馬 (5,4)・後手の桂馬 (3,4) の跳び先
+_SENTE_KNIGHT_FROM_5_4 = frozenset({(3, 3), (3, 5)})
+_GOTE_KNIGHT_FROM_3_4 = frozenset({(5, 3), (5, 5)})
+# 先手の香車 (7,0) が開いた筋で進める先
+_LANCE_FROM_7_0 = frozenset((r, 0) for r in range(7))
+
+
+def _kings_plus(
+    pieces: list[tuple[int, int, PieceType, Player]],
+    sente_hand: tuple[PieceType, ...] = (),
+    gote_hand: tuple[PieceType, ...] = (),
+) -> Board:
+    """Return the shared kings-only board with extra pieces and hands added.
+
+    先手玉 (8,4)・後手玉 (0,4) だけの共有盤面に、指定の駒を set_piece で置き、
+    持ち駒を add_to_hand で加えた盤面を返す。81マスを組み直さず、差分更新だけで作る。
+    """
+    board = _KINGS_ONLY
+    for row, col, pt, owner in pieces:
+        board = board.set_piece(row, col, Piece(pt, owner))
+    for pt in sente_hand:
+        board = board.add_to_hand(Player.SENTE, pt)
+    for pt in gote_hand:
+        board = board.add_to_hand(Player.GOTE, pt)
+    return board
+
+
+def _moves_from(board: Board, player: Player, from_row: int, from_col: int) -> list[dict]:
+    """Return decoded legal moves that originate from (from_row, from_col)."""
+    # 移動元は move_squares で判定し、該当する手だけをデコードする（打ち手の移動元は None）
+    from_idx = from_row * COLS + from_col
+    return [
+        decode_move(move)
+        for move in legal_moves(board, player)
+        if move_squares(move)[0] == from_idx
+    ]
+
+
+def _destinations_from(
+    board: Board, player: Player, from_row: int, from_col: int
+) -> set[tuple[int, int]]:
+    """Return the set of (to_row, to_col) reachable from (from_row, from_col)."""
+    # 移動先だけが必要なテストでは手をデコードせず、move_squares の添字から直接求める
+    from_idx = from_row * COLS + from_col
+    return {
+        divmod(to_idx, COLS)
+        for frm, to_idx in map(move_squares, legal_moves(board, player))
+        if frm == from_idx
+    }
+
+
+def _drop_squares(board: Board, player: Player, piece_type: PieceType) -> set[tuple[int, int]]:
+    """Return the set of (row, col) where piece_type can legally be dropped."""
+    # 打ち手は駒種ごとに連続した番号なので、基準値との差がそのまま打つマスになる
+    base = encode_drop_move(piece_type, 0)
+    return {
+        divmod(move - base, COLS)
+        for move in legal_moves(board, player)
+        if 0 <= move - base < NUM_SQUARES
+    }
+
+
+def _moves_leaving_check(board: Board, player: Player, moves: list[int]) -> list[int]:
+    """Return the moves after which player's king is still in check."""
+    # 1手ずつ assert せずに違反した手をまとめて返し、失敗時だけデコードして表示する
+    return [m for m in moves if _is_in_check(apply_move(board, player, m), player)]
 
 
 # ===========================================================================
@@ -98,36 +165,28 @@ class TestPawnMovement:
 
     def test_sente_pawn_moves_one_forward(self) -> None:
         """Sente pawn at (5, 4) must move to (4, 4) only."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.PAWN, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 5, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 5, 4)
         assert dests == {(4, 4)}, f"Pawn should only reach (4,4), got {dests}"
 
     def test_sente_pawn_cannot_move_backward(self) -> None:
         """Pawn cannot move to (6, 4) — backward for Sente."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.PAWN, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 5, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 5, 4)
         assert (6, 4) not in dests
 
     def test_pawn_blocked_by_own_piece(self) -> None:
         """Pawn cannot move forward if own piece is blocking."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.PAWN, Player.SENTE),
                 (4, 4, PieceType.GOLD, Player.SENTE),  # Blocking
             ]
@@ -141,50 +200,40 @@ class TestLanceMovement:
 
     def test_lance_slides_forward_on_open_file(self) -> None:
         """Sente lance at (7, 0) must reach rows 6, 5, 4, 3, 2, 1, 0 on col 0."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (7, 0, PieceType.LANCE, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 7, 0)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 7, 0)
         # All forward squares on col 0 except row 7 itself
-        expected_base = {(r, 0) for r in range(0, 7)}
         # Row 0 forces promotion, so only the promote=True variant appears;
         # rows 1..2 are in promotion zone so both variants appear.
         # The destination set still includes (0, 0) regardless of promotion flag.
-        assert expected_base == dests, f"Lance expected all of col 0 rows 0-6, got {dests}"
+        assert dests == _LANCE_FROM_7_0, f"Lance expected all of col 0 rows 0-6, got {dests}"
 
     def test_lance_blocked_by_own_piece(self) -> None:
         """Lance cannot slide past own Gold at row 5 on col 0."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (7, 0, PieceType.LANCE, Player.SENTE),
                 (5, 0, PieceType.GOLD, Player.SENTE),  # blocker
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 7, 0)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 7, 0)
         assert (6, 0) in dests  # one square before blocker is reachable
         assert (5, 0) not in dests  # blocker square is own piece – not reachable
         assert (4, 0) not in dests  # beyond blocker – not reachable
 
     def test_lance_can_capture_forward_enemy(self) -> None:
         """Lance stops after capturing enemy piece; cannot go further."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (7, 0, PieceType.LANCE, Player.SENTE),
                 (4, 0, PieceType.PAWN, Player.GOTE),  # enemy to capture
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 7, 0)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 7, 0)
         assert (4, 0) in dests  # can capture
         assert (3, 0) not in dests  # cannot go past enemy
 
@@ -194,30 +243,24 @@ class TestKnightMovement:
 
     def test_knight_reaches_exactly_two_squares(self) -> None:
         """Sente knight at (5, 4) must reach only (3, 3) and (3, 5)."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.KNIGHT, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 5, 4)
-        dests = _destination_set(moves)
-        assert dests == {(3, 3), (3, 5)}, (
+        dests = _destinations_from(board, Player.SENTE, 5, 4)
+        assert dests == _SENTE_KNIGHT_FROM_5_4, (
             f"Knight from (5,4) must reach exactly {{(3,3),(3,5)}}, got {dests}"
         )
 
     def test_knight_cannot_move_sideways_or_backward(self) -> None:
         """Knight may not land on squares like (5,3), (6,4), (5,5)."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.KNIGHT, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 5, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 5, 4)
         forbidden = {(5, 3), (5, 5), (6, 4), (7, 4), (4, 4)}
         assert dests.isdisjoint(forbidden), (
             f"Knight landed on forbidden square(s): {dests & forbidden}"
@@ -225,16 +268,13 @@ class TestKnightMovement:
 
     def test_knight_jumps_over_intervening_piece(self) -> None:
         """Knight ignores pieces between start and landing square."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.KNIGHT, Player.SENTE),
                 (4, 4, PieceType.GOLD, Player.SENTE),  # piece in the path – irrelevant
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 5, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 5, 4)
         # Both knight destinations remain reachable despite piece on (4,4)
         assert (3, 3) in dests
         assert (3, 5) in dests
@@ -245,29 +285,24 @@ class TestSilverMovement:
 
     def test_silver_has_five_directions(self) -> None:
         """Sente silver at (4, 4) in open center must have exactly 5 destinations."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.SILVER, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
-        expected = {(3, 3), (3, 4), (3, 5), (5, 3), (5, 5)}
-        assert dests == expected, f"Silver expected {expected}, got {dests}"
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
+        assert dests == _SILVER_FROM_CENTER, (
+            f"Silver expected {sorted(_SILVER_FROM_CENTER)}, got {dests}"
+        )
 
     def test_silver_cannot_move_sideways_or_straight_backward(self) -> None:
         """Silver must NOT reach left/right (4,3)/(4,5) or straight back (5,4)."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.SILVER, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         assert (4, 3) not in dests, "Silver cannot move sideways left"
         assert (4, 5) not in dests, "Silver cannot move sideways right"
         assert (5, 4) not in dests, "Silver cannot move straight backward"
@@ -278,29 +313,24 @@ class TestGoldMovement:
 
     def test_gold_has_six_directions(self) -> None:
         """Sente gold at (4, 4) in open center must have exactly 6 destinations."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.GOLD, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
-        expected = {(3, 3), (3, 4), (3, 5), (4, 3), (4, 5), (5, 4)}
-        assert dests == expected, f"Gold expected {expected}, got {dests}"
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
+        assert dests == _GOLD_FROM_CENTER, (
+            f"Gold expected {sorted(_GOLD_FROM_CENTER)}, got {dests}"
+        )
 
     def test_gold_cannot_move_to_backward_diagonals(self) -> None:
         """Gold cannot go to (5, 3) or (5, 5) — the backward diagonals."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.GOLD, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         assert (5, 3) not in dests, "Gold cannot move to backward-left diagonal"
         assert (5, 5) not in dests, "Gold cannot move to backward-right diagonal"
 
@@ -310,15 +340,12 @@ class TestBishopMovement:
 
     def test_bishop_slides_all_four_diagonals(self) -> None:
         """Bishop at (4, 4) on empty board must reach all diagonal squares."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.BISHOP, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         # Each diagonal from (4,4): 4 directions, distance up to board edge
         # NW: (3,3),(2,2),(1,1),(0,0)  NE: (3,5),(2,6),(1,7),(0,8)
         # SW: (5,3),(6,2),(7,1),(8,0)  SE: (5,5),(6,6),(7,7)  — (8,8) blocked later
@@ -336,16 +363,13 @@ class TestBishopMovement:
 
     def test_bishop_blocked_by_friendly_piece(self) -> None:
         """Bishop cannot slide past or onto own piece."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.BISHOP, Player.SENTE),
                 (2, 2, PieceType.GOLD, Player.SENTE),  # blocks NW diagonal
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         assert (3, 3) in dests  # still reachable
         assert (2, 2) not in dests  # own piece — blocked
         assert (1, 1) not in dests  # beyond own piece — blocked
@@ -353,16 +377,13 @@ class TestBishopMovement:
 
     def test_bishop_captures_and_stops(self) -> None:
         """Bishop captures enemy but cannot continue past it."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.BISHOP, Player.SENTE),
                 (2, 2, PieceType.PAWN, Player.GOTE),  # enemy on NW diagonal
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         assert (3, 3) in dests  # before enemy — reachable
         assert (2, 2) in dests  # enemy square — capture
         assert (1, 1) not in dests  # beyond capture — blocked
@@ -373,15 +394,12 @@ class TestRookMovement:
 
     def test_rook_slides_four_orthogonal_directions(self) -> None:
         """Rook at (4, 4) on otherwise empty board reaches all orthogonal squares."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.ROOK, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         # King at (8,4) blocks the south (col 4) after row 8, but (8,4) is
         # occupied by own King so rook can't land there, stops at (7,4).
         for r in range(0, 4):
@@ -400,16 +418,13 @@ class TestRookMovement:
 
     def test_rook_blocked_by_own_piece_in_path(self) -> None:
         """Rook stops before own Silver at (4, 2)."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.ROOK, Player.SENTE),
                 (4, 2, PieceType.SILVER, Player.SENTE),  # blocker in same row
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         assert (4, 3) in dests  # one before blocker
         assert (4, 2) not in dests  # own piece
         assert (4, 1) not in dests  # beyond
@@ -430,28 +445,15 @@ class TestKingMovement:
         # Note: we do NOT filter for check here — we want raw move generation.
         # Use legal_moves which will filter, but in this isolated position no
         # enemy pieces threaten king so all 8 moves should be legal.
-        all_legal = legal_moves(board, Player.SENTE)
-        decoded = [decode_move(m) for m in all_legal if decode_move(m)["type"] == "board"]
-        king_dests = {d["to"] for d in decoded if d["from"] == (4, 4)}
-        expected = {(3, 3), (3, 4), (3, 5), (4, 3), (4, 5), (5, 3), (5, 4), (5, 5)}
-        assert king_dests == expected, f"King expected {expected}, got {king_dests}"
+        king_dests = _destinations_from(board, Player.SENTE, 4, 4)
+        assert king_dests == _KING_FROM_CENTER, (
+            f"King expected {sorted(_KING_FROM_CENTER)}, got {king_dests}"
+        )
 
     def test_king_cannot_move_into_check(self) -> None:
         """King must not move to a square attacked by enemy rook."""
-        # Gote rook at (3, 0) covers all of row 3 and col 0.
-        # Sente king at (5, 4): if it tries to move to (4, 4) that is fine,
-        # but (4, 0) would be covered by the rook... let's set up a cleaner case.
-        # Gote rook on col 4 row 0 covers all of col 4.
-        # Sente king cannot step to (4, 4) since col 4 is covered.
-        board = _make_board(
-            [
-                (5, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-                (0, 0, PieceType.ROOK, Player.GOTE),  # covers col 0 and row 0 — no threat to (4,x)
-                (2, 8, PieceType.ROOK, Player.GOTE),  # covers col 8 and row 2
-            ]
-        )
-        # Place Gote rook on col 4 (same col as king), one square above king
+        # Gote rook on col 4 (same col as king) covers (4, 4), so the
+        # Sente king cannot step there.
         board = _make_board(
             [
                 (5, 4, PieceType.KING, Player.SENTE),
@@ -459,9 +461,7 @@ class TestKingMovement:
                 (3, 4, PieceType.ROOK, Player.GOTE),  # controls col 4 from row 3 upward
             ]
         )
-        all_legal = legal_moves(board, Player.SENTE)
-        decoded = [decode_move(m) for m in all_legal]
-        king_dests = {d["to"] for d in decoded if d.get("from") == (5, 4)}
+        king_dests = _destinations_from(board, Player.SENTE, 5, 4)
         # (4, 4) is covered by rook at (3, 4) via col 4
         assert (4, 4) not in king_dests, "King must not walk into rook's line of attack"
 
@@ -471,15 +471,12 @@ class TestHorseMovement:
 
     def test_horse_has_bishop_diagonals_plus_orthogonal_steps(self) -> None:
         """Horse at (4, 4) reaches diagonals AND adjacent orthogonal squares."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.HORSE, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         # Standard bishop diagonals from (4,4) — expect NW,NE,SW,SE squares
         assert (3, 3) in dests, "Horse: NW diagonal"
         assert (3, 5) in dests, "Horse: NE diagonal"
@@ -506,15 +503,12 @@ class TestDragonMovement:
         then be in a terminal / king-captured state). The test verifies the slide
         reaches the enemy King at (0,4) rather than asserting it is blocked.
         """
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.DRAGON, Player.SENTE),
             ]
         )
-        moves = _moves_from(board, Player.SENTE, 4, 4)
-        dests = _destination_set(moves)
+        dests = _destinations_from(board, Player.SENTE, 4, 4)
         # Rook slides West along row 4
         assert (4, 0) in dests, "Dragon: rook slide West"
         # Rook slides East along row 4
@@ -656,11 +650,8 @@ class TestLegalMoveFiltering:
         )
         moves = legal_moves(board, Player.SENTE)
         assert len(moves) > 0, "Should have at least one legal escape move"
-        for move in moves:
-            next_board = apply_move(board, Player.SENTE, move)
-            assert not _is_in_check(next_board, Player.SENTE), (
-                f"Move {decode_move(move)} leaves king in check"
-            )
+        unsafe = _moves_leaving_check(board, Player.SENTE, moves)
+        assert not unsafe, f"Moves {[decode_move(m) for m in unsafe]} leave king in check"
 
     def test_checkmate_position_has_no_legal_moves(self) -> None:
         """A position where the king is checkmated must have 0 legal moves.
@@ -701,9 +692,7 @@ class TestLegalMoveFiltering:
         # King must have at least one legal escape
         assert len(moves) > 0, "King must have at least one escape from pawn check"
         # All legal moves must resolve check
-        for move in moves:
-            next_board = apply_move(board, Player.SENTE, move)
-            assert not _is_in_check(next_board, Player.SENTE)
+        assert not _moves_leaving_check(board, Player.SENTE, moves)
 
 
 # ===========================================================================
@@ -716,10 +705,8 @@ class TestPromotionRules:
 
     def test_pawn_promotion_optional_entering_zone(self) -> None:
         """Pawn moving from row 3 to row 2 (SENTE zone) gets both options."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (3, 2, PieceType.PAWN, Player.SENTE),  # outside zone
             ]
         )
@@ -732,10 +719,8 @@ class TestPromotionRules:
 
     def test_pawn_must_promote_on_final_rank(self) -> None:
         """Pawn on row 1 moving to row 0 must promote — no non-promotion option."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (1, 2, PieceType.PAWN, Player.SENTE),
             ]
         )
@@ -779,11 +764,9 @@ class TestPromotionRules:
         """Capturing a promoted piece (Dragon) adds it to hand as Rook (base form)."""
         # Place Sente Dragon at (4, 4), Gote King nearby, Sente King safe.
         # Gote has a gold that can capture the dragon.
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
                 (4, 4, PieceType.DRAGON, Player.SENTE),  # promoted rook
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 4, PieceType.GOLD, Player.GOTE),  # can capture dragon at (4,4)
             ]
         )
@@ -798,10 +781,8 @@ class TestPromotionRules:
 
     def test_promotion_converts_piece_type_on_board(self) -> None:
         """After promotion, piece type on board is the promoted type."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (3, 2, PieceType.PAWN, Player.SENTE),
             ]
         )
@@ -826,60 +807,41 @@ class TestNifuRule:
 
     def test_cannot_drop_pawn_in_column_with_existing_own_pawn(self) -> None:
         """Nifu: dropping Sente pawn in col 3 where Sente already has a pawn."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 3, PieceType.PAWN, Player.SENTE),  # existing sente pawn in col 3
             ],
             sente_hand=(PieceType.PAWN,),
         )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.PAWN:
-                _, drop_col = d["to"]
-                assert drop_col != 3, (
-                    "Nifu violation: cannot drop pawn in col 3 where own pawn exists"
-                )
+        drop_cols = {col for _, col in _drop_squares(board, Player.SENTE, PieceType.PAWN)}
+        assert 3 not in drop_cols, (
+            "Nifu violation: cannot drop pawn in col 3 where own pawn exists"
+        )
 
     def test_can_drop_pawn_in_other_columns(self) -> None:
         """Can drop pawn in columns that do NOT have own pawn."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (5, 3, PieceType.PAWN, Player.SENTE),  # pawn only in col 3
             ],
             sente_hand=(PieceType.PAWN,),
         )
-        moves = legal_moves(board, Player.SENTE)
-        pawn_drop_cols = set()
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.PAWN:
-                _, drop_col = d["to"]
-                pawn_drop_cols.add(drop_col)
+        pawn_drop_cols = {col for _, col in _drop_squares(board, Player.SENTE, PieceType.PAWN)}
         # Can drop in all other columns (0,1,2,4,5,6,7,8)
-        assert 3 not in pawn_drop_cols, "Col 3 still forbidden"
-        assert len(pawn_drop_cols) >= 1, "Should be able to drop in at least one other column"
+        assert pawn_drop_cols == set(range(COLS)) - {3}, (
+            f"Pawn drops allowed in every column except 3, got {sorted(pawn_drop_cols)}"
+        )
 
     def test_nifu_for_gote(self) -> None:
         """Nifu applies to Gote as well: cannot drop in col with existing Gote pawn."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (3, 6, PieceType.PAWN, Player.GOTE),  # existing gote pawn in col 6
             ],
             gote_hand=(PieceType.PAWN,),
         )
-        moves = legal_moves(board, Player.GOTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.PAWN:
-                _, drop_col = d["to"]
-                assert drop_col != 6, "Gote nifu: cannot drop pawn in col 6 where Gote pawn exists"
+        drop_cols = {col for _, col in _drop_squares(board, Player.GOTE, PieceType.PAWN)}
+        assert 6 not in drop_cols, "Gote nifu: cannot drop pawn in col 6 where Gote pawn exists"
 
 
 class TestDeadPieceRestriction:
@@ -887,71 +849,31 @@ class TestDeadPieceRestriction:
 
     def test_cannot_drop_pawn_on_row_0_for_sente(self) -> None:
         """Sente cannot drop pawn on row 0 (no further moves)."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-            ],
-            sente_hand=(PieceType.PAWN,),
-        )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.PAWN:
-                drop_row, _ = d["to"]
-                assert drop_row != 0, "Cannot drop pawn on row 0 for Sente"
+        board = _kings_plus([], sente_hand=(PieceType.PAWN,))
+        for drop_row, _ in _drop_squares(board, Player.SENTE, PieceType.PAWN):
+            assert drop_row != 0, "Cannot drop pawn on row 0 for Sente"
 
     def test_cannot_drop_lance_on_row_0_for_sente(self) -> None:
         """Sente cannot drop lance on row 0 (no further forward moves)."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-            ],
-            sente_hand=(PieceType.LANCE,),
-        )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.LANCE:
-                drop_row, _ = d["to"]
-                assert drop_row != 0, "Cannot drop lance on row 0 for Sente"
+        board = _kings_plus([], sente_hand=(PieceType.LANCE,))
+        for drop_row, _ in _drop_squares(board, Player.SENTE, PieceType.LANCE):
+            assert drop_row != 0, "Cannot drop lance on row 0 for Sente"
 
     def test_cannot_drop_knight_on_rows_0_or_1_for_sente(self) -> None:
         """Sente cannot drop knight on rows 0 or 1 (would have no legal next move)."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-            ],
-            sente_hand=(PieceType.KNIGHT,),
-        )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.KNIGHT:
-                drop_row, _ = d["to"]
-                assert drop_row > 1, (
-                    f"Cannot drop knight on row {drop_row} (rows 0-1 forbidden for Sente)"
-                )
+        board = _kings_plus([], sente_hand=(PieceType.KNIGHT,))
+        for drop_row, _ in _drop_squares(board, Player.SENTE, PieceType.KNIGHT):
+            assert drop_row > 1, (
+                f"Cannot drop knight on row {drop_row} (rows 0-1 forbidden for Sente)"
+            )
 
     def test_cannot_drop_knight_on_rows_7_or_8_for_gote(self) -> None:
         """Gote cannot drop knight on rows 7 or 8."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-            ],
-            gote_hand=(PieceType.KNIGHT,),
-        )
-        moves = legal_moves(board, Player.GOTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.KNIGHT:
-                drop_row, _ = d["to"]
-                assert drop_row < 7, (
-                    f"Cannot drop knight on row {drop_row} (rows 7-8 forbidden for Gote)"
-                )
+        board = _kings_plus([], gote_hand=(PieceType.KNIGHT,))
+        for drop_row, _ in _drop_squares(board, Player.GOTE, PieceType.KNIGHT):
+            assert drop_row < 7, (
+                f"Cannot drop knight on row {drop_row} (rows 7-8 forbidden for Gote)"
+            )
 
 
 class TestUchifuzumeRule:
@@ -988,16 +910,11 @@ class TestUchifuzumeRule:
             ],
             sente_hand=(PieceType.PAWN,),
         )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop" and d["piece_type"] == PieceType.PAWN:
-                drop_to = d["to"]
-                # When Uchifuzume is enforced, (1,8) must NOT be a legal pawn drop
-                assert drop_to != (1, 8), (
-                    "Uchifuzume violation: drop pawn at (1,8) delivers checkmate by pawn "
-                    "which is forbidden by the rules of shogi"
-                )
+        # When Uchifuzume is enforced, (1,8) must NOT be a legal pawn drop
+        assert (1, 8) not in _drop_squares(board, Player.SENTE, PieceType.PAWN), (
+            "Uchifuzume violation: drop pawn at (1,8) delivers checkmate by pawn "
+            "which is forbidden by the rules of shogi"
+        )
 
 
 # ===========================================================================
@@ -1005,25 +922,47 @@ class TestUchifuzumeRule:
 # ===========================================================================
 
 
+_TRAJECTORY_MAX_MOVES = 600  # Generous cap; typical random shogi game << 600 moves
+_REPETITION_LIMIT = 4  # 千日手: 同じ局面（盤面・持ち駒・手番）が4回現れたら打ち切る
+
+
+@pytest.fixture(scope="module")
+def random_trajectory() -> list[FullShogiState]:
+    """Every state of one seeded random-vs-random game, initial state first.
+
+    シード固定のランダム対局1局分の局面列（初期局面から終局・千日手・手数上限まで）。
+    通しテストはこの1局を共有し、それぞれの不変条件だけを確かめる。
+    ループする対局は手数上限まで回さず、千日手になった時点で引き分けとして打ち切る。
+    """
+    rng = random.Random(0)  # 対局を再現できるようシードを固定
+    state = FullShogiState()
+    trajectory = [state]
+    # Board のハッシュは Zobrist 値なので、(盤面, 手番) をそのまま局面のキーに使える
+    seen = {(state.board, state.current_player): 1}
+    while not state.is_terminal and len(trajectory) <= _TRAJECTORY_MAX_MOVES:
+        state = state.apply_move(random_move(state, rng))
+        trajectory.append(state)
+        key = (state.board, state.current_player)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= _REPETITION_LIMIT:
+            break
+    return trajectory
+
+
 class TestFullGame:
     """ゲーム通しテスト: ランダム同士で対局し終局まで正常に進行すること。"""
 
-    def test_random_vs_random_game_completes_with_winner(self) -> None:
+    def test_random_vs_random_game_completes_with_winner(
+        self, random_trajectory: list[FullShogiState]
+    ) -> None:
         """Play a full game with both players choosing random legal moves.
 
-        A move-count limit prevents infinite loops in edge cases.
-        The game must either terminate normally (winner declared) or
-        reach the move limit (treated as a draw for test purposes).
+        Repetition detection and a move-count limit prevent infinite loops.
+        The game must either terminate normally (winner declared) or stop on
+        repetition / the move limit (treated as a draw for test purposes).
         No exception must be raised at any point.
         """
-        MAX_MOVES = 600  # Generous cap; typical random shogi game << 600 moves
-        state = FullShogiState()
-        move_count = 0
-
-        while not state.is_terminal and move_count < MAX_MOVES:
-            move = random_move(state)
-            state = state.apply_move(move)
-            move_count += 1
+        state = random_trajectory[-1]
 
         # Game ended: either terminal or hit cap
         if state.is_terminal:
@@ -1032,13 +971,15 @@ class TestFullGame:
                 f"Winner must be 0 (Sente), 1 (Gote), or None (draw), got {winner}"
             )
         else:
-            # Move cap reached — not a test failure, just record it
+            # Repetition draw or move cap reached — not a test failure, just record it
             pytest.skip(
-                f"Game reached {MAX_MOVES} move cap without terminating — "
-                "this is rare with random play but not an error"
+                f"Game stopped by repetition or the {_TRAJECTORY_MAX_MOVES} move cap "
+                "without terminating — this is rare with random play but not an error"
             )
 
-    def test_random_game_kings_never_captured_mid_game(self) -> None:
+    def test_random_game_kings_never_captured_mid_game(
+        self, random_trajectory: list[FullShogiState]
+    ) -> None:
         """During random play, legal-move filter must prevent king capture.
 
         Because legal_moves filters out moves that leave king in check,
@@ -1046,11 +987,7 @@ class TestFullGame:
         We verify that both kings remain on the board until the game ends
         normally via checkmate (no-legal-moves terminal condition).
         """
-        MAX_MOVES = 300
-        state = FullShogiState()
-        move_count = 0
-
-        while not state.is_terminal and move_count < MAX_MOVES:
+        for move_count, state in enumerate(random_trajectory):
             # Both kings must still be on the board
             assert state.board.find_king(Player.SENTE) is not None, (
                 f"Sente king disappeared at move {move_count}"
@@ -1058,39 +995,32 @@ class TestFullGame:
             assert state.board.find_king(Player.GOTE) is not None, (
                 f"Gote king disappeared at move {move_count}"
             )
-            move = random_move(state)
-            state = state.apply_move(move)
-            move_count += 1
 
-    def test_state_current_player_always_valid(self) -> None:
+    def test_state_current_player_always_valid(
+        self, random_trajectory: list[FullShogiState]
+    ) -> None:
         """current_player must be 0 or 1 on every state throughout a game."""
-        MAX_MOVES = 100
-        state = FullShogiState()
-        for _ in range(MAX_MOVES):
-            if state.is_terminal:
-                break
-            assert state.current_player in (0, 1)
-            move = random_move(state)
-            state = state.apply_move(move)
+        assert all(state.current_player in (0, 1) for state in random_trajectory)
 
     @pytest.mark.slow
-    def test_three_random_games_all_terminate(self) -> None:
-        """Run three independent random games; each must terminate or hit 600 moves."""
+    @pytest.mark.parametrize("seed", [42, 43, 44])
+    def test_random_games_all_terminate(self, seed: int) -> None:
+        """Run independent random games; each must terminate or hit 600 moves."""
+        # 1局ずつ別のテストにして、シードごとに独立して実行・並列化できるようにする
         MAX_MOVES = 600
-        rng = random.Random(42)
+        rng = random.Random(seed)
 
-        for game_num in range(3):
-            state = FullShogiState()
-            moves_played = 0
-            while not state.is_terminal and moves_played < MAX_MOVES:
-                moves = state.legal_moves()
-                move = rng.choice(moves)
-                state = state.apply_move(move)
-                moves_played += 1
+        state = FullShogiState()
+        moves_played = 0
+        while not state.is_terminal and moves_played < MAX_MOVES:
+            moves = state.legal_moves()
+            move = rng.choice(moves)
+            state = state.apply_move(move)
+            moves_played += 1
 
-            if state.is_terminal:
-                winner = state.winner
-                assert winner in (0, 1, None), f"Game {game_num}: unexpected winner value {winner}"
+        if state.is_terminal:
+            winner = state.winner
+            assert winner in (0, 1, None), f"Seed {seed}: unexpected winner value {winner}"
 
 
 # ===========================================================================
@@ -1103,13 +1033,7 @@ class TestDropMoveSemantics:
 
     def test_drop_places_piece_on_board(self) -> None:
         """After a drop move, the piece appears on the board and leaves the hand."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-            ],
-            sente_hand=(PieceType.GOLD,),
-        )
+        board = _kings_plus([], sente_hand=(PieceType.GOLD,))
         # Drop Gold at (4, 4)
         drop_move = encode_drop_move(PieceType.GOLD, 4 * 9 + 4)
         new_board = apply_move(board, Player.SENTE, drop_move)
@@ -1121,65 +1045,41 @@ class TestDropMoveSemantics:
 
     def test_cannot_drop_on_occupied_square(self) -> None:
         """Drop moves must not target occupied squares."""
-        board = _make_board(
+        board = _kings_plus(
             [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
                 (4, 4, PieceType.PAWN, Player.GOTE),  # occupied
             ],
             sente_hand=(PieceType.GOLD,),
         )
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            d = decode_move(move)
-            if d["type"] == "drop":
-                assert d["to"] != (4, 4), "Cannot drop on occupied square (4,4)"
+        squares = map(move_squares, legal_moves(board, Player.SENTE))
+        assert (None, 4 * COLS + 4) not in squares, "Cannot drop on occupied square (4,4)"
 
 
 class TestGoteOrientationCorrectness:
     """後手の方向反転が正しく実装されているかを確認。"""
 
-    def test_gote_pawn_moves_downward(self) -> None:
-        """Gote pawn at (3, 4) must move to (4, 4) — row increases for Gote."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-                (3, 4, PieceType.PAWN, Player.GOTE),
-            ]
-        )
-        moves = _moves_from(board, Player.GOTE, 3, 4)
-        dests = _destination_set(moves)
-        assert (4, 4) in dests, "Gote pawn must move to (4,4) — forward for Gote"
-        assert (2, 4) not in dests, "Gote pawn cannot move backward to (2,4)"
-
-    def test_gote_lance_slides_downward(self) -> None:
-        """Gote lance at (2, 0) must slide toward row 8 (increasing row)."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-                (2, 0, PieceType.LANCE, Player.GOTE),
-            ]
-        )
-        moves = _moves_from(board, Player.GOTE, 2, 0)
-        dests = _destination_set(moves)
-        assert (3, 0) in dests, "Gote lance must reach (3,0)"
-        assert (7, 0) in dests, "Gote lance must reach (7,0)"
-        assert (1, 0) not in dests, "Gote lance cannot go backward to (1,0)"
-        assert (0, 0) not in dests, "Gote lance cannot go backward to (0,0)"
-
-    def test_gote_knight_moves_downward(self) -> None:
-        """Gote knight at (3, 4) lands on (5, 3) and (5, 5) — forward for Gote."""
-        board = _make_board(
-            [
-                (8, 4, PieceType.KING, Player.SENTE),
-                (0, 4, PieceType.KING, Player.GOTE),
-                (3, 4, PieceType.KNIGHT, Player.GOTE),
-            ]
-        )
-        moves = _moves_from(board, Player.GOTE, 3, 4)
-        dests = _destination_set(moves)
-        assert dests == {(5, 3), (5, 5)}, (
-            f"Gote knight from (3,4) must land on (5,3),(5,5), got {dests}"
+    @pytest.mark.parametrize(
+        ("piece_type", "src", "must_contain", "must_exclude"),
+        [
+            # 歩: (3,4) から前（下）の (4,4) へ。後ろの (2,4) へは行けない
+            (PieceType.PAWN, (3, 4), {(4, 4)}, {(2, 4)}),
+            # 香車: (2,0) から下へ盤端近くまで滑る。上へは行けない
+            (PieceType.LANCE, (2, 0), {(3, 0), (7, 0)}, {(1, 0), (0, 0)}),
+            # 桂馬: (3,4) から下向きに (5,3)/(5,5) へ跳ぶ。先手向きの (1,3)/(1,5) へは跳べない
+            (PieceType.KNIGHT, (3, 4), _GOTE_KNIGHT_FROM_3_4, {(1, 3), (1, 5)}),
+        ],
+    )
+    def test_gote_piece_moves_downward(
+        self,
+        piece_type: PieceType,
+        src: tuple[int, int],
+        must_contain: set[tuple[int, int]],
+        must_exclude: set[tuple[int, int]],
+    ) -> None:
+        """Gote pieces move toward increasing rows (row 8 is forward for Gote)."""
+        board = _kings_plus([(*src, piece_type, Player.GOTE)])
+        dests = _destinations_from(board, Player.GOTE, *src)
+        assert must_contain <= dests, f"Gote {piece_type.name} must reach {must_contain}"
+        assert dests.isdisjoint(must_exclude), (
+            f"Gote {piece_type.name} cannot move backward to {must_exclude & dests}"
         )
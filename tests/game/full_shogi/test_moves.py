@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import cache
+
 from shogi_ai.game.full_shogi.board import Board, Piece
 from shogi_ai.game.full_shogi.moves import (
     ACTION_SPACE,
@@ -11,14 +13,33 @@ from shogi_ai.game.full_shogi.moves import (
     encode_board_move,
     encode_drop_move,
     legal_moves,
+    move_squares,
 )
 from shogi_ai.game.full_shogi.types import (
     COLS,
     NUM_SQUARES,
+    ROWS,
     PieceType,
     Player,
 )
 
+# 後手玉 (0,4)・先手玉 (8,4) だけを置いたマス目。各テストはこれを写して駒を足す
+_KINGS_ONLY_LIST: list[Piece | None] = [None] * NUM_SQUARES
+_KINGS_ONLY_LIST[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
+_KINGS_ONLY_LIST[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+_KINGS_ONLY = tuple(_KINGS_ONLY_LIST)
+
+
+@cache
+def _drop_move_ids_for(piece_type: PieceType) -> frozenset[int]:
+    """piece_type を81マスのどこかに打つ手の番号の集合。"""
+    return frozenset(encode_drop_move(piece_type, idx) for idx in range(NUM_SQUARES))
+
+
+def _legal_drops(board: Board, player: Player, piece_type: PieceType) -> set[int]:
+    """合法手のうち piece_type を打つ手だけを、デコードせずに番号のまま返す。"""
+    return set(legal_moves(board, player)) & _drop_move_ids_for(piece_type)
+
 
 class TestMoveEncoding:
     def test_board_move_roundtrip(self) -> None:
@@ -44,6 +65,11 @@ class TestMoveEncoding:
     def test_action_space_size(self) -> None:
         assert ACTION_SPACE == 13689
 
+    def test_move_squares(self) -> None:
+        assert move_squares(encode_board_move(18, 9)) == (18, 9)
+        assert move_squares(encode_board_move(18, 9, promote=True)) == (18, 9)
+        assert move_squares(encode_drop_move(PieceType.ROOK, 40)) == (None, 40)
+
 
 class TestInitialLegalMoves:
     def test_initial_move_count(self) -> None:
@@ -55,17 +81,27 @@ class TestInitialLegalMoves:
     def test_all_moves_are_valid_indices(self) -> None:
         board = Board()
         moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            assert 0 <= move < ACTION_SPACE
+        # min/max は C 実装の1回の走査で済む
+        assert 0 <= min(moves) and max(moves) < ACTION_SPACE
+
+    def test_repeated_position_returns_fresh_list(self) -> None:
+        first = legal_moves(Board(), Player.SENTE)
+        first.clear()  # キャッシュされた結果は呼び出し側の変更の影響を受けない
+        second = legal_moves(Board(), Player.SENTE)
+        assert len(second) == 30
+        assert second is not first
+
+    def test_cache_distinguishes_side_to_move(self) -> None:
+        board = Board()
+        sente = legal_moves(board, Player.SENTE)
+        gote = legal_moves(board, Player.GOTE)
+        assert set(sente).isdisjoint(gote)
 
 
 class TestNifuRestriction:
     def test_cannot_drop_pawn_in_column_with_pawn(self) -> None:
         """二歩: Cannot drop pawn in column that already has own pawn."""
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-        # Kings
-        squares[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
-        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        squares = list(_KINGS_ONLY)
         # Sente pawn in column 0
         squares[6 * COLS + 0] = Piece(PieceType.PAWN, Player.SENTE)
         board = Board(
@@ -73,48 +109,42 @@ class TestNifuRestriction:
             hands=((PieceType.PAWN,), ()),
         )
 
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            decoded = decode_move(move)
-            if decoded["type"] == "drop" and decoded["piece_type"] == PieceType.PAWN:
-                _, drop_col = decoded["to"]
-                assert drop_col != 0, "Should not be able to drop pawn in col 0"
+        drops = _legal_drops(board, Player.SENTE, PieceType.PAWN)
+        assert drops, "Pawn drops in other columns remain legal"
+        for row in range(ROWS):
+            assert encode_drop_move(PieceType.PAWN, row * COLS + 0) not in drops, (
+                "Should not be able to drop pawn in col 0"
+            )
 
 
 class TestDeadPieceRestriction:
     def test_cannot_drop_pawn_on_last_rank(self) -> None:
         """行き所のない駒: Cannot drop pawn on opponent's back rank."""
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-        squares[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
-        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        squares = list(_KINGS_ONLY)
         board = Board(
             squares=tuple(squares),
             hands=((PieceType.PAWN,), ()),
         )
 
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            decoded = decode_move(move)
-            if decoded["type"] == "drop" and decoded["piece_type"] == PieceType.PAWN:
-                drop_row, _ = decoded["to"]
-                assert drop_row != 0, "Should not drop pawn on row 0"
+        drops = _legal_drops(board, Player.SENTE, PieceType.PAWN)
+        for col in range(COLS):
+            assert encode_drop_move(PieceType.PAWN, 0 * COLS + col) not in drops, (
+                "Should not drop pawn on row 0"
+            )
 
     def test_cannot_drop_knight_on_last_two_ranks(self) -> None:
         """行き所のない駒: Cannot drop knight on last 2 ranks."""
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-        squares[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
-        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        squares = list(_KINGS_ONLY)
         board = Board(
             squares=tuple(squares),
             hands=((PieceType.KNIGHT,), ()),
         )
 
-        moves = legal_moves(board, Player.SENTE)
-        for move in moves:
-            decoded = decode_move(move)
-            if decoded["type"] == "drop" and decoded["piece_type"] == PieceType.KNIGHT:
-                drop_row, _ = decoded["to"]
-                assert drop_row > 1, f"Should not drop knight on row {drop_row}"
+        drops = _legal_drops(board, Player.SENTE, PieceType.KNIGHT)
+        for idx in range(2 * COLS):
+            assert encode_drop_move(PieceType.KNIGHT, idx) not in drops, (
+                f"Should not drop knight on row {idx // COLS}"
+            )
 
 
 class TestCheckRestriction:
@@ -133,9 +163,7 @@ class TestCheckRestriction:
 class TestPromotion:
     def test_pawn_must_promote_on_last_rank(self) -> None:
         """Pawn must promote when reaching opponent's back rank."""
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-        squares[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
-        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        squares = list(_KINGS_ONLY)
         # Sente pawn on row 1, can move to row 0 (must promote)
         squares[1 * COLS + 0] = Piece(PieceType.PAWN, Player.SENTE)
         board = Board(squares=tuple(squares), hands=((), ()))
@@ -153,9 +181,7 @@ class TestPromotion:
 
     def test_pawn_can_optionally_promote_in_zone(self) -> None:
         """Pawn in promotion zone (not last rank) can choose to promote."""
-        squares: list[Piece | None] = [None] * NUM_SQUARES
-        squares[0 * COLS + 4] = Piece(PieceType.KING, Player.GOTE)
-        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        squares = list(_KINGS_ONLY)
         # Sente pawn on row 3, can move to row 2 (promotion zone)
         squares[3 * COLS + 0] = Piece(PieceType.PAWN, Player.SENTE)
         board = Board(squares=tuple(squares), hands=((), ()))
@@ -172,3 +198,136 @@ class TestPromotion:
         non_promotes = [m for m in pawn_moves if not m["promote"]]
         assert len(promotes) == 1
         assert len(non_promotes) == 1
+
+
+class TestSlidingPieces:
+    def test_gote_rook_stops_at_blockers(self) -> None:
+        """Slides stop before own pieces and on captures."""
+        squares: list[Piece | None] = [None] * NUM_SQUARES
+        squares[0 * COLS + 0] = Piece(PieceType.KING, Player.GOTE)
+        squares[8 * COLS + 8] = Piece(PieceType.KING, Player.SENTE)
+        squares[4 * COLS + 4] = Piece(PieceType.ROOK, Player.GOTE)
+        squares[4 * COLS + 6] = Piece(PieceType.PAWN, Player.GOTE)  # 右を塞ぐ自駒
+        squares[6 * COLS + 4] = Piece(PieceType.PAWN, Player.SENTE)  # 下の取れる駒
+        board = Board(squares=tuple(squares), hands=((), ()))
+
+        targets = set()
+        for move in legal_moves(board, Player.GOTE):
+            decoded = decode_move(move)
+            if decoded["type"] == "board" and decoded["from"] == (4, 4):
+                targets.add(decoded["to"])
+
+        expected = {(r, 4) for r in range(4)} | {(5, 4), (6, 4)}
+        expected |= {(4, c) for c in range(4)} | {(4, 5)}
+        assert targets == expected
+        assert _is_in_check(board, Player.SENTE) is False
+
+
+class TestCheckDetection:
+    def _board(self, *pieces: tuple[int, Piece]) -> Board:
+        squares: list[Piece | None] = [None] * NUM_SQUARES
+        squares[0 * COLS + 0] = Piece(PieceType.KING, Player.GOTE)
+        squares[8 * COLS + 4] = Piece(PieceType.KING, Player.SENTE)
+        for idx, piece in pieces:
+            squares[idx] = piece
+        return Board(squares=tuple(squares), hands=((), ()))
+
+    def test_knight_checks_by_direction(self) -> None:
+        # 後手の桂馬は下向きに跳ぶので (6,3) から (8,4) の玉に利く
+        board = self._board((6 * COLS + 3, Piece(PieceType.KNIGHT, Player.GOTE)))
+        assert _is_in_check(board, Player.SENTE)
+        # 先手の桂馬は上向きなので、同じマスでも相手玉には利かない
+        board = self._board((2 * COLS + 1, Piece(PieceType.KNIGHT, Player.SENTE)))
+        assert _is_in_check(board, Player.GOTE)
+        board = self._board((6 * COLS + 3, Piece(PieceType.KNIGHT, Player.SENTE)))
+        assert not _is_in_check(board, Player.SENTE)
+
+    def test_step_attack_needs_matching_direction(self) -> None:
+        # 後手の銀は斜め後ろ（上）にも利くが、真横には利かない
+        board = self._board((8 * COLS + 3, Piece(PieceType.SILVER, Player.GOTE)))
+        assert not _is_in_check(board, Player.SENTE)
+        board = self._board((7 * COLS + 3, Piece(PieceType.SILVER, Player.GOTE)))
+        assert _is_in_check(board, Player.SENTE)
+
+    def test_slider_checks_stop_at_blockers(self) -> None:
+        # 後手の香車は下向きに飛ぶ: (2,4) から (8,4) の玉に利く
+        lance = (2 * COLS + 4, Piece(PieceType.LANCE, Player.GOTE))
+        assert _is_in_check(self._board(lance), Player.SENTE)
+        # 間に駒があれば利かない
+        blocker = (5 * COLS + 4, Piece(PieceType.PAWN, Player.SENTE))
+        assert not _is_in_check(self._board(lance, blocker), Player.SENTE)
+        # 先手の香車は上向きに飛ぶ: (4,0) から (0,0) の後手玉に利くが、自玉は王手にしない
+        sente_lance = (4 * COLS + 0, Piece(PieceType.LANCE, Player.SENTE))
+        assert _is_in_check(self._board(sente_lance), Player.GOTE)
+        assert not _is_in_check(self._board(sente_lance), Player.SENTE)
+
+    def test_promoted_slider_checks(self) -> None:
+        # 先手の馬は斜めに飛ぶ: (4,4) から (0,0) の後手玉に利く
+        horse = (4 * COLS + 4, Piece(PieceType.HORSE, Player.SENTE))
+        assert _is_in_check(self._board(horse), Player.GOTE)
+        # 龍は縦横に飛ぶ: (0,6) から同じ段の (0,0) の玉に利く
+        dragon = (0 * COLS + 6, Piece(PieceType.DRAGON, Player.SENTE))
+        assert _is_in_check(self._board(dragon), Player.GOTE)
+
+    def test_pinned_piece_moves_along_pin_line(self) -> None:
+        # 後手の香車 (2,4) が先手の飛車 (5,4) を (8,4) の玉にピンしている
+        board = self._board(
+            (2 * COLS + 4, Piece(PieceType.LANCE, Player.GOTE)),
+            (5 * COLS + 4, Piece(PieceType.ROOK, Player.SENTE)),
+        )
+        targets = {
+            move_squares(m)[1]
+            for m in legal_moves(board, Player.SENTE)
+            if move_squares(m)[0] == 5 * COLS + 4
+        }
+        # 筋の上を動くか香車を取る手だけが残り、横には動けない
+        assert targets == {r * COLS + 4 for r in (2, 3, 4, 6, 7)}
+
+    def test_pin_needs_matching_slider(self) -> None:
+        # 後手の金は飛ばないので、同じ筋にいても飛車はピンされない
+        board = self._board(
+            (2 * COLS + 4, Piece(PieceType.GOLD, Player.GOTE)),
+            (5 * COLS + 4, Piece(PieceType.ROOK, Player.SENTE)),
+        )
+        targets = {
+            move_squares(m)[1]
+            for m in legal_moves(board, Player.SENTE)
+            if move_squares(m)[0] == 5 * COLS + 4
+        }
+        assert 5 * COLS + 0 in targets
+
+    def test_check_evasions_block_capture_or_move_king(self) -> None:
+        # 後手の飛車 (2,4) が (8,4) の玉に王手。先手は金を持ち、(6,0) に角がいる
+        board = self._board(
+            (2 * COLS + 4, Piece(PieceType.ROOK, Player.GOTE)),
+            (6 * COLS + 0, Piece(PieceType.BISHOP, Player.SENTE)),
+        ).add_to_hand(Player.SENTE, PieceType.GOLD)
+        king = 8 * COLS + 4
+        between = {r * COLS + 4 for r in range(3, 8)}
+        for move in legal_moves(board, Player.SENTE):
+            from_idx, to_idx = move_squares(move)
+            if from_idx != king:
+                # 玉以外の手は飛車を取るか、玉との間に入る手だけ
+                assert to_idx in between | {2 * COLS + 4}
+        drops = {
+            to for frm, to in map(move_squares, legal_moves(board, Player.SENTE)) if frm is None
+        }
+        assert drops == between
+        # 角は (6,0) から (4,2)…と斜めに進み、筋4の (2,4) で飛車を取れる
+        bishop = {
+            to
+            for frm, to in map(move_squares, legal_moves(board, Player.SENTE))
+            if frm == 6 * COLS + 0
+        }
+        assert bishop == {2 * COLS + 4}
+
+    def test_double_check_allows_only_king_moves(self) -> None:
+        # 後手の飛車 (2,4) と角 (5,1) が (8,4) の玉に同時に王手
+        board = self._board(
+            (2 * COLS + 4, Piece(PieceType.ROOK, Player.GOTE)),
+            (5 * COLS + 1, Piece(PieceType.BISHOP, Player.GOTE)),
+            (6 * COLS + 8, Piece(PieceType.GOLD, Player.SENTE)),
+        ).add_to_hand(Player.SENTE, PieceType.GOLD)
+        moves = legal_moves(board, Player.SENTE)
+        assert moves
+        assert all(move_squares(m)[0] == 8 * COLS + 4 for m in moves)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import torch
+
 from shogi_ai.game.full_shogi.board import Board, Piece
 from shogi_ai.game.full_shogi.moves import ACTION_SPACE
 from shogi_ai.game.full_shogi.state import FullShogiState
@@ -10,31 +12,25 @@ from shogi_ai.game.protocol import GameState
 
 
 class TestProtocolCompliance:
-    def test_implements_game_state(self) -> None:
-        state = FullShogiState()
-        assert isinstance(state, GameState)
+    def test_implements_game_state(self, initial_state: FullShogiState) -> None:
+        assert isinstance(initial_state, GameState)
 
-    def test_action_space_size(self) -> None:
-        state = FullShogiState()
-        assert state.action_space_size == ACTION_SPACE
+    def test_action_space_size(self, initial_state: FullShogiState) -> None:
+        assert initial_state.action_space_size == ACTION_SPACE
 
 
 class TestInitialState:
-    def test_sente_starts(self) -> None:
-        state = FullShogiState()
-        assert state.current_player == 0
+    def test_sente_starts(self, initial_state: FullShogiState) -> None:
+        assert initial_state.current_player == 0
 
-    def test_not_terminal(self) -> None:
-        state = FullShogiState()
-        assert not state.is_terminal
+    def test_not_terminal(self, initial_state: FullShogiState) -> None:
+        assert not initial_state.is_terminal
 
-    def test_winner_none(self) -> None:
-        state = FullShogiState()
-        assert state.winner is None
+    def test_winner_none(self, initial_state: FullShogiState) -> None:
+        assert initial_state.winner is None
 
-    def test_has_30_legal_moves(self) -> None:
-        state = FullShogiState()
-        assert len(state.legal_moves()) == 30
+    def test_has_30_legal_moves(self, initial_state: FullShogiState) -> None:
+        assert len(initial_state.legal_moves()) == 30
 
 
 class TestApplyMove:
@@ -51,6 +47,11 @@ class TestApplyMove:
         assert state.current_player == 0  # Original unchanged
         assert new_state.current_player == 1
 
+    def test_legal_moves_cached(self) -> None:
+        state = FullShogiState()
+        assert state.legal_moves() is state.legal_moves()
+        assert state == FullShogiState()
+
 
 class TestTerminal:
     def test_king_missing_is_terminal(self) -> None:
@@ -64,22 +65,16 @@ class TestTerminal:
 
 
 class TestTensorPlanes:
-    def test_shape(self) -> None:
-        state = FullShogiState()
-        planes = state.to_tensor_planes()
-        assert planes.shape == (43, 9, 9)
+    def test_shape(self, initial_planes: torch.Tensor) -> None:
+        assert initial_planes.shape == (43, 9, 9)
 
-    def test_sente_king_plane(self) -> None:
-        state = FullShogiState()
-        planes = state.to_tensor_planes()
+    def test_sente_king_plane(self, initial_planes: torch.Tensor) -> None:
         # King is PieceType 7, at (8, 4)
-        assert planes[7, 8, 4] == 1.0
+        assert initial_planes[7, 8, 4] == 1.0
 
-    def test_turn_indicator(self) -> None:
-        state = FullShogiState()
-        planes = state.to_tensor_planes()
-        # Sente → plane 42 all ones
-        assert planes[42].sum() == 81.0
+    def test_turn_indicator(self, initial_planes: torch.Tensor) -> None:
+        # Sente → plane 42 all ones（合計ではなく要素ごとに確かめる）
+        assert bool((initial_planes[42] == 1.0).all())
 
 
 class TestMultipleMoves:
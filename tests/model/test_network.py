@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import copy
+
+import pytest
 import torch
 
 from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG, FULL_SHOGI_CONFIG, NetworkConfig
-from shogi_ai.model.network import DualHeadNetwork, ResBlock
+from shogi_ai.model.network import DualHeadNetwork, ResBlock, fuse_for_inference
 
 
 class TestResBlock:
@@ -24,13 +27,18 @@ class TestResBlock:
         assert x.grad.abs().sum() > 0
 
 
+@pytest.fixture(scope="class")
+def animal_batch_outputs(animal_net: DualHeadNetwork) -> tuple[torch.Tensor, torch.Tensor]:
+    """8局面を1回の順伝播で評価した (policy, value)（形状と値域のテストで共有する）。"""
+    with torch.inference_mode():
+        return animal_net(torch.randn(8, 14, 4, 3))
+
+
 class TestDualHeadNetworkAnimalShogi:
-    def test_output_shapes(self) -> None:
-        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-        x = torch.randn(4, 14, 4, 3)
-        policy, value = net(x)
-        assert policy.shape == (4, 180)
-        assert value.shape == (4, 1)
+    def test_output_shapes(self, animal_batch_outputs: tuple[torch.Tensor, torch.Tensor]) -> None:
+        policy, value = animal_batch_outputs
+        assert policy.shape == (8, 180)
+        assert value.shape == (8, 1)
 
     def test_single_sample(self) -> None:
         net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
@@ -39,25 +47,22 @@ class TestDualHeadNetworkAnimalShogi:
         assert policy.shape == (1, 180)
         assert value.shape == (1, 1)
 
-    def test_value_in_range(self) -> None:
-        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-        x = torch.randn(8, 14, 4, 3)
-        _, value = net(x)
+    def test_value_in_range(self, animal_batch_outputs: tuple[torch.Tensor, torch.Tensor]) -> None:
+        _, value = animal_batch_outputs
         assert (value >= -1.0).all()
         assert (value <= 1.0).all()
 
-    def test_forward_deterministic_in_eval(self) -> None:
-        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-        net.eval()
+    def test_forward_deterministic_in_eval(self, animal_net: DualHeadNetwork) -> None:
         x = torch.randn(2, 14, 4, 3)
-        with torch.no_grad():
-            p1, v1 = net(x)
-            p2, v2 = net(x)
+        with torch.inference_mode():
+            p1, v1 = animal_net(x)
+            p2, v2 = animal_net(x)
         assert torch.equal(p1, p2)
         assert torch.equal(v1, v2)
 
-    def test_gradient_flows_to_input(self) -> None:
-        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
+    def test_gradient_flows_to_input(self, animal_net: DualHeadNetwork) -> None:
+        # backward でパラメータの .grad が書き換わるので共有ネットワークの複製を使う
+        net = copy.deepcopy(animal_net)
         x = torch.randn(1, 14, 4, 3, requires_grad=True)
         policy, value = net(x)
         loss = policy.sum() + value.sum()
@@ -75,6 +80,53 @@ class TestDualHeadNetworkFullShogi:
         assert value.shape == (2, 1)
 
 
+class TestFuseForInference:
+    def test_matches_eval_output(self) -> None:
+        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
+        # 学習済み相当の BN 統計量を作るため、train モードで一度順伝播する
+        net(torch.randn(8, 14, 4, 3))
+        net.eval()
+        fused = fuse_for_inference(net)
+        x = torch.randn(4, 14, 4, 3)
+        with torch.inference_mode():
+            p1, v1 = net(x)
+            p2, v2 = fused(x)
+        assert torch.allclose(p1, p2, atol=1e-5)
+        assert torch.allclose(v1, v2, atol=1e-5)
+
+    def test_full_shogi_matches_eval_output(self) -> None:
+        net = DualHeadNetwork(FULL_SHOGI_CONFIG)
+        net(torch.randn(4, 43, 9, 9))
+        net.eval()
+        fused = fuse_for_inference(net)
+        x = torch.randn(2, 43, 9, 9)
+        with torch.inference_mode():
+            p1, v1 = net(x)
+            p2, v2 = fused(x)
+        assert torch.allclose(p1, p2, atol=1e-4)
+        assert torch.allclose(v1, v2, atol=1e-5)
+
+    def test_every_res_block_folded(self) -> None:
+        fused = fuse_for_inference(DualHeadNetwork(FULL_SHOGI_CONFIG))
+        assert len(fused.res_blocks) == FULL_SHOGI_CONFIG.num_res_blocks
+        for block in fused.res_blocks:
+            assert isinstance(block.bn1, torch.nn.Identity)
+            assert isinstance(block.bn2, torch.nn.Identity)
+            assert block.conv1.bias is not None
+            assert block.conv2.bias is not None
+
+    def test_batchnorm_removed(self) -> None:
+        fused = fuse_for_inference(DualHeadNetwork(ANIMAL_SHOGI_CONFIG))
+        assert not any(isinstance(m, torch.nn.BatchNorm2d) for m in fused.modules())
+        assert not fused.training
+
+    def test_original_untouched(self) -> None:
+        net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
+        fuse_for_inference(net)
+        assert isinstance(net.input_bn, torch.nn.BatchNorm2d)
+        assert net.training
+
+
 class TestNetworkConfig:
     def test_animal_shogi_defaults(self) -> None:
         cfg = ANIMAL_SHOGI_CONFIG
@@ -97,3 +149,17 @@ class TestNetworkConfig:
         policy, value = net(x)
         assert policy.shape == (1, 100)
         assert value.shape == (1, 1)
+
+    def test_narrow_value_head(self) -> None:
+        cfg = NetworkConfig(
+            board_h=4,
+            board_w=3,
+            in_channels=14,
+            action_size=180,
+            value_hidden=16,
+        )
+        net = DualHeadNetwork(cfg)
+        assert net.value_fc1.out_features == 16
+        assert net.value_fc2.in_features == 16
+        _, value = net(torch.randn(2, 14, 4, 3))
+        assert value.shape == (2, 1)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import pytest
+import torch
+
 from shogi_ai.game.animal_shogi.state import AnimalShogiState
-from shogi_ai.model.config import ANIMAL_SHOGI_CONFIG
 from shogi_ai.model.network import DualHeadNetwork
 from shogi_ai.training.self_play import (
     SelfPlayConfig,
@@ -13,61 +15,48 @@ from shogi_ai.training.self_play import (
 )
 
 
-def _make_network() -> DualHeadNetwork:
-    net = DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
-    net.eval()
-    return net
+@pytest.fixture(scope="class")
+def played_examples(animal_net: DualHeadNetwork) -> list[TrainingExample]:
+    """1局分の自己対局データ（TestPlayGame の各テストで同じ結果を検証する）。"""
+    config = SelfPlayConfig(num_games=1, num_simulations=5)
+    return play_game(animal_net, AnimalShogiState(), config)
 
 
 class TestPlayGame:
-    def test_returns_training_examples(self) -> None:
-        net = _make_network()
-        config = SelfPlayConfig(num_games=1, num_simulations=5)
-        state = AnimalShogiState()
-        examples = play_game(net, state, config)
-
-        assert len(examples) > 0
-        for ex in examples:
+    def test_returns_training_examples(self, played_examples: list[TrainingExample]) -> None:
+        assert len(played_examples) > 0
+        for ex in played_examples:
             assert isinstance(ex, TrainingExample)
 
-    def test_example_shapes(self) -> None:
-        net = _make_network()
-        config = SelfPlayConfig(num_games=1, num_simulations=5)
-        state = AnimalShogiState()
-        examples = play_game(net, state, config)
-
-        for ex in examples:
+    def test_example_shapes(self, played_examples: list[TrainingExample]) -> None:
+        for ex in played_examples:
             assert ex.state_tensor.shape == (14, 4, 3)
+            assert ex.state_tensor.dtype == torch.uint8
             assert ex.policy_target.shape == (180,)
             assert -1.0 <= ex.value_target <= 1.0
 
-    def test_policy_sums_to_one(self) -> None:
-        net = _make_network()
-        config = SelfPlayConfig(num_games=1, num_simulations=5)
-        state = AnimalShogiState()
-        examples = play_game(net, state, config)
-
-        for ex in examples:
+    def test_policy_sums_to_one(self, played_examples: list[TrainingExample]) -> None:
+        for ex in played_examples:
             total = ex.policy_target.sum().item()
             assert abs(total - 1.0) < 0.02, f"Policy sum {total} != 1.0"
 
-    def test_value_targets_assigned(self) -> None:
-        net = _make_network()
-        config = SelfPlayConfig(num_games=1, num_simulations=5)
-        state = AnimalShogiState()
-        examples = play_game(net, state, config)
-
+    def test_value_targets_assigned(self, played_examples: list[TrainingExample]) -> None:
         # At least some examples should have non-zero value
-        values = [ex.value_target for ex in examples]
+        values = [ex.value_target for ex in played_examples]
         assert any(v != 0.0 for v in values) or len(values) == 0
 
 
-class TestGenerateTrainingData:
-    def test_multiple_games(self) -> None:
-        net = _make_network()
-        config = SelfPlayConfig(num_games=3, num_simulations=5)
-        state = AnimalShogiState()
-        examples = generate_training_data(net, state, config)
+_GENERATED_GAMES = 3
 
+
+@pytest.fixture(scope="module")
+def generated_examples(animal_net: DualHeadNetwork) -> list[TrainingExample]:
+    """3局分の自己対局データ（1回だけ生成し、モジュール内のテストで共有する）。"""
+    config = SelfPlayConfig(num_games=_GENERATED_GAMES, num_simulations=5)
+    return generate_training_data(animal_net, AnimalShogiState(), config)
+
+
+class TestGenerateTrainingData:
+    def test_multiple_games(self, generated_examples: list[TrainingExample]) -> None:
         # 3 games, each game has multiple positions
-        assert len(examples) >= 3
+        assert len(generated_examples) >= _GENERATED_GAMES
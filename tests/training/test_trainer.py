@@ -16,6 +16,7 @@ from shogi_ai.training.self_play import (
     TrainingExample,
     generate_training_data,
 )
+from shogi_ai.training.train_loop import _make_mcts_fn
 from shogi_ai.training.trainer import Trainer, TrainerConfig
 
 
@@ -23,8 +24,27 @@ def _make_network() -> DualHeadNetwork:
     return DualHeadNetwork(ANIMAL_SHOGI_CONFIG)
 
 
+@pytest.fixture(scope="module")
+def initial_planes() -> torch.Tensor:
+    """初期局面の入力テンソル（Trainer は読むだけなので全訓練例で同じテンソルを共有する）。"""
+    return AnimalShogiState().to_tensor_planes()
+
+
+@pytest.fixture(scope="module")
+def memorize_examples(initial_planes: torch.Tensor) -> list[TrainingExample]:
+    """初期局面で最初の合法手を指して勝つ、という同じ訓練例を20個並べたもの。"""
+    policy = torch.zeros(180)
+    policy[AnimalShogiState().legal_moves()[0]] = 1.0
+    return [TrainingExample(initial_planes, policy, 1.0)] * 20
+
+
+def _uniform_examples(planes: torch.Tensor, n: int) -> list[TrainingExample]:
+    """一様な方策・引き分けの訓練例を n 個並べる。"""
+    return [TrainingExample(planes, torch.full((180,), 1 / 180), 0.0)] * n
+
+
 class TestTrainer:
-    def test_loss_decreases_with_training(self) -> None:
+    def test_loss_decreases_with_training(self, memorize_examples: list[TrainingExample]) -> None:
         """Training should reduce loss over epochs."""
         net = _make_network()
         device = torch.device("cpu")
@@ -34,23 +54,66 @@ class TestTrainer:
             device,
         )
 
-        # Create simple training data
-        examples = []
-        state = AnimalShogiState()
-        for _ in range(20):
-            tensor = state.to_tensor_planes()
-            policy = torch.zeros(180)
-            legal = state.legal_moves()
-            if legal:
-                policy[legal[0]] = 1.0
-            examples.append(TrainingExample(tensor, policy, 1.0))
-
-        losses1 = trainer.train(examples)
-        losses2 = trainer.train(examples)
+        losses1 = trainer.train(memorize_examples)
+        losses2 = trainer.train(memorize_examples)
 
         # Second round should have lower loss (network memorizes)
         assert losses2["total_loss"] < losses1["total_loss"]
 
+    def test_partial_batch_dropped(self, initial_planes: torch.Tensor) -> None:
+        net = _make_network()
+        trainer = Trainer(
+            net,
+            TrainerConfig(epochs_per_generation=2, batch_size=8),
+            torch.device("cpu"),
+        )
+        examples = _uniform_examples(initial_planes, 10)
+        sizes: list[int] = []
+        net.register_forward_hook(lambda _m, inputs, _o: sizes.append(inputs[0].shape[0]))
+        trainer.train(examples)
+        assert sizes == [8, 8]
+
+    def test_fewer_examples_than_batch(self, initial_planes: torch.Tensor) -> None:
+        net = _make_network()
+        trainer = Trainer(
+            net,
+            TrainerConfig(epochs_per_generation=1, batch_size=64),
+            torch.device("cpu"),
+        )
+        examples = _uniform_examples(initial_planes, 5)
+        losses = trainer.train(examples)
+        assert losses["total_loss"] > 0.0
+
+    def test_train_tensors_on_stacked_examples(self, initial_planes: torch.Tensor) -> None:
+        net = _make_network()
+        trainer = Trainer(
+            net,
+            TrainerConfig(epochs_per_generation=1, batch_size=4),
+            torch.device("cpu"),
+        )
+        sizes: list[int] = []
+        net.register_forward_hook(lambda _m, inputs, _o: sizes.append(inputs[0].shape[0]))
+        losses = trainer.train_tensors(
+            initial_planes.expand(8, -1, -1, -1),
+            torch.full((8, 180), 1 / 180),
+            torch.zeros(8),  # (N,) の結果も受け付ける
+        )
+        assert sizes == [4, 4]
+        assert losses["total_loss"] > 0.0
+
+    def test_train_tensors_casts_float64_targets(self, initial_planes: torch.Tensor) -> None:
+        trainer = Trainer(
+            _make_network(),
+            TrainerConfig(epochs_per_generation=1, batch_size=4),
+            torch.device("cpu"),
+        )
+        losses = trainer.train_tensors(
+            initial_planes.expand(4, -1, -1, -1),
+            torch.full((4, 180), 1 / 180, dtype=torch.float64),
+            torch.zeros(4, 1, dtype=torch.float64),
+        )
+        assert losses["total_loss"] > 0.0
+
     def test_empty_examples(self) -> None:
         net = _make_network()
         device = torch.device("cpu")
@@ -59,12 +122,20 @@ class TestTrainer:
         assert losses["total_loss"] == 0.0
 
 
+_RANDOM_GAMES = 20
+
+
+@pytest.fixture(scope="class")
+def random_results() -> tuple[int, int, int]:
+    """ランダム同士の対戦結果（TestArena の集計テストで1回の対戦を共有する）。"""
+    return pit(random_move, random_move, AnimalShogiState(), num_games=_RANDOM_GAMES)
+
+
 class TestArena:
-    def test_random_vs_random(self) -> None:
+    def test_random_vs_random(self, random_results: tuple[int, int, int]) -> None:
         """Two random players should have roughly even results."""
-        state = AnimalShogiState()
-        wins, losses, draws = pit(random_move, random_move, state, num_games=20)
-        assert wins + losses + draws == 20
+        wins, losses, draws = random_results
+        assert wins + losses + draws == _RANDOM_GAMES
 
     def test_minimax_vs_random(self) -> None:
         """Minimax should dominate random."""
@@ -76,10 +147,21 @@ class TestArena:
         wins, losses, draws = pit(minimax_fn, random_move, state, num_games=10)
         assert wins > losses  # Minimax should win more
 
-    def test_game_count_correct(self) -> None:
+    def test_game_count_correct(self, random_results: tuple[int, int, int]) -> None:
+        assert all(count >= 0 for count in random_results)
+        assert sum(random_results) == _RANDOM_GAMES
+
+
+class TestMakeMctsFn:
+    def test_returns_legal_move(self) -> None:
+        fn = _make_mcts_fn(_make_network(), num_simulations=5)
         state = AnimalShogiState()
-        wins, losses, draws = pit(random_move, random_move, state, num_games=10)
-        assert wins + losses + draws == 10
+        assert fn(state) in state.legal_moves()
+
+    def test_does_not_modify_network(self) -> None:
+        net = _make_network()
+        _make_mcts_fn(net, num_simulations=5)
+        assert isinstance(net.input_bn, torch.nn.BatchNorm2d)
 
 
 class TestIntegration:
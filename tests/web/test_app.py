@@ -5,11 +5,14 @@ from __future__ import annotations
 import pytest
 from fastapi.testclient import TestClient
 
-from shogi_ai.web.app import app
+from shogi_ai.engine.random_player import random_move
+from shogi_ai.game.animal_shogi.state import AnimalShogiState
+from shogi_ai.web.app import GameSession, _load_mcts, _SessionStore, app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client() -> TestClient:
+    """モジュール内で共有するクライアント（対局 ID は毎回新しいのでストアの掃除は不要）。"""
     return TestClient(app)
 
 
@@ -42,8 +45,9 @@ class TestMakeMove:
             "/api/new-game",
             json={"game_type": "animal", "ai_type": "random"},
         )
-        game_id = res.json()["game_id"]
-        legal = res.json()["state"]["legal_moves"]
+        data = res.json()
+        game_id = data["game_id"]
+        legal = data["state"]["legal_moves"]
 
         # Make a move
         res = client.post(
@@ -85,11 +89,85 @@ class TestGetState:
         assert res.status_code == 200
         assert res.json()["rows"] == 4
 
+    def test_not_modified_with_etag(self, client: TestClient) -> None:
+        res = client.post("/api/new-game", json={"game_type": "animal", "ai_type": "random"})
+        game_id = res.json()["game_id"]
+
+        res = client.get(f"/api/state/{game_id}")
+        etag = res.headers["etag"]
+        res = client.get(f"/api/state/{game_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+
+    def test_etag_changes_after_move(self, client: TestClient) -> None:
+        res = client.post("/api/new-game", json={"game_type": "animal", "ai_type": "random"})
+        data = res.json()
+        game_id = data["game_id"]
+        legal = data["state"]["legal_moves"]
+        etag = client.get(f"/api/state/{game_id}").headers["etag"]
+
+        client.post("/api/move", json={"game_id": game_id, "move": legal[0]})
+        res = client.get(f"/api/state/{game_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["etag"] != etag
+
     def test_get_nonexistent_game(self, client: TestClient) -> None:
         res = client.get("/api/state/nonexistent")
         assert res.status_code == 404
 
 
+class TestMCTSCache:
+    def test_mcts_game_reuses_network(self, client: TestClient) -> None:
+        _load_mcts.cache_clear()
+        for _ in range(2):
+            res = client.post("/api/new-game", json={"game_type": "animal", "ai_type": "mcts"})
+            assert res.status_code == 200
+        info = _load_mcts.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+def _make_session() -> GameSession:
+    return GameSession(
+        state=AnimalShogiState(), game_type="animal", sente_fn=None, gote_fn=random_move
+    )
+
+
+class TestGameSession:
+    def test_state_dict_cached_until_state_changes(self) -> None:
+        game = _make_session()
+        first = game.state_dict()
+        assert game.state_dict() is first
+        game.set_state(game.state.apply_move(game.legal_moves[0]))
+        second = game.state_dict()
+        assert second is not first
+        assert second["current_player"] == 1
+
+
+class TestSessionStore:
+    def test_evicts_least_recently_used(self) -> None:
+        store = _SessionStore(maxsize=2, ttl=60.0)
+        a, b, c = _make_session(), _make_session(), _make_session()
+        store["a"] = a
+        store["b"] = b
+        assert store.get("a") is a  # a を最近使った扱いにする
+        store["c"] = c
+        assert store.get("b") is None
+        assert store.get("a") is a
+        assert store.get("c") is c
+
+    def test_expires_idle_sessions(self) -> None:
+        now = [0.0]
+        store = _SessionStore(maxsize=10, ttl=60.0, clock=lambda: now[0])
+        store["a"] = _make_session()
+        store["b"] = _make_session()
+        now[0] = 30.0
+        assert store.get("b") is not None  # アクセスで期限が延びる
+        now[0] = 70.0
+        assert store.get("a") is None
+        assert store.get("b") is not None
+        assert len(store) == 1
+
+
 class TestIndex:
     def test_serves_html(self, client: TestClient) -> None:
         res = client.get("/")
@@ -107,7 +185,8 @@ class TestGameFlow:
         game_id = res.json()["game_id"]
 
         for _ in range(5):
-            state = res.json()["state"] if "state" in res.json() else res.json()
+            data = res.json()
+            state = data.get("state", data)
             if state.get("is_terminal", False):
                 break
             legal = state.get("legal_moves", [])